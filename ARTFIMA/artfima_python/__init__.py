@@ -9,7 +9,15 @@ based on the R artfima package source code.
 from .artfima import artfima, ARTFIMAResult
 from .tacvf import artfimaTACVF
 from .sdf import artfimaSDF, periodogram
-from .utils import ARToPacf, PacfToAR, InvertibleQ
+from .serialization import resultToBytes, resultFromBytes
+from .utils import (
+    ARToPacf,
+    PacfToAR,
+    InvertibleQ,
+    ARToPacfBatch,
+    PacfToARBatch,
+    InvertibleQBatch,
+)
 
 __version__ = "1.0.0"
 __all__ = [
@@ -18,8 +26,13 @@ __all__ = [
     "artfimaTACVF",
     "artfimaSDF",
     "periodogram",
+    "resultToBytes",
+    "resultFromBytes",
     "ARToPacf",
     "PacfToAR",
     "InvertibleQ",
+    "ARToPacfBatch",
+    "PacfToARBatch",
+    "InvertibleQBatch",
 ]
 
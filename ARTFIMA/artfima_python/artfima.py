@@ -10,7 +10,7 @@ from scipy.optimize import minimize
 from .tacvf import artfimaTACVF
 from .sdf import artfimaSDF, periodogram
 from .durbin_levinson import DLLoglikelihood, DLResiduals, exactLoglikelihood
-from .utils import ARToPacf, PacfToAR, InvertibleQ
+from .utils import PacfToAR, PacfToARBatch, InvertibleQBatch
 
 
 class ARTFIMAResult:
@@ -54,6 +54,65 @@ class ARTFIMAResult:
         self.last_values = None  # Last value(s) before differencing for forecast integration
         self.z_original = None  # Original undifferenced data
     
+    # Derived arrays are rebuilt from the fitted parameters on first access
+    # when they were not kept, e.g. after loading the compact format
+    @property
+    def tacvf(self):
+        if self._tacvf is None and self.z is not None and self.n is not None:
+            d_val = float(self.dHat) if isinstance(self.dHat, (int, float, np.number)) else 0.0
+            lambda_val = float(self.lambdaHat) if isinstance(self.lambdaHat, (int, float, np.number)) else 0.0
+            phi_val = np.asarray(self.phiHat) if self.phiHat is not None else np.array([])
+            theta_val = np.asarray(self.thetaHat) if self.thetaHat is not None else np.array([])
+            self._tacvf = artfimaTACVF(d=d_val, lambda_param=lambda_val, phi=phi_val,
+                                       theta=theta_val, maxlag=self.n - 1)
+        return self._tacvf
+
+    @tacvf.setter
+    def tacvf(self, value):
+        self._tacvf = value
+
+    @property
+    def res(self):
+        if self._res is None and self.z is not None and self.n is not None:
+            d0 = int(self.arimaOrder[1]) if self.arimaOrder is not None else 0
+            w = np.diff(self.z, n=d0) if d0 > 0 else np.asarray(self.z)
+            w = w - (self.constant if self.constant is not None else 0.0)
+            try:
+                self._res = DLResiduals(self.tacvf, w)
+            except:
+                self._res = np.full(self.n, np.nan)
+        return self._res
+
+    @res.setter
+    def res(self, value):
+        self._res = value
+
+    @property
+    def z_original(self):
+        if self._z_original is None and self.z is not None and self.integ_order > 0 \
+                and self.last_values is not None:
+            # Undo the integer differencing, working back from the stored last values
+            x = np.asarray(self.z, dtype=float)
+            for last_val in np.asarray(self.last_values, dtype=float)[::-1]:
+                level = np.empty(len(x) + 1)
+                level[-1] = last_val
+                level[:-1] = last_val - np.cumsum(x[::-1])[::-1]
+                x = level
+            self._z_original = x
+        return self._z_original
+
+    @z_original.setter
+    def z_original(self, value):
+        self._z_original = value
+
+    def __setstate__(self, state):
+        # Results pickled before the derived arrays became lazy store them
+        # under their public names
+        for name in ("tacvf", "res", "z_original"):
+            if name in state:
+                state["_" + name] = state.pop(name)
+        self.__dict__.update(state)
+
     def __repr__(self):
         return f"ARTFIMA({self.glp}) model: d={self.dHat:.4f}, lambda={self.lambdaHat:.4f}, " \
                f"LL={self.LL:.2f}, AIC={self.aic:.2f}, BIC={self.bic:.2f}"
@@ -181,14 +240,16 @@ class ARTFIMAResult:
             # Integrate forecasts back to original level
             # For D=1: forecast_original[i] = forecast_diff[i] + last_original_value + sum(forecast_diff[0:i])
             # This is equivalent to: forecast_original = last_value + cumsum(forecasts)
+            # Work on a local copy so repeated forecasts see the same last values
+            last_values = self.last_values
             for _ in range(self.integ_order):
                 # Get the last value from original series
-                last_val = self.last_values[-1] if hasattr(self.last_values, '__len__') else self.last_values
+                last_val = last_values[-1] if hasattr(last_values, '__len__') else last_values
                 # Integrate: cumulative sum starting from last original value
                 forecasts = last_val + np.cumsum(forecasts)
-                # Update last_values for next integration if D > 1
-                if hasattr(self.last_values, '__len__') and len(self.last_values) > 1:
-                    self.last_values = self.last_values[:-1]
+                # Move to the next level for the next integration if D > 1
+                if hasattr(last_values, '__len__') and len(last_values) > 1:
+                    last_values = last_values[:-1]
 
         return {
             'Forecasts': forecasts,
@@ -329,50 +390,8 @@ def artfima(z, glp="ARTFIMA", arimaOrder=(0, 0, 0), likAlg="exact", fixd=None,
     # Track best valid solution found during optimization
     best_valid_solution = {'fun': np.inf, 'x': None}
 
-    def Entropy(beta):
-        """Negative log-likelihood function."""
-        nonlocal best_valid_solution
-        phi = theta = lambda_param = d = np.array([])
-        r = None
-        count[0] += 1
-        
-        # Extract parameters based on model type
-        if glpOrder == 2:
-            if fixd is None:  # Full ARTFIMA
-                d = beta[0]
-                lambda_param = beta[1]
-                if abs(d) > dHi or lambda_param > lambdaHi or lambda_param < lambdaLo:
-                    return entropyPenalty
-            else:  # Constrained ARTFIMA
-                d = fixd
-                lambda_param = beta[0]
-                if lambda_param > lambdaHi or lambda_param < lambdaLo:
-                    return entropyPenalty
-        elif glpOrder == 1:  # ARFIMA
-            d = beta[0]
-            if abs(d) >= dfHi:
-                return entropyPenalty
-        
-        # ARMA component
-        if (p > 0 or q > 0) and np.any(np.abs(beta[glpAdd:(p + q + glpAdd)]) >= 1.0):
-            return entropyPenalty
-        
-        # Convert PACF to AR/MA coefficients
-        try:
-            if p > 0:
-                phi = PacfToAR(beta[glpAdd:(p + glpAdd)])
-            if q > 0:
-                theta = PacfToAR(beta[(p + glpAdd):(p + q + glpAdd)])
-        except:
-            return entropyPenalty
-        
-        # Check invertibility - use .size to handle numpy scalars
-        phi_size = phi.size if isinstance(phi, np.ndarray) else (len(phi) if hasattr(phi, '__len__') else 0)
-        theta_size = theta.size if isinstance(theta, np.ndarray) else (len(theta) if hasattr(theta, '__len__') else 0)
-        if (phi_size > 0 and not InvertibleQ(phi)) or \
-           (theta_size > 0 and not InvertibleQ(theta)):
-            return entropyPenalty
-        
+    def _negLL(beta, d, lambda_param, phi, theta):
+        """Negative log-likelihood at an admissible parameter point."""
         # Compute likelihood
         if likAlg == "exact":
             try:
@@ -408,6 +427,62 @@ def artfima(z, glp="ARTFIMA", arimaOrder=(0, 0, 0), likAlg="exact", fixd=None,
             best_valid_solution['x'] = beta.copy()
 
         return negLL
+
+    def EntropyBatch(B):
+        """
+        Negative log-likelihood for a (k, nbeta) batch of parameter vectors.
+
+        Bounds, PACF to AR/MA transforms and invertibility checks are
+        evaluated for the whole batch at once; the likelihood itself is
+        then computed for the admissible rows only.
+        """
+        B = np.atleast_2d(np.asarray(B, dtype=float))
+        k = B.shape[0]
+        count[0] += k
+        out = np.full(k, float(entropyPenalty))
+        ok = np.ones(k, dtype=bool)
+
+        # Extract parameters based on model type
+        d = lambda_param = np.full(k, np.nan)
+        if glpOrder == 2:
+            if fixd is None:  # Full ARTFIMA
+                d = B[:, 0]
+                lambda_param = B[:, 1]
+                ok &= ~(np.abs(d) > dHi)
+            else:  # Constrained ARTFIMA
+                d = np.full(k, float(fixd))
+                lambda_param = B[:, 0]
+            ok &= ~((lambda_param > lambdaHi) | (lambda_param < lambdaLo))
+        elif glpOrder == 1:  # ARFIMA
+            d = B[:, 0]
+            ok &= ~(np.abs(d) >= dfHi)
+
+        # ARMA component: convert PACF to AR/MA coefficients and check invertibility
+        Phi = np.empty((k, 0))
+        Theta = np.empty((k, 0))
+        if p > 0 or q > 0:
+            ok &= ~np.any(np.abs(B[:, glpAdd:(p + q + glpAdd)]) >= 1.0, axis=1)
+            if p > 0:
+                Phi = PacfToARBatch(B[:, glpAdd:(p + glpAdd)])
+                ok &= InvertibleQBatch(Phi)
+            if q > 0:
+                Theta = PacfToARBatch(B[:, (p + glpAdd):(p + q + glpAdd)])
+                ok &= InvertibleQBatch(Theta)
+
+        for i in np.flatnonzero(ok):
+            out[i] = _negLL(
+                B[i],
+                d[i] if glpOrder > 0 else np.array([]),
+                lambda_param[i] if glpOrder == 2 else np.array([]),
+                Phi[i] if p > 0 else np.array([]),
+                Theta[i] if q > 0 else np.array([]),
+            )
+
+        return out
+
+    def Entropy(beta):
+        """Negative log-likelihood function."""
+        return EntropyBatch(np.atleast_1d(beta)[None, :])[0]
     
     # Optimization
     trace = 0
@@ -544,27 +619,22 @@ def artfima(z, glp="ARTFIMA", arimaOrder=(0, 0, 0), likAlg="exact", fixd=None,
         
         # Compute Hessian approximation using numerical differentiation
         try:
-            from scipy.optimize import approx_fprime
             eps = np.sqrt(np.finfo(float).eps)
+            x0 = np.asarray(result.x, dtype=float)
+            # Stencil points: x, x + e_i, x - e_i and x + e_i + e_j (i < j),
+            # evaluated as a single batch
+            E = np.eye(nbeta) * eps
+            iu, ju = np.triu_indices(nbeta, k=1)
+            stencil = np.vstack([x0, x0 + E, x0 - E, x0 + E[iu] + E[ju]])
+            F = EntropyBatch(stencil)
+            fx = F[0]
+            fp = F[1:nbeta + 1]
+            fm = F[nbeta + 1:2 * nbeta + 1]
+            fpp = F[2 * nbeta + 1:]
             hessian = np.zeros((nbeta, nbeta))
-            fx = Entropy(result.x)
-            for i in range(nbeta):
-                for j in range(nbeta):
-                    if i == j:
-                        x1 = result.x.copy()
-                        x1[i] += eps
-                        x2 = result.x.copy()
-                        x2[i] -= eps
-                        hessian[i, j] = (Entropy(x1) - 2 * fx + Entropy(x2)) / (eps**2)
-                    else:
-                        x1 = result.x.copy()
-                        x1[i] += eps
-                        x1[j] += eps
-                        x2 = result.x.copy()
-                        x2[i] += eps
-                        x3 = result.x.copy()
-                        x3[j] += eps
-                        hessian[i, j] = (Entropy(x1) - Entropy(x2) - Entropy(x3) + fx) / (eps**2)
+            hessian[np.diag_indices(nbeta)] = (fp - 2 * fx + fm) / (eps**2)
+            hessian[iu, ju] = (fpp - fp[iu] - fp[ju] + fx) / (eps**2)
+            hessian[ju, iu] = hessian[iu, ju]
         except:
             # Fallback: use identity matrix scaled by function value
             hessian = np.eye(nbeta) * abs(result.fun) if np.isfinite(result.fun) else np.eye(nbeta) * np.nan
@@ -0,0 +1,161 @@
+"""
+Compact binary persistence for ARTFIMA results
+
+Stores the fitted parameters, fit metadata and only the arrays needed for
+forecasting. Derived arrays (TACVF, residuals, undifferenced data) are not
+stored; ARTFIMAResult rebuilds them lazily on first access.
+
+Layout (all integers little-endian):
+
+    magic        8 bytes   b"ARTFIMA\\0"
+    version      uint16
+    reserved     uint16
+    header_len   uint32
+    header       JSON, padded with spaces to an 8-byte boundary
+    data         float64 arrays, back to back
+
+The header holds the scalar fields and, for each array, its offset (in
+float64 elements from the start of the data block) and shape. Loading
+returns read-only views on the input buffer, so no array data is copied.
+"""
+
+import json
+import struct
+import numpy as np
+from .artfima import ARTFIMAResult
+
+FORMAT_MAGIC = b"ARTFIMA\x00"
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sHHI")
+
+# Fields kept in the compact format. Anything else on ARTFIMAResult is
+# either derived (tacvf, res, z_original), redundant (b0 == bHat) or only
+# needed while fitting (hessian, varbeta).
+_FIELDS = (
+    "dHat", "lambdaHat", "phiHat", "thetaHat", "constant", "sigmaSq",
+    "bHat", "seMean", "se", "n", "snr", "likAlg", "LL", "aic", "bic",
+    "nbeta", "convergence", "glp", "arimaOrder", "glpOrder", "fixd",
+    "glpAdd", "z", "nullModelLogLik", "onBoundary", "message", "optAlg",
+    "integ_order", "last_values",
+)
+
+
+def _toJSON(value):
+    """Convert numpy scalars to plain Python values for the header."""
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        return float(value)
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+def isCompactResult(buf):
+    """
+    Check whether a byte buffer holds a result in the compact format.
+
+    Parameters:
+    -----------
+    buf : bytes-like
+        Serialized data
+
+    Returns:
+    --------
+    bool
+        True if buf starts with the compact format magic
+    """
+    return bytes(buf[:len(FORMAT_MAGIC)]) == FORMAT_MAGIC
+
+
+def resultToBytes(result):
+    """
+    Serialize an ARTFIMAResult to the compact binary format.
+
+    Parameters:
+    -----------
+    result : ARTFIMAResult
+        Fitted model result
+
+    Returns:
+    --------
+    bytes
+        Serialized result
+    """
+    fields = {}
+    arrays = {}
+    chunks = []
+    offset = 0
+
+    for name in _FIELDS:
+        value = getattr(result, name, None)
+        if name == "arimaOrder" and value is not None:
+            fields[name] = [int(v) for v in np.asarray(value).ravel()]
+        elif isinstance(value, np.ndarray) or (name == "last_values" and value is not None):
+            arr = np.ascontiguousarray(value, dtype="<f8")
+            arrays[name] = [offset, list(arr.shape)]
+            chunks.append(arr.tobytes())
+            offset += arr.size
+        else:
+            fields[name] = _toJSON(value)
+
+    header = json.dumps({"fields": fields, "arrays": arrays}).encode("utf-8")
+    # Pad so the data block starts on an 8-byte boundary
+    pad = (-(_PREAMBLE.size + len(header))) % 8
+    header += b" " * pad
+
+    preamble = _PREAMBLE.pack(FORMAT_MAGIC, FORMAT_VERSION, 0, len(header))
+    return b"".join([preamble, header] + chunks)
+
+
+def resultFromBytes(buf):
+    """
+    Load an ARTFIMAResult from the compact binary format.
+
+    Parameters:
+    -----------
+    buf : bytes-like
+        Data produced by resultToBytes
+
+    Returns:
+    --------
+    ARTFIMAResult
+        Result whose arrays are read-only views on buf
+
+    Raises:
+    -------
+    ValueError
+        If buf is not in the compact format or uses a newer version
+    """
+    if len(buf) < _PREAMBLE.size:
+        raise ValueError("Buffer is too short for an ARTFIMA result")
+    magic, version, _, header_len = _PREAMBLE.unpack_from(buf, 0)
+    if magic != FORMAT_MAGIC:
+        raise ValueError("Buffer is not a compact ARTFIMA result")
+    if version > FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported ARTFIMA result format version {version} "
+            f"(this package reads up to {FORMAT_VERSION})"
+        )
+
+    header_start = _PREAMBLE.size
+    data_start = header_start + header_len
+    header = json.loads(bytes(buf[header_start:data_start]).decode("utf-8"))
+
+    result = ARTFIMAResult()
+    for name, value in header["fields"].items():
+        setattr(result, name, value)
+    if result.arimaOrder is not None:
+        result.arimaOrder = np.asarray(result.arimaOrder)
+
+    for name, (offset, shape) in header["arrays"].items():
+        count = int(np.prod(shape)) if shape else 1
+        arr = np.frombuffer(buf, dtype="<f8", count=count,
+                            offset=data_start + 8 * offset)
+        setattr(result, name, arr.reshape(shape))
+
+    result.b0 = result.bHat
+    return result
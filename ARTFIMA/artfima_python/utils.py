@@ -2,7 +2,8 @@
 Utility functions for ARTFIMA models
 
 Includes functions for converting between AR coefficients and partial
-autocorrelation function (PACF) coefficients.
+autocorrelation function (PACF) coefficients, in single-vector form and
+batched form operating on a (k x p) array with one coefficient vector per row.
 """
 
 import numpy as np
@@ -11,77 +12,78 @@ import numpy as np
 def ARToPacf(phi):
     """
     Convert AR coefficients to partial autocorrelation function (PACF).
-    
+
     Parameters:
     -----------
     phi : array-like
         AR coefficients
-        
+
     Returns:
     --------
     numpy.ndarray
         PACF coefficients
     """
-    phi = np.asarray(phi)
-    L = len(phi)
+    phik = np.array(phi, dtype=float)
+    L = len(phik)
     if L == 0:
         return np.array([])
-    
-    phik = phi.copy()
+
     pi = np.zeros(L)
-    
-    for k in range(1, L + 1):
-        LL = L + 1 - k
+
+    # Backward Durbin-Levinson recursion, updating phik in place
+    for LL in range(L, 0, -1):
         a = phik[LL - 1]
-        pi[L - k] = a
-        
+        pi[LL - 1] = a
+
         if abs(a) == 1:
             break
-        
-        phikp1 = np.delete(phik, LL - 1)
-        phik = (phikp1 + a * phikp1[::-1]) / (1 - a**2)
-    
+
+        head = phik[:LL - 1]
+        head[:] = (head + a * head[::-1]) / (1 - a * a)
+
     return pi
 
 
 def PacfToAR(pi):
     """
     Convert partial autocorrelation function (PACF) to AR coefficients.
-    
+
     Parameters:
     -----------
     pi : array-like
         PACF coefficients
-        
+
     Returns:
     --------
     numpy.ndarray
         AR coefficients
     """
-    pi = np.asarray(pi)
+    pi = np.asarray(pi, dtype=float)
     L = len(pi)
     if L == 0:
         return np.array([])
-    if L == 1:
-        return pi
-    
-    phik = np.array([pi[0]])
-    for k in range(2, L + 1):
-        phikm1 = phik.copy()
-        phik = np.concatenate([phikm1 - pi[k-1] * phikm1[::-1], [pi[k-1]]])
-    
+
+    # Forward Durbin-Levinson recursion into a preallocated array
+    phik = np.zeros(L)
+    phik[0] = pi[0]
+    for k in range(1, L):
+        a = pi[k]
+        head = phik[:k]
+        head -= a * head[::-1]
+        phik[k] = a
+
     return phik
 
 
 def InvertibleQ(phi):
     """
     Check if AR coefficients represent an invertible process.
-    
+
     Parameters:
     -----------
     phi : array-like
         AR coefficients
-        
+
     Returns:
     --------
     bool
@@ -96,9 +98,103 @@ def InvertibleQ(phi):
         return False
 
 
+def ARToPacfBatch(phi):
+    """
+    Convert a batch of AR coefficient vectors to PACF coefficients.
 
+    Row-wise equivalent of ARToPacf: the recursion runs once over the
+    columns and updates every row in place.
 
+    Parameters:
+    -----------
+    phi : array-like
+        (k, p) array of AR coefficients, one vector per row. A 1-D
+        array is treated as a single row.
+
+    Returns:
+    --------
+    numpy.ndarray
+        (k, p) array of PACF coefficients
+    """
+    phik = np.array(phi, dtype=float, ndmin=2)
+    k, L = phik.shape
+    pi = np.zeros((k, L))
+    if L == 0:
+        return pi
 
+    work = np.empty((k, L))
+    # Rows that hit |a| == 1 stop updating, matching the early break in ARToPacf
+    active = np.ones(k, dtype=bool)
 
+    for LL in range(L, 0, -1):
+        a = phik[:, LL - 1]
+        pi[active, LL - 1] = a[active]
+        active &= np.abs(a) != 1
 
+        if LL == 1 or not active.any():
+            break
+
+        denom = np.where(active, 1 - a * a, 1.0)
+        head = work[:, :LL - 1]
+        np.multiply(a[:, None], phik[:, LL - 2::-1], out=head)
+        head += phik[:, :LL - 1]
+        np.divide(head, denom[:, None], out=phik[:, :LL - 1])
+
+    return pi
 
+
+def PacfToARBatch(pi):
+    """
+    Convert a batch of PACF coefficient vectors to AR coefficients.
+
+    Row-wise equivalent of PacfToAR using preallocated output and
+    scratch arrays.
+
+    Parameters:
+    -----------
+    pi : array-like
+        (k, p) array of PACF coefficients, one vector per row. A 1-D
+        array is treated as a single row.
+
+    Returns:
+    --------
+    numpy.ndarray
+        (k, p) array of AR coefficients
+    """
+    pi = np.atleast_2d(np.asarray(pi, dtype=float))
+    k, L = pi.shape
+    phik = np.zeros((k, L))
+    if L == 0:
+        return phik
+
+    work = np.empty((k, L))
+    phik[:, 0] = pi[:, 0]
+    for j in range(1, L):
+        head = work[:, :j]
+        np.multiply(pi[:, j:j + 1], phik[:, j - 1::-1], out=head)
+        phik[:, :j] -= head
+        phik[:, j] = pi[:, j]
+
+    return phik
+
+
+def InvertibleQBatch(phi):
+    """
+    Check invertibility for a batch of AR coefficient vectors.
+
+    Parameters:
+    -----------
+    phi : array-like
+        (k, p) array of AR coefficients, one vector per row
+
+    Returns:
+    --------
+    numpy.ndarray
+        Boolean array of length k, True where the row is invertible
+    """
+    phi = np.atleast_2d(np.asarray(phi, dtype=float))
+    if phi.shape[1] == 0:
+        return np.ones(phi.shape[0], dtype=bool)
+    with np.errstate(all='ignore'):
+        pacf = ARToPacfBatch(phi)
+        return np.all(np.abs(pacf) < 1, axis=1)
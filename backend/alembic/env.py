@@ -9,7 +9,7 @@ from app.core.database import Base
 from app.core.config import settings
 
 # Import all models to ensure they're registered with Base.metadata
-from app.models import dataset, project, model  # noqa
+from app.models import dataset, project, model, grid_search, job, fleet  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
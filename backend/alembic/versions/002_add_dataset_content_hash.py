@@ -0,0 +1,46 @@
+"""add content_hash to datasets
+
+Revision ID: 002_add_content_hash
+Revises: 001_rename_metadata
+Create Date: 2025-02-03
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002_add_content_hash'
+down_revision = '001_rename_metadata'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the uploaded file; uploads with identical content share
+    # one stored file and one parsed artifact
+    from sqlalchemy import inspect
+    from alembic import context
+    
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('datasets')]
+    
+    if 'content_hash' not in columns:
+        with op.batch_alter_table('datasets', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('content_hash', sa.String(), nullable=True))
+            batch_op.create_index('ix_datasets_content_hash', ['content_hash'])
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+    
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('datasets')]
+    
+    if 'content_hash' in columns:
+        with op.batch_alter_table('datasets', schema=None) as batch_op:
+            batch_op.drop_index('ix_datasets_content_hash')
+            batch_op.drop_column('content_hash')
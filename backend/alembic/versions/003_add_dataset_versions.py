@@ -0,0 +1,62 @@
+"""add dataset versions and model dataset links
+
+Revision ID: 003_dataset_versions
+Revises: 002_add_content_hash
+Create Date: 2025-02-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_dataset_versions'
+down_revision = '002_add_content_hash'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Datasets are versioned by appends; models remember the dataset (and
+    # version) they were trained on so they can be refreshed incrementally
+    from sqlalchemy import inspect
+    from alembic import context
+    
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    dataset_columns = [col['name'] for col in inspector.get_columns('datasets')]
+    model_columns = [col['name'] for col in inspector.get_columns('models')]
+    
+    if 'version' not in dataset_columns:
+        with op.batch_alter_table('datasets', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    
+    if 'dataset_id' not in model_columns:
+        with op.batch_alter_table('models', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('dataset_id', sa.String(), nullable=True))
+            batch_op.add_column(sa.Column('dataset_version', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('data_source', sa.JSON(), nullable=True))
+            batch_op.create_index('ix_models_dataset_id', ['dataset_id'])
+            batch_op.create_foreign_key('fk_models_dataset_id', 'datasets', ['dataset_id'], ['id'])
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+    
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    dataset_columns = [col['name'] for col in inspector.get_columns('datasets')]
+    model_columns = [col['name'] for col in inspector.get_columns('models')]
+    
+    if 'dataset_id' in model_columns:
+        with op.batch_alter_table('models', schema=None) as batch_op:
+            batch_op.drop_constraint('fk_models_dataset_id', type_='foreignkey')
+            batch_op.drop_index('ix_models_dataset_id')
+            batch_op.drop_column('data_source')
+            batch_op.drop_column('dataset_version')
+            batch_op.drop_column('dataset_id')
+    
+    if 'version' in dataset_columns:
+        with op.batch_alter_table('datasets', schema=None) as batch_op:
+            batch_op.drop_column('version')
@@ -0,0 +1,77 @@
+"""add grid search runs and candidates
+
+Revision ID: 004_grid_search_results
+Revises: 003_dataset_versions
+Create Date: 2025-02-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_grid_search_results'
+down_revision = '003_dataset_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Grid search candidates are saved as they are fitted, so progress and
+    # partial results survive the task that produced them
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'grid_search_runs' not in tables:
+        op.create_table(
+            'grid_search_runs',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('config', sa.JSON(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('best_order', sa.JSON(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'grid_search_candidates' not in tables:
+        op.create_table(
+            'grid_search_candidates',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('run_id', sa.String(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('order', sa.JSON(), nullable=False),
+            sa.Column('aic', sa.Float(), nullable=True),
+            sa.Column('bic', sa.Float(), nullable=True),
+            sa.Column('hqic', sa.Float(), nullable=True),
+            sa.Column('fit_seconds', sa.Float(), nullable=True),
+            sa.Column('converged', sa.Boolean(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.ForeignKeyConstraint(['run_id'], ['grid_search_runs.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('run_id', 'position', name='uq_grid_search_candidates_run_position')
+        )
+        op.create_index('ix_grid_search_candidates_run_id', 'grid_search_candidates', ['run_id'])
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'grid_search_candidates' in tables:
+        op.drop_index('ix_grid_search_candidates_run_id', table_name='grid_search_candidates')
+        op.drop_table('grid_search_candidates')
+
+    if 'grid_search_runs' in tables:
+        op.drop_table('grid_search_runs')
@@ -0,0 +1,46 @@
+"""add grid search candidate iterations and phase
+
+Revision ID: 005_candidate_phase
+Revises: 004_grid_search_results
+Create Date: 2025-02-24
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_candidate_phase'
+down_revision = '004_grid_search_results'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Two-phase searches record which phase produced a candidate's numbers
+    # and how many optimizer iterations it took
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('grid_search_candidates')]
+
+    if 'phase' not in columns:
+        with op.batch_alter_table('grid_search_candidates', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('iterations', sa.Integer(), nullable=True))
+            batch_op.add_column(sa.Column('phase', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('grid_search_candidates')]
+
+    if 'phase' in columns:
+        with op.batch_alter_table('grid_search_candidates', schema=None) as batch_op:
+            batch_op.drop_column('phase')
+            batch_op.drop_column('iterations')
@@ -0,0 +1,60 @@
+"""add candidate fit store
+
+Revision ID: 006_candidate_fits
+Revises: 005_candidate_phase
+Create Date: 2025-03-03
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_candidate_fits'
+down_revision = '005_candidate_phase'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fitted SARIMAX candidates keyed by data, transformation, orders and
+    # exog, so repeated and interrupted grid searches skip finished fits
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+
+    if 'candidate_fits' not in inspector.get_table_names():
+        op.create_table(
+            'candidate_fits',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('key', sa.String(), nullable=False),
+            sa.Column('data_hash', sa.String(), nullable=False),
+            sa.Column('transformation', sa.String(), nullable=True),
+            sa.Column('order', sa.JSON(), nullable=False),
+            sa.Column('seasonal_order', sa.JSON(), nullable=False),
+            sa.Column('exog_signature', sa.String(), nullable=True),
+            sa.Column('aic', sa.Float(), nullable=True),
+            sa.Column('bic', sa.Float(), nullable=True),
+            sa.Column('hqic', sa.Float(), nullable=True),
+            sa.Column('fit_seconds', sa.Float(), nullable=True),
+            sa.Column('converged', sa.Boolean(), nullable=True),
+            sa.Column('iterations', sa.Integer(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_candidate_fits_key', 'candidate_fits', ['key'], unique=True)
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+
+    if 'candidate_fits' in inspector.get_table_names():
+        op.drop_index('ix_candidate_fits_key', table_name='candidate_fits')
+        op.drop_table('candidate_fits')
@@ -0,0 +1,43 @@
+"""add grid search run task ids
+
+Revision ID: 007_grid_search_task_ids
+Revises: 006_candidate_fits
+Create Date: 2025-03-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_grid_search_task_ids'
+down_revision = '006_candidate_fits'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Celery ids of a run's candidate subtasks, revoked when it is cancelled
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('grid_search_runs')]
+
+    if 'task_ids' not in columns:
+        with op.batch_alter_table('grid_search_runs', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('task_ids', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('grid_search_runs')]
+
+    if 'task_ids' in columns:
+        with op.batch_alter_table('grid_search_runs', schema=None) as batch_op:
+            batch_op.drop_column('task_ids')
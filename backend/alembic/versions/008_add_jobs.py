@@ -0,0 +1,57 @@
+"""add jobs
+
+Revision ID: 008_jobs
+Revises: 007_grid_search_task_ids
+Create Date: 2025-03-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_jobs'
+down_revision = '007_grid_search_task_ids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Heavy endpoints also run as jobs (Celery or a local process pool);
+    # their status and results are kept here
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+
+    if 'jobs' not in inspector.get_table_names():
+        op.create_table(
+            'jobs',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('kind', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('backend', sa.String(), nullable=True),
+            sa.Column('params', sa.JSON(), nullable=False),
+            sa.Column('estimated_seconds', sa.Float(), nullable=True),
+            sa.Column('result', sa.JSON(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('error_status', sa.Integer(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_jobs_kind', 'jobs', ['kind'], unique=False)
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+
+    if 'jobs' in inspector.get_table_names():
+        op.drop_index('ix_jobs_kind', table_name='jobs')
+        op.drop_table('jobs')
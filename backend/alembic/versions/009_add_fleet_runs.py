@@ -0,0 +1,84 @@
+"""add fleet runs
+
+Revision ID: 009_fleet_runs
+Revises: 008_jobs
+Create Date: 2025-03-24
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009_fleet_runs'
+down_revision = '008_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fleet progress and per-series outcomes are stored as series finish,
+    # so any API worker can report them and they outlive a restart
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'fleet_runs' not in tables:
+        op.create_table(
+            'fleet_runs',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('dataset_id', sa.String(), nullable=False),
+            sa.Column('model_type', sa.String(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('targets', sa.JSON(), nullable=False),
+            sa.Column('total', sa.Integer(), nullable=False),
+            sa.Column('trained', sa.Integer(), nullable=False),
+            sa.Column('failed', sa.Integer(), nullable=False),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_fleet_runs_dataset_id', 'fleet_runs', ['dataset_id'])
+
+    if 'fleet_run_results' not in tables:
+        op.create_table(
+            'fleet_run_results',
+            sa.Column('id', sa.String(), nullable=False),
+            sa.Column('run_id', sa.String(), nullable=False),
+            sa.Column('position', sa.Integer(), nullable=False),
+            sa.Column('target_column', sa.String(), nullable=False),
+            sa.Column('series_id', sa.String(), nullable=True),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('model_id', sa.String(), nullable=True),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('metrics', sa.JSON(), nullable=True),
+            sa.Column('nobs', sa.Integer(), nullable=True),
+            sa.Column('fit_seconds', sa.Float(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['run_id'], ['fleet_runs.id'], ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('run_id', 'position', name='uq_fleet_run_results_run_position')
+        )
+        op.create_index('ix_fleet_run_results_run_id', 'fleet_run_results', ['run_id'])
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    tables = inspector.get_table_names()
+
+    if 'fleet_run_results' in tables:
+        op.drop_index('ix_fleet_run_results_run_id', table_name='fleet_run_results')
+        op.drop_table('fleet_run_results')
+
+    if 'fleet_runs' in tables:
+        op.drop_index('ix_fleet_runs_dataset_id', table_name='fleet_runs')
+        op.drop_table('fleet_runs')
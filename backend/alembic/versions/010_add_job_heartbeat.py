@@ -0,0 +1,44 @@
+"""add job heartbeat
+
+Revision ID: 010_job_heartbeat
+Revises: 009_fleet_runs
+Create Date: 2025-03-31
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_job_heartbeat'
+down_revision = '009_fleet_runs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Refreshed while a job runs, so jobs whose process died are failed
+    # instead of staying "running"
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('jobs')]
+
+    if 'heartbeat_at' not in columns:
+        with op.batch_alter_table('jobs', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('jobs')]
+
+    if 'heartbeat_at' in columns:
+        with op.batch_alter_table('jobs', schema=None) as batch_op:
+            batch_op.drop_column('heartbeat_at')
@@ -0,0 +1,44 @@
+"""add model data version
+
+Revision ID: 011_model_data_version
+Revises: 010_job_heartbeat
+Create Date: 2025-04-07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_model_data_version'
+down_revision = '010_job_heartbeat'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Counter bumped whenever model_data is rewritten; the fitted model and
+    # forecast caches are keyed by it instead of updated_at
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('models')]
+
+    if 'data_version' not in columns:
+        with op.batch_alter_table('models', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('data_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    from sqlalchemy import inspect
+    from alembic import context
+
+    bind = context.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('models')]
+
+    if 'data_version' in columns:
+        with op.batch_alter_table('models', schema=None) as batch_op:
+            batch_op.drop_column('data_version')
@@ -1,4 +1,4 @@
 """API v1 routes"""
-from app.api.v1 import datasets, preprocessing, analysis, models, projects
+from app.api.v1 import datasets, preprocessing, analysis, models, projects, jobs
 
-__all__ = ["datasets", "preprocessing", "analysis", "models", "projects"]
+__all__ = ["datasets", "preprocessing", "analysis", "models", "projects", "jobs"]
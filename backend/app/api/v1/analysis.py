@@ -6,8 +6,10 @@ from typing import Dict, Optional
 import pandas as pd
 from sqlalchemy.orm import Session
 
+from app.core.compute import compute_executor
 from app.core.database import get_db
 from app.models.dataset import Dataset
+from app.services.data.dataset_store import dataset_store
 from app.schemas.analysis import (
     ACFPACFRequest,
     ACFPACFResponse,
@@ -23,6 +25,10 @@ router = APIRouter(prefix="/analysis", tags=["analysis"])
 @router.post("/acf-pacf", response_model=ACFPACFResponse)
 async def calculate_acf_pacf(request: ACFPACFRequest, db: Session = Depends(get_db)):
     """Calculate ACF and PACF values"""
+    return await compute_executor.run(_acf_pacf, request, db)
+
+
+def _acf_pacf(request: ACFPACFRequest, db: Session) -> ACFPACFResponse:
     try:
         timeseries = None
         
@@ -36,8 +42,10 @@ async def calculate_acf_pacf(request: ACFPACFRequest, db: Session = Depends(get_
             if not dataset.file_path:
                 raise HTTPException(status_code=400, detail="Dataset file not found")
             
-            # Load and transform data
-            df = pd.read_csv(dataset.file_path)
+            # Load and transform data (only the two columns needed, of one series for panel datasets)
+            df = dataset_store.load_series(
+                dataset, [request.date_column, request.target_column], request.series_id
+            )
             
             # Validate columns exist
             if request.date_column not in df.columns:
@@ -98,6 +106,10 @@ async def calculate_acf_pacf(request: ACFPACFRequest, db: Session = Depends(get_
 @router.post("/decompose", response_model=DecompositionResponse)
 async def decompose_series(request: DecompositionRequest):
     """Perform seasonal decomposition"""
+    return await compute_executor.run(_decompose, request)
+
+
+def _decompose(request: DecompositionRequest) -> DecompositionResponse:
     try:
         # Convert dict to Series
         timeseries = pd.Series(request.timeseries_data)
@@ -114,6 +126,10 @@ async def decompose_series(request: DecompositionRequest):
 @router.get("/statistics")
 async def get_statistics(timeseries_data: Dict[str, float]):
     """Get descriptive statistics"""
+    return await compute_executor.run(_statistics, timeseries_data)
+
+
+def _statistics(timeseries_data: Dict[str, float]) -> dict:
     try:
         series = pd.Series(timeseries_data)
         
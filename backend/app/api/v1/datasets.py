@@ -1,23 +1,166 @@
 """
 Dataset API endpoints
 """
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import Any, Dict, List, Tuple
+import hashlib
+import json
 import os
 import shutil
+import uuid
 from pathlib import Path
 
+from app.core.compute import ComputeOverloaded, compute_executor
 from app.core.database import get_db
 from app.core.config import settings
-from app.schemas.dataset import DatasetResponse, DatasetUploadResponse, LoadSampleRequest
+from app.schemas.dataset import (
+    DatasetResponse,
+    DatasetUploadResponse,
+    DatasetAppendResponse,
+    LoadSampleRequest,
+    PanelRequest,
+    ResampleRequest
+)
 from app.services.data.import_service import DataImportService
+from app.services.data.dataset_store import dataset_store
+from app.services.data.sample_catalog import sample_catalog
+from app.services.data.downsampling_service import DownsamplingService
+from app.services.data.panel_service import PanelService
+from app.services.preprocessing.resampling_service import ResamplingService
+from app.services.modeling.refresh_service import ModelRefreshService
 from app.models.dataset import Dataset
+from app.models.model import Model
 from pydantic import BaseModel
 from typing import Optional
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
 
+UPLOAD_READ_BYTES = 1024 * 1024
+
+
+async def _stream_upload(file: UploadFile, file_path: Path) -> str:
+    """
+    Stream an upload to disk in fixed-size chunks, enforcing MAX_UPLOAD_SIZE
+    
+    Returns:
+        SHA-256 hex digest of the content
+    
+    Raises:
+        HTTPException: 413 if the upload exceeds the size limit
+    """
+    limit_mb = f"{settings.MAX_UPLOAD_SIZE / (1024 * 1024):g}"
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail=f"File exceeds the maximum upload size of {limit_mb} MB")
+    
+    digest = hashlib.sha256()
+    written = 0
+    try:
+        with open(file_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_READ_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > settings.MAX_UPLOAD_SIZE:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File exceeds the maximum upload size of {limit_mb} MB"
+                    )
+                digest.update(chunk)
+                buffer.write(chunk)
+    except BaseException:
+        if file_path.exists():
+            file_path.unlink()
+        raise
+    return digest.hexdigest()
+
+
+def _incoming_path(upload_dir: Path, suffix: str = "") -> Path:
+    """Fresh temporary path for an upload in progress"""
+    incoming_dir = upload_dir / ".incoming"
+    incoming_dir.mkdir(parents=True, exist_ok=True)
+    return incoming_dir / f"{uuid.uuid4().hex}{suffix}"
+
+
+async def _save_upload(file: UploadFile, upload_dir: Path) -> Tuple[Path, str]:
+    """
+    Stream an upload into the uploads directory under its content hash
+    
+    The file is hashed while it streams and stored as
+    ``<sha256><ext>``, so identical uploads end up in the same file and
+    different files with the same name never overwrite each other.
+    
+    Returns:
+        Tuple of (stored file path, SHA-256 hex digest of the content)
+    
+    Raises:
+        HTTPException: 413 if the upload exceeds the size limit
+    """
+    tmp_path = _incoming_path(upload_dir)
+    content_hash = await _stream_upload(file, tmp_path)
+    
+    file_path = upload_dir / f"{content_hash}{Path(file.filename).suffix.lower()}"
+    if file_path.exists():
+        # Same content already stored; keep the existing file (and its
+        # mtime, which the parsed artifact is validated against)
+        tmp_path.unlink()
+    else:
+        os.replace(tmp_path, file_path)
+    return file_path, content_hash
+
+
+def _sharing(db: Session, dataset: Dataset) -> Tuple[bool, bool]:
+    """
+    Whether a dataset's file and its columnar artifact are used by others
+    
+    Uploads with identical content share one file and one artifact. Sample
+    files belong to the samples directory and count as shared.
+    """
+    others = db.query(Dataset).filter(Dataset.id != dataset.id)
+    file_shared = bool((dataset.meta_data or {}).get("is_sample")) or (
+        bool(dataset.file_path)
+        and others.filter(Dataset.file_path == dataset.file_path).first() is not None
+    )
+    artifact_shared = (
+        bool(dataset.content_hash)
+        and others.filter(Dataset.content_hash == dataset.content_hash).first() is not None
+    )
+    return file_shared, artifact_shared
+
+
+def _own_file(db: Session, dataset: Dataset, upload_dir: Path) -> None:
+    """
+    Give a dataset a file and artifact of its own before changing them in place
+    
+    Shared files and artifacts are copied, others are renamed. The dataset
+    keeps its data but stops being content-addressed.
+    """
+    target = upload_dir / f"{dataset.id}{Path(dataset.file_path).suffix.lower()}"
+    if Path(dataset.file_path) == target:
+        return
+    
+    file_shared, artifact_shared = _sharing(db, dataset)
+    source_key = dataset_store.artifact_key(dataset)
+    if file_shared:
+        # copy2 keeps the mtime, so the copied artifact stays valid
+        shutil.copy2(dataset.file_path, target)
+    else:
+        os.replace(dataset.file_path, target)
+    if source_key != dataset.id and dataset_store.has_artifact(source_key):
+        if artifact_shared:
+            dataset_store.clone(source_key, dataset.id)
+        else:
+            dataset_store.move(source_key, dataset.id)
+    
+    meta_data = {**(dataset.meta_data or {}), "file_path": str(target)}
+    meta_data.pop("is_sample", None)
+    dataset.file_path = str(target)
+    dataset.content_hash = None
+    dataset.meta_data = meta_data
+    db.commit()
+
 
 class SampleDatasetInfo(BaseModel):
     filename: str
@@ -26,90 +169,20 @@ class SampleDatasetInfo(BaseModel):
     frequency: str
     rows: int
     columns: list[str]
+    date_column: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    column_stats: Dict[str, Any] = {}
 
 
 @router.get("/samples", response_model=List[SampleDatasetInfo])
 def list_sample_datasets():
     """
     List all available sample datasets
-    """
-    samples_dir = Path(settings.SAMPLES_DIR)
-    if not samples_dir.exists():
-        return []
-    
-    samples = []
-    sample_info = {
-        "air_passengers.csv": {
-            "name": "Air Passengers",
-            "description": "Monthly totals of international airline passengers (1949-1960)",
-            "frequency": "Monthly",
-            "columns": ["date", "passengers"]
-        },
-        "co2_levels.csv": {
-            "name": "CO2 Levels",
-            "description": "Monthly atmospheric CO2 concentrations at Mauna Loa Observatory",
-            "frequency": "Monthly",
-            "columns": ["date", "co2"]
-        },
-        "sunspots.csv": {
-            "name": "Sunspots",
-            "description": "Monthly mean total sunspot numbers (1749-2023)",
-            "frequency": "Monthly",
-            "columns": ["date", "sunspots"]
-        },
-        "retail_sales.csv": {
-            "name": "Retail Sales",
-            "description": "Monthly retail sales in the US (1992-2023)",
-            "frequency": "Monthly",
-            "columns": ["date", "sales"]
-        },
-        "temperature.csv": {
-            "name": "Temperature",
-            "description": "Global average temperature anomalies (1880-2023)",
-            "frequency": "Monthly",
-            "columns": ["date", "temperature"]
-        },
-        "stock_aapl.csv": {
-            "name": "Stock Price - AAPL",
-            "description": "Apple Inc. (AAPL) daily closing stock prices (2010-2023)",
-            "frequency": "Daily",
-            "columns": ["date", "close"]
-        },
-        "electricity.csv": {
-            "name": "Electricity Consumption",
-            "description": "Monthly electricity consumption in a region (2000-2023)",
-            "frequency": "Monthly",
-            "columns": ["date", "consumption"]
-        },
-        "gdp_growth.csv": {
-            "name": "GDP Growth",
-            "description": "Quarterly GDP growth rate (1960-2023)",
-            "frequency": "Quarterly",
-            "columns": ["date", "gdp_growth"]
-        },
-    }
     
-    for csv_file in samples_dir.glob("*.csv"):
-        if csv_file.name in sample_info:
-            info = sample_info[csv_file.name]
-            # Count rows
-            try:
-                import pandas as pd
-                df = pd.read_csv(csv_file)
-                rows = len(df)
-            except:
-                rows = 0
-            
-            samples.append(SampleDatasetInfo(
-                filename=csv_file.name,
-                name=info["name"],
-                description=info["description"],
-                frequency=info["frequency"],
-                rows=rows,
-                columns=info["columns"]
-            ))
-    
-    return samples
+    Served from the sample catalog; sample files are only parsed when they change.
+    """
+    return [SampleDatasetInfo(**info) for info in sample_catalog.list()]
 
 
 @router.post("/samples/load", response_model=DatasetUploadResponse)
@@ -120,24 +193,31 @@ async def load_sample_dataset(
     """
     Load a sample dataset into the system
     """
-    samples_dir = Path(settings.SAMPLES_DIR)
-    file_path = samples_dir / request.filename
-    
-    if not file_path.exists():
+    return await compute_executor.run(_load_sample, request, db)
+
+
+def _load_sample(request: LoadSampleRequest, db: Session) -> DatasetUploadResponse:
+    """Copy a sample's parsed data into a new dataset"""
+    entry = sample_catalog.get(request.filename)
+    if entry is None:
         raise HTTPException(
             status_code=404,
             detail=f"Sample dataset '{request.filename}' not found"
         )
+    file_path = Path(settings.SAMPLES_DIR) / request.filename
     
+    dataset_id = str(uuid.uuid4())
     try:
-        # Parse file
-        df, metadata = DataImportService.parse_file(str(file_path))
+        # Reuse the catalog's parsed copy instead of parsing the file again
+        dataset_store.clone(entry["artifact_id"], dataset_id)
+        metadata = dict(entry["metadata"])
         
-        # Validate dataframe
-        validation = DataImportService.validate_dataframe(df)
+        # Validate from the statistics collected while parsing
+        validation = DataImportService.validate_metadata(metadata)
         
         # Create dataset record
         dataset = Dataset(
+            id=dataset_id,
             name=f"Sample: {request.filename.replace('.csv', '').replace('_', ' ').title()}",
             filename=request.filename,
             columns=metadata["columns"],
@@ -157,18 +237,22 @@ async def load_sample_dataset(
         )
         
     except Exception as e:
+        dataset_store.delete(dataset_id)
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/upload", response_model=DatasetUploadResponse)
 async def upload_dataset(
     file: UploadFile = File(...),
+    series_column: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """
     Upload and parse a dataset file
     
-    Supports CSV, TXT, XLS, XLSX formats
+    Supports CSV, TXT, XLS, XLSX formats. Long-format files holding many
+    series are stored as panel datasets, partitioned by series_column (or
+    by a series column detected from the data if none is given).
     """
     # Validate file extension
     file_ext = Path(file.filename).suffix.lower()
@@ -182,42 +266,87 @@ async def upload_dataset(
     upload_dir = Path(settings.UPLOAD_DIR)
     upload_dir.mkdir(exist_ok=True)
     
-    # Save uploaded file
-    file_path = upload_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    # Save uploaded file under its content hash
+    file_path, content_hash = await _save_upload(file, upload_dir)
+    
+    # Parsing and partitioning are CPU-bound: keep them off the event loop
+    return await compute_executor.run(
+        _register_upload, file.filename, file_path, content_hash, series_column, db
+    )
+
+
+def _register_upload(
+    filename: str,
+    file_path: Path,
+    content_hash: str,
+    series_column: Optional[str],
+    db: Session
+) -> DatasetUploadResponse:
+    """Parse a saved upload (unless identical content was parsed before) and store the dataset"""
+    # Identical content uploaded before: reuse its parse instead of re-parsing
+    existing = db.query(Dataset).filter(Dataset.content_hash == content_hash).first()
+    reuse = existing is not None and existing.meta_data and dataset_store.has_artifact(content_hash)
     
     try:
-        # Parse file
-        df, metadata = DataImportService.parse_file(str(file_path))
+        if reuse:
+            metadata = dict(existing.meta_data)
+        else:
+            # Parse file in chunks straight into the columnar format
+            metadata = DataImportService.ingest_file(str(file_path), content_hash)
+        metadata["filename"] = filename
         
-        # Validate dataframe
-        validation = DataImportService.validate_dataframe(df)
+        # Validate from the statistics collected while parsing
+        validation = DataImportService.validate_metadata(metadata)
         
         # Create dataset record
         dataset = Dataset(
-            name=metadata["filename"],
-            filename=metadata["filename"],
+            name=filename,
+            filename=filename,
             columns=metadata["columns"],
             row_count=metadata["row_count"],
             file_path=str(file_path),
+            content_hash=content_hash,
             meta_data=metadata,  # Use meta_data (metadata is reserved by SQLAlchemy)
         )
         
+        # Partition long-format data by series
+        current_panel = metadata.get("panel")
+        if series_column is not None:
+            if not current_panel or current_panel["series_column"] != series_column:
+                metadata["panel"] = PanelService.configure(dataset, series_column)
+        elif not reuse:
+            try:
+                metadata["panel"] = PanelService.configure(dataset)
+            except Exception as e:
+                print(f"Warning: Could not detect series in {filename}: {e}")
+        if not metadata.get("panel"):
+            metadata.pop("panel", None)
+        dataset.meta_data = metadata
+        
         db.add(dataset)
         db.commit()
         db.refresh(dataset)
         
+        message = (
+            "Dataset uploaded successfully (identical content already parsed, reused)"
+            if reuse else "Dataset uploaded successfully"
+        )
+        if metadata.get("panel"):
+            panel = metadata["panel"]
+            message += f"; {panel['series_count']} series in column '{panel['series_column']}'"
+        
         return DatasetUploadResponse(
             dataset=DatasetResponse.model_validate(dataset),
             validation=validation,
-            message="Dataset uploaded successfully"
+            message=message
         )
         
     except Exception as e:
-        # Clean up file on error
-        if file_path.exists():
-            file_path.unlink()
+        # Clean up file on error, unless other datasets share it
+        if existing is None:
+            if file_path.exists():
+                file_path.unlink()
+            dataset_store.delete(content_hash)
         raise HTTPException(status_code=400, detail=str(e))
 
 
@@ -236,6 +365,11 @@ async def get_dataset_data(
     """
     Get the raw data from a dataset file
     """
+    return await compute_executor.run(_read_dataset_file, dataset_id, db)
+
+
+def _read_dataset_file(dataset_id: str, db: Session) -> Dict[str, str]:
+    """Content of a dataset's source file"""
     dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
@@ -251,6 +385,303 @@ async def get_dataset_data(
         raise HTTPException(status_code=500, detail=f"Error reading dataset file: {str(e)}")
 
 
+@router.get("/{dataset_id}/series")
+def get_dataset_series(
+    dataset_id: str,
+    column: str,
+    date_column: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    max_points: int = Query(2000, ge=3, le=settings.SERIES_MAX_POINTS),
+    method: str = "lttb",
+    series_id: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get one column of a dataset for charting
+    
+    Optionally restricted to a date range and downsampled to at most
+    max_points points (LTTB or min/max bucketing). Panel datasets need
+    series_id to pick the series.
+    """
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    try:
+        columns = [date_column, column] if date_column else [column]
+        df = dataset_store.load_series(dataset, columns, series_id)
+        return DownsamplingService.series(df, column, date_column, start, end, max_points, method)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset file not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _series_suffix(series_id: Optional[str]) -> str:
+    """Filename part naming a panel series"""
+    if series_id is None:
+        return ""
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(series_id))
+    return f"_{safe}"
+
+
+@router.post("/{dataset_id}/resample", response_model=DatasetUploadResponse)
+def resample_dataset(
+    dataset_id: str,
+    request: ResampleRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Resample dataset columns to a target frequency as a new derived dataset
+    
+    The result is stored like an upload, so analysis and training can use
+    it directly. Repeating the same request against an unchanged source
+    returns the dataset created the first time. Panel datasets are
+    resampled one series at a time: series_id picks the series.
+    """
+    source = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not source:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if not source.file_path or not Path(source.file_path).exists():
+        raise HTTPException(status_code=404, detail="Dataset file not found")
+    
+    try:
+        freq = ResamplingService.resolve_frequency(request.frequency)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # Rows of different series must not be aggregated together
+    panel = dataset_store.panel_config(source)
+    if panel and request.series_id is None:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"Dataset holds {panel['series_count']} series in column '{panel['series_column']}'; "
+                "pass series_id to select one"
+            )
+        )
+    
+    # Derived datasets are keyed by their inputs, including the source file version
+    spec = {
+        "source_id": source.id,
+        "source_version": os.stat(source.file_path).st_mtime_ns,
+        "date_column": request.date_column,
+        "columns": request.columns,
+        "frequency": freq,
+        "aggregator": request.aggregator,
+        "quantiles": request.quantiles if request.aggregator == "quantile" else None,
+    }
+    if request.series_id is not None:
+        spec["series_id"] = request.series_id
+    key = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    derived_dir = Path(settings.UPLOAD_DIR) / "derived"
+    file_path = derived_dir / f"{key}.csv"
+    
+    existing = db.query(Dataset).filter(Dataset.file_path == str(file_path)).first()
+    if existing:
+        return DatasetUploadResponse(
+            dataset=DatasetResponse.model_validate(existing),
+            validation=DataImportService.validate_metadata(existing.meta_data),
+            message="Resampled dataset already exists"
+        )
+    
+    try:
+        df = dataset_store.load_series(source, [request.date_column] + request.columns, request.series_id)
+        result = ResamplingService.resample(
+            df,
+            request.date_column,
+            request.columns,
+            freq,
+            request.aggregator,
+            request.quantiles
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    new_id = str(uuid.uuid4())
+    try:
+        derived_dir.mkdir(parents=True, exist_ok=True)
+        result.to_csv(file_path, index=False)
+        manifest = dataset_store.write(new_id, result, str(file_path))
+        metadata = DataImportService.metadata_from_manifest(str(file_path), manifest)
+        metadata["derived_from"] = spec
+        
+        dataset = Dataset(
+            id=new_id,
+            name=(
+                f"{source.name} ({request.frequency} {request.aggregator})"
+                if request.series_id is None
+                else f"{source.name} [{request.series_id}] ({request.frequency} {request.aggregator})"
+            ),
+            filename=f"{Path(source.filename).stem}{_series_suffix(request.series_id)}_{freq}_{request.aggregator}.csv",
+            columns=metadata["columns"],
+            row_count=metadata["row_count"],
+            file_path=str(file_path),
+            meta_data=metadata,
+        )
+        db.add(dataset)
+        db.commit()
+        db.refresh(dataset)
+    except Exception as e:
+        if file_path.exists():
+            file_path.unlink()
+        dataset_store.delete(new_id)
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return DatasetUploadResponse(
+        dataset=DatasetResponse.model_validate(dataset),
+        validation=DataImportService.validate_metadata(metadata),
+        message="Resampled dataset created successfully"
+    )
+
+
+@router.get("/{dataset_id}/panel")
+def get_dataset_panel(dataset_id: str, db: Session = Depends(get_db)):
+    """List the series of a panel dataset with their row counts and date ranges"""
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    panel = dataset_store.panel_config(dataset)
+    if not panel:
+        raise HTTPException(status_code=404, detail="Dataset is not a panel dataset")
+    
+    try:
+        series = dataset_store.panel_series(dataset)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Dataset file not found")
+    return {**panel, "series": series}
+
+
+@router.put("/{dataset_id}/panel")
+def set_dataset_panel(dataset_id: str, request: PanelRequest, db: Session = Depends(get_db)):
+    """
+    Treat a dataset as a panel partitioned by a series column
+    
+    Without series_column, the series column is detected from the data.
+    """
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    try:
+        panel = PanelService.configure(dataset, request.series_column, request.date_column)
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if panel is None:
+        raise HTTPException(status_code=400, detail="No series column found; pass series_column")
+    
+    dataset.meta_data = {**(dataset.meta_data or {}), "panel": panel}
+    db.commit()
+    return panel
+
+
+@router.delete("/{dataset_id}/panel")
+def delete_dataset_panel(dataset_id: str, db: Session = Depends(get_db)):
+    """Treat a panel dataset as a single series again"""
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    meta_data = dict(dataset.meta_data or {})
+    if meta_data.pop("panel", None) is not None:
+        dataset.meta_data = meta_data
+        db.commit()
+    return {"message": "Dataset is no longer a panel dataset"}
+
+
+@router.post("/{dataset_id}/append", response_model=DatasetAppendResponse)
+async def append_dataset_rows(
+    dataset_id: str,
+    file: UploadFile = File(...),
+    refresh_models: bool = True,
+    db: Session = Depends(get_db)
+):
+    """
+    Append rows to a dataset and bump its version
+    
+    The file must have the dataset's columns and CSV layout (including the
+    header row if the dataset has one). The rows are added to the stored
+    file and columnar data without rewriting them. Unless refresh_models is
+    false, SARIMAX models trained on the dataset are then updated with the
+    new observations, keeping their fitted parameters.
+    """
+    file_ext = await run_in_threadpool(_append_target, dataset_id, db)
+    
+    upload_dir = Path(settings.UPLOAD_DIR)
+    upload_dir.mkdir(exist_ok=True)
+    rows_path = _incoming_path(upload_dir, file_ext)
+    await _stream_upload(file, rows_path)
+    
+    # Appending, re-partitioning and refreshing models are CPU-bound: keep them off the event loop
+    try:
+        return await compute_executor.run(_append_rows, dataset_id, rows_path, refresh_models, db)
+    except ComputeOverloaded:
+        rows_path.unlink(missing_ok=True)
+        raise
+
+
+def _append_target(dataset_id: str, db: Session) -> str:
+    """Check that rows can be appended to a dataset; returns its file extension"""
+    dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    
+    if not dataset.file_path or not Path(dataset.file_path).exists():
+        raise HTTPException(status_code=404, detail="Dataset file not found")
+    file_ext = Path(dataset.file_path).suffix.lower()
+    if file_ext not in ['.csv', '.txt']:
+        raise HTTPException(status_code=400, detail="Rows can only be appended to CSV/TXT datasets")
+    return file_ext
+
+
+def _append_rows(dataset_id: str, rows_path: Path, refresh_models: bool, db: Session) -> DatasetAppendResponse:
+    """Append uploaded rows to a dataset, bump its version and refresh its models"""
+    upload_dir = Path(settings.UPLOAD_DIR)
+    try:
+        dataset = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+        if not dataset:
+            raise HTTPException(status_code=404, detail="Dataset not found")
+        
+        # Appending changes the file in place, so it must not be shared
+        _own_file(db, dataset, upload_dir)
+        dataset_store.column_names(dataset)  # builds the artifact if missing
+        metadata = DataImportService.append_file(
+            dataset.file_path,
+            str(rows_path),
+            dataset_store.artifact_key(dataset),
+            dialect=(dataset.meta_data or {}).get("dialect"),
+        )
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        rows_path.unlink(missing_ok=True)
+    
+    appended_rows = metadata.pop("appended_rows")
+    panel = dataset_store.panel_config(dataset)
+    dataset.meta_data = {**(dataset.meta_data or {}), **metadata}
+    if panel:
+        # New rows may start new series; re-partition now rather than on first use
+        dataset.meta_data = {
+            **dataset.meta_data,
+            "panel": PanelService.configure(dataset, panel["series_column"], panel["date_column"]),
+        }
+    dataset.row_count = metadata["row_count"]
+    dataset.version = (dataset.version or 1) + 1
+    db.commit()
+    db.refresh(dataset)
+    
+    refreshed_models = ModelRefreshService.refresh_dataset_models(db, dataset) if refresh_models else []
+    
+    return DatasetAppendResponse(
+        dataset=DatasetResponse.model_validate(dataset),
+        appended_rows=appended_rows,
+        refreshed_models=refreshed_models,
+        message=f"Appended {appended_rows} rows (dataset version {dataset.version})"
+    )
+
+
 @router.get("/{dataset_id}", response_model=DatasetResponse)
 def get_dataset(dataset_id: str, db: Session = Depends(get_db)):
     """Get a specific dataset"""
@@ -267,9 +698,15 @@ def delete_dataset(dataset_id: str, db: Session = Depends(get_db)):
     if not dataset:
         raise HTTPException(status_code=404, detail="Dataset not found")
     
-    # Delete file if it exists
-    if dataset.file_path and os.path.exists(dataset.file_path):
+    # Shared files and artifacts are only removed with the last dataset using them
+    file_shared, artifact_shared = _sharing(db, dataset)
+    if not file_shared and dataset.file_path and os.path.exists(dataset.file_path):
         os.remove(dataset.file_path)
+    if not artifact_shared:
+        dataset_store.delete(dataset_store.artifact_key(dataset))
+    
+    # Models trained on the dataset stay, without their link to it
+    db.query(Model).filter(Model.dataset_id == dataset.id).update({Model.dataset_id: None})
     
     db.delete(dataset)
     db.commit()
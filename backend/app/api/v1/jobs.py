@@ -0,0 +1,75 @@
+"""
+Job API endpoints
+
+Asynchronous versions of the heavy endpoints: each POST takes the same body
+as its synchronous endpoint and returns a job; GET /jobs/{job_id} returns
+its status and, once finished, that endpoint's response (see
+app.tasks.job_tasks).
+"""
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.job import Job
+from app.schemas.job import JobResponse
+from app.schemas.model import TrainModelRequest, ForecastRequest, LeaderboardRequest
+from app.schemas.preprocessing import StationarityTestRequest
+from app.tasks.job_tasks import expire_stale_job, job_dispatcher
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        backend=job.backend,
+        estimated_seconds=job.estimated_seconds,
+        result=job.result,
+        error=job.error,
+        error_status=job.error_status,
+        created_at=job.created_at.isoformat() if job.created_at else None,
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+    )
+
+
+@router.post("/train", response_model=JobResponse)
+def submit_train(request: TrainModelRequest, db: Session = Depends(get_db)):
+    """Train a model as a job (body as for POST /models/train)"""
+    return _job_response(job_dispatcher.submit(db, "train", request.model_dump()))
+
+
+@router.post("/stationarity", response_model=JobResponse)
+def submit_stationarity(request: StationarityTestRequest, db: Session = Depends(get_db)):
+    """Test stationarity as a job (body as for POST /preprocessing/test-stationarity)"""
+    return _job_response(job_dispatcher.submit(db, "stationarity", request.model_dump()))
+
+
+@router.post("/forecast/{model_id}", response_model=JobResponse)
+def submit_forecast(model_id: str, request: ForecastRequest, db: Session = Depends(get_db)):
+    """Forecast as a job (body as for POST /models/{model_id}/forecast)"""
+    return _job_response(job_dispatcher.submit(db, "forecast", {"model_id": model_id, **request.model_dump()}))
+
+
+@router.post("/leaderboard", response_model=JobResponse)
+def submit_leaderboard(request: LeaderboardRequest, db: Session = Depends(get_db)):
+    """Build a model leaderboard as a job (body as for POST /models/leaderboard)"""
+    return _job_response(job_dispatcher.submit(db, "leaderboard", request.model_dump()))
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(job_id: str, db: Session = Depends(get_db)):
+    """
+    Status of a job, with its result or error once finished
+
+    A running job whose process stopped (no heartbeat for four
+    JOB_HEARTBEAT_SECONDS) is reported, and stored, as failed.
+    """
+    job = db.query(Job).filter(Job.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if expire_stale_job(db, job):
+        db.refresh(job)
+    return _job_response(job)
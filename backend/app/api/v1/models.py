@@ -2,38 +2,92 @@
 Model API endpoints
 """
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, defer
+import asyncio
+import json
+import uuid
 import pandas as pd
 import numpy as np
 
-from app.core.database import get_db
+from app.core.compute import compute_executor
+from app.core.config import settings
+from app.core.database import get_db, SessionLocal
 from app.models.model import Model, ModelMetrics
+from app.models.grid_search import GridSearchRun
+from app.services.data.dataset_store import dataset_store
+from app.services.data.series_artifacts import blob_ref, dataset_ref, dataset_series
 from app.schemas.model import (
     ModelCreate,
     ModelResponse,
     TrainModelRequest,
+    FleetTrainRequest,
     GridSearchRequest,
+    LeaderboardRequest,
     PredictionRequest,
     ForecastRequest
 )
 from app.services.modeling.training_service import TrainingService
 from app.services.modeling.grid_search_service import GridSearchService
+from app.services.modeling.model_cache import model_cache, model_version
+from app.services.modeling.refresh_service import ModelRefreshService
+from app.services.modeling.fleet_service import FleetTrainingService
+from app.services.modeling.leaderboard_service import LeaderboardService
 from app.services.evaluation.prediction_service import PredictionService
 from app.services.forecasting.forecast_service import ForecastService
+from app.services.forecasting.forecast_cache import forecast_cache
 from app.services.forecasting.code_generator import CodeGenerator
-from app.tasks.model_tasks import grid_search_task
+from app.tasks.celery_app import celery_app
+from app.tasks.model_tasks import grid_search_run, grid_search_task
 
 router = APIRouter(prefix="/models", tags=["models"])
 
 
+def _training_parameters(model_type: str, params, artfima_params) -> dict:
+    """Parameters for TrainingService.train_model from a request's SARIMAX or ARTFIMA parameters"""
+    if model_type.upper() == "ARTFIMA":
+        if not artfima_params:
+            raise HTTPException(
+                status_code=400,
+                detail="artfima_parameters required when model_type is ARTFIMA"
+            )
+        return {
+            "p": artfima_params.p,
+            "d": artfima_params.d,
+            "q": artfima_params.q,
+            "glp": artfima_params.glp,
+            "lambda": artfima_params.lambda_param,
+            "fixd": artfima_params.fixd,
+            "likAlg": "exact",
+        }
+    if not params:
+        raise HTTPException(status_code=400, detail="parameters required when model_type is SARIMAX")
+    return {
+        "p": params.p,
+        "d": params.d,
+        "q": params.q,
+        "P": params.P,
+        "D": params.D,
+        "Q": params.Q,
+        "s": params.s,
+    }
+
+
 @router.post("/train", response_model=ModelResponse)
 async def train_model(
     request: TrainModelRequest,
     db: Session = Depends(get_db)
 ):
     """Train a SARIMAX model"""
+    return await compute_executor.run(run_training, request, db)
+
+
+def run_training(request: TrainModelRequest, db: Session) -> ModelResponse:
+    """Train and store a model: POST /models/train, also run as a "train" job"""
     try:
         timeseries = None
+        dataset = None
         
         # Option 1: Load from dataset (preferred)
         if request.dataset_id and request.date_column and request.target_column:
@@ -46,8 +100,10 @@ async def train_model(
             if not dataset.file_path:
                 raise HTTPException(status_code=400, detail="Dataset file not found")
             
-            # Load and transform data
-            df = pd.read_csv(dataset.file_path)
+            # Load and transform data (only the two columns needed, of one series for panel datasets)
+            df = dataset_store.load_series(
+                dataset, [request.date_column, request.target_column], request.series_id
+            )
             
             # Validate columns exist
             if request.date_column not in df.columns:
@@ -103,35 +159,7 @@ async def train_model(
         
         # Determine model type
         model_type = request.model_type or "SARIMAX"
-        
-        # Prepare parameters based on model type
-        if model_type.upper() == "ARTFIMA":
-            if not request.artfima_parameters:
-                raise HTTPException(
-                    status_code=400,
-                    detail="artfima_parameters required when model_type is ARTFIMA"
-                )
-            artfima_params = request.artfima_parameters
-            parameters = {
-                "p": artfima_params.p,
-                "d": artfima_params.d,
-                "q": artfima_params.q,
-                "glp": artfima_params.glp,
-                "lambda": artfima_params.lambda_param,
-                "fixd": artfima_params.fixd,
-                "likAlg": "exact",
-            }
-        else:
-            params = request.parameters
-            parameters = {
-                "p": params.p,
-                "d": params.d,
-                "q": params.q,
-                "P": params.P,
-                "D": params.D,
-                "Q": params.Q,
-                "s": params.s,
-            }
+        parameters = _training_parameters(model_type, request.parameters, request.artfima_parameters)
         
         # Train model using factory method
         try:
@@ -198,6 +226,17 @@ async def train_model(
                 summary=result["summary"],
             )
         
+        if dataset is not None:
+            # Remember the training data so the model can be refreshed when rows are appended
+            model.dataset_id = dataset.id
+            model.dataset_version = dataset.version
+            model.data_source = {
+                "date_column": request.date_column,
+                "target_column": request.target_column,
+                "series_id": request.series_id,
+                "end_date": timeseries.index.max().isoformat(),
+            }
+        
         db.add(model)
         db.commit()
         db.refresh(model)
@@ -229,13 +268,127 @@ async def train_model(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.post("/fleet")
+def train_fleet(request: FleetTrainRequest, db: Session = Depends(get_db)):
+    """
+    Train one model spec on many series of a dataset
+
+    Trains a model per target column, or per series of a panel dataset, in
+    a process pool. Returns straight away with a fleet_id; poll
+    GET /models/fleet/{fleet_id} for progress and per-series outcomes.
+    """
+    from app.models.dataset import Dataset
+    dataset = db.query(Dataset).filter(Dataset.id == request.dataset_id).first()
+    if not dataset:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if not dataset.file_path:
+        raise HTTPException(status_code=400, detail="Dataset file not found")
+
+    model_type = request.model_type or "SARIMAX"
+    if model_type.upper() not in ("SARIMAX", "ARTFIMA"):
+        raise HTTPException(status_code=400, detail=f"Unsupported model type: {model_type}")
+    parameters = _training_parameters(model_type, request.parameters, request.artfima_parameters)
+
+    try:
+        targets = FleetTrainingService.resolve_targets(
+            dataset,
+            request.date_column,
+            target_columns=request.target_columns,
+            target_column=request.target_column,
+            series_ids=request.series_ids,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    run = FleetTrainingService.start(
+        db, dataset, request.date_column, targets, model_type, parameters, request.project_id
+    )
+    return FleetTrainingService.status(db, run.id, include_results=False)
+
+
+@router.get("/fleet/{fleet_id}")
+def get_fleet(fleet_id: str, db: Session = Depends(get_db)):
+    """Progress of a fleet training run, with the outcome of every finished series"""
+    status = FleetTrainingService.status(db, fleet_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Fleet run not found")
+    return status
+
+
 @router.post("/grid-search")
-async def start_grid_search(request: GridSearchRequest):
-    """Start async grid search"""
+def start_grid_search(request: GridSearchRequest, db: Session = Depends(get_db)):
+    """
+    Start async grid search
+
+    The series is given as timeseries_data or as a dataset slice
+    (dataset_id, date_column, target_column, optionally series_id,
+    start_date and end_date). The task receives a reference to it, not the
+    data: a dataset slice is read by the worker from the dataset's
+    columnar artifact, timeseries_data is written once to the series
+    artifact store.
+    """
+    if request.search_strategy not in ("grid", "two_phase", "stepwise"):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown search_strategy '{request.search_strategy}'; use 'grid', 'two_phase' or 'stepwise'"
+        )
+    empty = [
+        name for name, values in (
+            ("p_range", request.p_range),
+            ("q_range", request.q_range),
+            ("P_range", request.P_range),
+            ("Q_range", request.Q_range),
+        )
+        if not values
+    ]
+    if empty:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Parameter ranges must not be empty: {', '.join(empty)}"
+        )
     try:
-        # Start Celery task
-        task = grid_search_task.delay(
-            request.timeseries_data,
+        if request.dataset_id:
+            from app.models.dataset import Dataset
+            dataset = db.query(Dataset).filter(Dataset.id == request.dataset_id).first()
+            if not dataset:
+                raise HTTPException(status_code=404, detail="Dataset not found")
+            if not request.date_column or not request.target_column:
+                raise HTTPException(status_code=400, detail="date_column and target_column required with dataset_id")
+            slice_spec = (
+                request.date_column, request.target_column,
+                request.series_id, request.start_date, request.end_date,
+            )
+            if request.exog_variables:
+                timeseries = dataset_series(dataset, *slice_spec)
+                data_ref = None
+            else:
+                columns = dataset_store.column_names(dataset)
+                for column in (request.date_column, request.target_column):
+                    if column not in columns:
+                        raise HTTPException(status_code=400, detail=f"Column '{column}' not found in dataset")
+                data_ref = dataset_ref(dataset, *slice_spec)
+        elif request.timeseries_data:
+            timeseries = pd.Series(request.timeseries_data)
+            timeseries.index = pd.to_datetime(timeseries.index)
+            data_ref = None
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Either provide dataset_id+date_column+target_column or timeseries_data"
+            )
+
+        if data_ref is None:
+            exog = None
+            if request.exog_variables:
+                exog = pd.DataFrame(request.exog_variables)
+                exog.index = timeseries.index[:len(exog)]
+            data_ref = blob_ref(timeseries, exog)
+
+        # Record the run before queueing it, so a queued search can be
+        # watched and cancelled
+        task_id = str(uuid.uuid4())
+        db.add(grid_search_run(
+            task_id,
             request.p_range,
             request.q_range,
             request.P_range,
@@ -243,17 +396,219 @@ async def start_grid_search(request: GridSearchRequest):
             request.d,
             request.D,
             request.s,
-            request.exog_variables,
-        )
-        
+            bool(request.exog_variables),
+            request.search_strategy,
+            request.refine_top_k,
+            request.transformation,
+            data_ref,
+        ))
+        db.commit()
+
+        # Start Celery task
+        try:
+            grid_search_task.apply_async(
+                (
+                    None,
+                    request.p_range,
+                    request.q_range,
+                    request.P_range,
+                    request.Q_range,
+                    request.d,
+                    request.D,
+                    request.s,
+                ),
+                dict(
+                    search_strategy=request.search_strategy,
+                    refine_top_k=request.refine_top_k,
+                    transformation=request.transformation,
+                    data_ref=data_ref,
+                ),
+                task_id=task_id,
+            )
+        except Exception as e:
+            run = db.query(GridSearchRun).filter(GridSearchRun.id == task_id).first()
+            run.status = "failed"
+            run.error = f"Could not queue grid search: {e}"
+            db.commit()
+            raise
+
         return {
-            "task_id": task.id,
-            "status": "started",
-            "message": "Grid search started. Use task_id to check status.",
+            "task_id": task_id,
+            "status": "queued",
+            "message": "Grid search queued. Use task_id to check status.",
         }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/grid-search/{task_id}")
+def get_grid_search(task_id: str, db: Session = Depends(get_db)):
+    """Status of a grid search: candidates fitted so far, best order so far and ETA"""
+    run = db.query(GridSearchRun).filter(GridSearchRun.id == task_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Grid search not found")
+    return GridSearchService.run_status(run)
+
+
+def _grid_search_snapshot(task_id: str):
+    """Status of a grid search without its candidate list, or None if unknown"""
+    db = SessionLocal()
+    try:
+        run = db.query(GridSearchRun).filter(GridSearchRun.id == task_id).first()
+        return GridSearchService.run_status(run) if run else None
+    finally:
+        db.close()
+
+
+@router.get("/grid-search/{task_id}/events")
+async def stream_grid_search(task_id: str):
+    """
+    Stream grid search progress as server-sent events
+
+    Sends a "progress" event every GRID_SEARCH_STREAM_INTERVAL seconds with
+    the status (without the full candidate list) and the candidates fitted
+    since the previous event, until the search completes, fails or is
+    cancelled.
+    """
+    if await run_in_threadpool(_grid_search_snapshot, task_id) is None:
+        raise HTTPException(status_code=404, detail="Grid search not found")
+
+    async def events():
+        sent = set()
+        while True:
+            status = await run_in_threadpool(_grid_search_snapshot, task_id)
+            if status is None:
+                return
+            candidates = status.pop("candidates")
+            status["new_candidates"] = [
+                c for c in candidates if (c["position"], c["phase"]) not in sent
+            ]
+            sent.update((c["position"], c["phase"]) for c in status["new_candidates"])
+            yield f"event: progress\ndata: {json.dumps(status)}\n\n"
+            if status["status"] in ("completed", "failed", "cancelled"):
+                return
+            await asyncio.sleep(settings.GRID_SEARCH_STREAM_INTERVAL)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.delete("/grid-search/{task_id}")
+def cancel_grid_search(task_id: str, db: Session = Depends(get_db)):
+    """
+    Cancel a grid search
+
+    Candidates not fitted yet are skipped and the workers running the
+    search are stopped; the candidates fitted so far are kept, with the
+    best order among them.
+    """
+    run = db.query(GridSearchRun).filter(GridSearchRun.id == task_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Grid search not found")
+    if run.status in ("completed", "failed", "cancelled"):
+        return GridSearchService.run_status(run)
+
+    run.status = "cancelled"
+    db.commit()
+    try:
+        celery_app.control.revoke([run.id] + (run.task_ids or []), terminate=True)
     except Exception as e:
+        # Workers still stop at their next candidate, seeing the run cancelled
+        print(f"Warning: Could not revoke grid search tasks: {e}")
+    db.refresh(run)
+    return GridSearchService.run_status(run)
+
+
+@router.post("/leaderboard")
+async def model_leaderboard(request: LeaderboardRequest, db: Session = Depends(get_db)):
+    """
+    Rank SARIMAX, ARIMA, ARFIMA and ARTFIMA candidates on one series
+
+    Fits candidates of several orders, cheapest first, until all are done
+    or budget_seconds have passed, and ranks the finished ones by their
+    error on the held-out end of the series (see LeaderboardService).
+    Nothing is stored; train the chosen candidate with POST /models/train.
+    """
+    return await compute_executor.run(run_leaderboard, request, db)
+
+
+def run_leaderboard(request: LeaderboardRequest, db: Session) -> dict:
+    """Build a model leaderboard: POST /models/leaderboard, also run as a "leaderboard" job"""
+    budget = request.budget_seconds or settings.LEADERBOARD_DEFAULT_BUDGET
+    if budget <= 0 or budget > settings.LEADERBOARD_MAX_BUDGET:
+        raise HTTPException(
+            status_code=400,
+            detail=f"budget_seconds must be positive and at most {settings.LEADERBOARD_MAX_BUDGET}"
+        )
+    try:
+        if request.dataset_id:
+            from app.models.dataset import Dataset
+            dataset = db.query(Dataset).filter(Dataset.id == request.dataset_id).first()
+            if not dataset:
+                raise HTTPException(status_code=404, detail="Dataset not found")
+            if not request.date_column or not request.target_column:
+                raise HTTPException(status_code=400, detail="date_column and target_column required with dataset_id")
+            timeseries = dataset_series(
+                dataset, request.date_column, request.target_column,
+                request.series_id, request.start_date, request.end_date,
+            )
+        elif request.timeseries_data:
+            timeseries = pd.Series(request.timeseries_data)
+            timeseries.index = pd.to_datetime(timeseries.index)
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail="Either provide dataset_id+date_column+target_column or timeseries_data"
+            )
+
+        prepared = LeaderboardService.prepare(
+            timeseries,
+            holdout=request.holdout,
+            s=request.s,
+            frequency=request.frequency,
+            d=request.d,
+            D=request.D,
+            transformation=request.transformation,
+        )
+        candidates = LeaderboardService.candidates(
+            prepared,
+            families=request.families,
+            max_p=request.max_p,
+            max_q=request.max_q,
+            max_seasonal=request.max_seasonal,
+        )
+        board = LeaderboardService.run(prepared, candidates, budget, rank_by=request.rank_by)
+    except HTTPException:
+        raise
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    return {
+        "series_length": len(prepared["values"]) + len(prepared["holdout"]),
+        "train_length": len(prepared["values"]),
+        "holdout": len(prepared["holdout"]),
+        "transformation": "log" if prepared["log"] else "none",
+        "s": prepared["s"],
+        "d": prepared["d"],
+        "D": prepared["D"],
+        "stationarity": prepared["stationarity"],
+        **board,
+    }
+
+
+@router.get("/cache/stats")
+def get_model_cache_stats():
+    """Get fitted model and forecast cache hit/miss counters and occupancy"""
+    return {
+        "models": model_cache.stats(),
+        "forecasts": forecast_cache.stats(),
+    }
+
 
 @router.get("/{model_id}", response_model=ModelResponse)
 def get_model(model_id: str, db: Session = Depends(get_db)):
@@ -290,13 +645,17 @@ async def predict(
     db: Session = Depends(get_db)
 ):
     """Generate predictions"""
-    model = db.query(Model).filter(Model.id == model_id).first()
+    return await compute_executor.run(_predict, model_id, request, db)
+
+
+def _predict(model_id: str, request: PredictionRequest, db: Session):
+    model = db.query(Model).options(defer(Model.model_data)).filter(Model.id == model_id).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
     try:
-        # Deserialize model
-        fitted_model = TrainingService.deserialize_model(model.model_data)
+        # Get fitted model (deserialized on cache miss only)
+        fitted_model = model_cache.get_fitted_model(model)
         
         # Convert data
         timeseries = pd.Series(request.timeseries_data)
@@ -333,26 +692,66 @@ async def forecast(
     db: Session = Depends(get_db)
 ):
     """Generate forecasts"""
-    model = db.query(Model).filter(Model.id == model_id).first()
+    return await compute_executor.run(run_forecast, model_id, request, db)
+
+
+def run_forecast(model_id: str, request: ForecastRequest, db: Session) -> dict:
+    """Forecast with a stored model: POST /models/{model_id}/forecast, also run as a "forecast" job"""
+    model = db.query(Model).options(defer(Model.model_data)).filter(Model.id == model_id).first()
     if not model:
         raise HTTPException(status_code=404, detail="Model not found")
     
     try:
-        # Deserialize model
-        fitted_model = TrainingService.deserialize_model(model.model_data)
-        
         # Get transformation function based on transformation type
         # Pass transformation type as string instead of function for better reliability
         transformation_type = request.transformation_type.lower() if request.transformation_type else "none"
         
-        # Generate forecasts
-        result = ForecastService.generate_forecast(
-            fitted_model,
-            request.periods,
-            transformation_type=transformation_type,
-            last_date=request.last_date,
-            frequency=request.frequency
+        # Another series of the model's panel dataset, forecast with the model's parameters
+        series = None
+        data_version = None
+        if request.series_id is not None:
+            from app.models.dataset import Dataset
+            source = model.data_source or {}
+            dataset = db.query(Dataset).filter(Dataset.id == model.dataset_id).first() if model.dataset_id else None
+            if dataset is None or not source:
+                raise HTTPException(status_code=400, detail="Model is not linked to a dataset; series_id is not supported")
+            if model.type != "SARIMAX":
+                raise HTTPException(status_code=400, detail="Only SARIMAX models can be applied to another series")
+            df = dataset_store.load_series(
+                dataset, [source["date_column"], source["target_column"]], request.series_id
+            )
+            series = pd.Series(
+                df[source["target_column"]].to_numpy(),
+                index=pd.to_datetime(df[source["date_column"]]),
+            ).dropna()
+            if len(series) == 0:
+                raise HTTPException(status_code=400, detail="No valid data points found for this series")
+            data_version = dataset.version
+        
+        def compute(periods: int):
+            # Get fitted model (deserialized on cache miss only)
+            fitted_model = model_cache.get_fitted_model(model)
+            if series is not None:
+                fitted_model = ModelRefreshService.apply_to_series(fitted_model, series)
+            return ForecastService.generate_forecast(
+                fitted_model,
+                periods,
+                transformation_type=transformation_type,
+                last_date=request.last_date,
+                frequency=request.frequency
+            )
+        
+        # Generate forecasts, reusing a cached result for the same inputs
+        cache_key = forecast_cache.make_key(
+            model.id,
+            model_version(model),
+            transformation_type,
+            request.last_date,
+            request.frequency,
+            series_id=request.series_id,
+            data_version=data_version
         )
+        result = forecast_cache.get_or_compute(cache_key, request.periods, compute)
         
         return result
         
@@ -393,3 +792,20 @@ def get_code(model_id: str, db: Session = Depends(get_db)):
     
     return {"code": code}
 
+
+@router.delete("/{model_id}")
+def delete_model(model_id: str, db: Session = Depends(get_db)):
+    """Delete a model"""
+    model = db.query(Model).options(defer(Model.model_data)).filter(Model.id == model_id).first()
+    if not model:
+        raise HTTPException(status_code=404, detail="Model not found")
+    
+    if model.metrics:
+        db.delete(model.metrics)
+    db.delete(model)
+    db.commit()
+    
+    model_cache.invalidate(model_id)
+    forecast_cache.invalidate(model_id)
+    
+    return {"message": "Model deleted successfully"}
@@ -5,8 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 import pandas as pd
 
+from app.core.compute import compute_executor
 from app.core.database import get_db
 from app.models.dataset import Dataset
+from app.services.data.dataset_store import dataset_store
 from app.schemas.preprocessing import TransformRequest, StationarityTestRequest, StationarityTestResponse
 from app.services.preprocessing.transformation_service import TransformationService
 from app.services.preprocessing.stationarity_service import StationarityService
@@ -20,6 +22,10 @@ async def transform_time_series(
     db: Session = Depends(get_db)
 ):
     """Transform DataFrame to time-indexed Series"""
+    return await compute_executor.run(_transform, request, db)
+
+
+def _transform(request: TransformRequest, db: Session):
     # Get dataset
     dataset = db.query(Dataset).filter(Dataset.id == request.dataset_id).first()
     if not dataset:
@@ -29,7 +35,12 @@ async def transform_time_series(
     if not dataset.file_path:
         raise HTTPException(status_code=400, detail="Dataset file not found")
     
-    df = pd.read_csv(dataset.file_path)
+    try:
+        df = dataset_store.load_series(dataset, series_id=request.series_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=400, detail="Dataset file not found")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # Transform
     try:
@@ -53,6 +64,11 @@ async def transform_time_series(
 @router.post("/test-stationarity", response_model=StationarityTestResponse)
 async def test_stationarity(request: StationarityTestRequest, db: Session = Depends(get_db)):
     """Test time series stationarity"""
+    return await compute_executor.run(run_stationarity_test, request, db)
+
+
+def run_stationarity_test(request: StationarityTestRequest, db: Session) -> StationarityTestResponse:
+    """Test stationarity: POST /preprocessing/test-stationarity, also run as a "stationarity" job"""
     try:
         timeseries = None
         
@@ -66,8 +82,10 @@ async def test_stationarity(request: StationarityTestRequest, db: Session = Depe
             if not dataset.file_path:
                 raise HTTPException(status_code=400, detail="Dataset file not found")
             
-            # Load and transform data
-            df = pd.read_csv(dataset.file_path)
+            # Load and transform data (only the two columns needed, of one series for panel datasets)
+            df = dataset_store.load_series(
+                dataset, [request.date_column, request.target_column], request.series_id
+            )
             
             # Validate columns exist
             if request.date_column not in df.columns:
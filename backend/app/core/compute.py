@@ -0,0 +1,177 @@
+"""
+Bounded executor for CPU-bound endpoint work
+
+Endpoints declared async def run on the event loop, so a fit or a test
+called directly from them blocks every other request until it returns.
+They hand the work to compute_executor instead, a thread pool with a
+bounded queue:
+
+- At most COMPUTE_MAX_WORKERS calls run at once and COMPUTE_MAX_QUEUE wait.
+  A call arriving when both are full is rejected with 429 right away.
+- A call that waited COMPUTE_QUEUE_TIMEOUT seconds without starting is
+  dropped with 503, so clients retry instead of piling up.
+- BLAS/OpenMP pools are limited to COMPUTE_BLAS_THREADS threads (default
+  CPUs / workers), so concurrent fits do not oversubscribe the cores.
+
+Threads rather than processes: the endpoint bodies use the request's
+database session and the in-process model caches. numpy, scipy and the
+statsmodels filters spend most of their time outside the GIL; work that
+needs whole processes goes through the job API (app.tasks.job_tasks).
+
+stats() reports the gauges (running, queued, rejected, ...) served at
+/compute/stats.
+"""
+import asyncio
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # pragma: no cover - shipped with scikit-learn
+    threadpool_limits = None
+
+
+class ComputeOverloaded(Exception):
+    """Raised when the compute executor cannot take a call; mapped to an HTTP response in app.main"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class ComputeExecutor:
+    """Thread pool with a bounded queue, overload rejection and gauges"""
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float, blas_threads: int):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.blas_threads = blas_threads or max(1, (os.cpu_count() or 1) // self.max_workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.queued = 0
+        self.peak = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.mean_seconds = 0.0  # Moving average of run times, for Retry-After
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                if threadpool_limits is not None:
+                    # Process-wide: BLAS pools are shared by all threads
+                    threadpool_limits(limits=self.blas_threads)
+                else:
+                    print("Warning: threadpoolctl not installed; BLAS thread counts are not limited")
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="compute")
+            return self._pool
+
+    def _retry_after(self) -> int:
+        backlog = (self.running + self.queued) / self.max_workers
+        return max(1, math.ceil(self.mean_seconds * backlog))
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) on the pool and wait for its result
+
+        Raises:
+            ComputeOverloaded: 429 if the queue is full, 503 if the call
+                waited longer than queue_timeout to start
+            Exception: Whatever fn raised
+        """
+        pool = self._get_pool()
+        with self._lock:
+            if self.running + self.queued >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ComputeOverloaded(429, "Server busy: too many requests queued", self._retry_after())
+            self.queued += 1
+            self.peak = max(self.peak, self.running + self.queued)
+        state = {"started": False}
+
+        def call():
+            with self._lock:
+                state["started"] = True
+                self.queued -= 1
+                self.running += 1
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            except BaseException:
+                ok = False
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    self.running -= 1
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+                    self.mean_seconds = elapsed if not self.mean_seconds else 0.9 * self.mean_seconds + 0.1 * elapsed
+
+        future = pool.submit(call)
+        waiter = asyncio.wrap_future(future)
+        try:
+            done, _ = await asyncio.wait({waiter}, timeout=self.queue_timeout or None)
+            if not done:
+                with self._lock:
+                    dropped = not state["started"] and future.cancel()
+                    if dropped:
+                        self.queued -= 1
+                        self.timed_out += 1
+                if dropped:
+                    raise ComputeOverloaded(503, "Server busy: request waited too long to start", self._retry_after())
+            return await waiter
+        except asyncio.CancelledError:
+            # Client went away: drop the call if it has not started
+            with self._lock:
+                if not state["started"] and future.cancel():
+                    self.queued -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Concurrency gauges and counters"""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_timeout": self.queue_timeout,
+                "blas_threads": self.blas_threads,
+                "running": self.running,
+                "queued": self.queued,
+                "peak": self.peak,
+                "utilization": self.running / self.max_workers,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+                "mean_seconds": self.mean_seconds,
+            }
+
+    def shutdown(self) -> None:
+        """Stop the pool; queued calls are dropped"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+compute_executor = ComputeExecutor(
+    max_workers=settings.COMPUTE_MAX_WORKERS,
+    max_queue=settings.COMPUTE_MAX_QUEUE,
+    queue_timeout=settings.COMPUTE_QUEUE_TIMEOUT,
+    blas_threads=settings.COMPUTE_BLAS_THREADS,
+)
@@ -34,10 +34,65 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     UPLOAD_DIR: str = "uploads"
     SAMPLES_DIR: str = "data/samples"
+    UPLOAD_CHUNK_ROWS: int = 100_000  # Rows per chunk when converting uploads
+    SERIES_MAX_POINTS: int = 20_000  # Upper bound for /datasets/{id}/series responses
     
+    # Executor for CPU-bound work of async endpoints (app.core.compute)
+    COMPUTE_MAX_WORKERS: int = 0  # Calls running at once; 0 = one per CPU
+    COMPUTE_MAX_QUEUE: int = 32  # Calls waiting beyond that; more are rejected with 429
+    COMPUTE_QUEUE_TIMEOUT: float = 30.0  # Seconds a call may wait to start before a 503 (0 = no limit)
+    COMPUTE_BLAS_THREADS: int = 0  # BLAS/OpenMP threads per call; 0 = CPUs / COMPUTE_MAX_WORKERS
+    
+    # Columnar dataset artifacts (per-column .npy, opened memory-mapped)
+    DATASET_CACHE_DIR: str = "uploads/columnar"
+    DATASET_CACHE_MAX_ENTRIES: int = 64  # Datasets kept open in-process
+    DATASET_BUILD_LOCK_TIMEOUT: int = 600  # Seconds after which an artifact rebuild lock is taken as abandoned
+    SERIES_ARTIFACT_DIR: str = "uploads/series"  # Series passed to tasks by reference; shared by API and workers
+    SERIES_ARTIFACT_MAX_AGE_HOURS: float = 168  # Unused series removed after this long (0 keeps them)
+    
+    # Fitted model cache (in-process, per worker)
+    MODEL_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # 512MB
+    MODEL_CACHE_PRELOAD_PER_PROJECT: int = 0  # Most recent models per project to load at startup
+    
+    # Forecast result cache (in-process, optionally shared through Redis)
+    FORECAST_CACHE_MAX_ENTRIES: int = 1024
+    FORECAST_CACHE_USE_REDIS: bool = False
+    FORECAST_CACHE_TTL: int = 3600  # Seconds, Redis entries only
+    
+    # Fleet training (one model spec fitted across many series)
+    FLEET_MAX_WORKERS: int = 0  # Worker processes; 0 = one per CPU
+    FLEET_CHUNK_SIZE: int = 8  # Series sent to a worker per task
+    FLEET_MAX_PENDING_CHUNKS: int = 2  # Chunks queued per worker; bounds series held in memory
+    FLEET_HEARTBEAT_SECONDS: float = 15.0  # Running fleets refresh heartbeat_at this often; 4 missed beats mark a run failed
+
+    # SARIMAX grid search
+    GRID_SEARCH_MAX_WORKERS: int = 0  # Worker processes for in-process searches; 0 = one per CPU
+    GRID_SEARCH_CHUNK_SIZE: int = 1  # Candidates per pool task / Celery subtask
+    GRID_SEARCH_SCREEN_MAXITER: int = 20  # Optimizer iterations per candidate in two-phase screening
+    GRID_SEARCH_REFINE_TOP_K: int = 5  # Screened candidates fully refitted in two-phase searches
+    GRID_SEARCH_STREAM_INTERVAL: float = 1.0  # Seconds between grid search progress events
+
+    # Cross-family leaderboard (/models/leaderboard)
+    LEADERBOARD_MAX_WORKERS: int = 0  # Worker processes; 0 = one per CPU
+    LEADERBOARD_DEFAULT_BUDGET: float = 60.0  # Seconds
+    LEADERBOARD_MAX_BUDGET: float = 600.0
+
     # Celery (optional for local dev)
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
     CELERY_RESULT_BACKEND: str = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+    CELERY_FAST_QUEUE: str = "fast"  # Interactive jobs
+    CELERY_HEAVY_QUEUE: str = "heavy"  # Jobs estimated to run longer than CELERY_FAST_TASK_MAX_SECONDS
+    CELERY_FAST_TASK_MAX_SECONDS: float = 10.0
+    CELERY_FAST_CONCURRENCY: int = 2  # Worker processes per queue (python -m scripts.run_worker)
+    CELERY_HEAVY_CONCURRENCY: int = 0  # 0 = the CPUs left over by the fast queue
+    CELERY_FAST_PREFETCH: int = 4  # Messages reserved per worker process
+    CELERY_HEAVY_PREFETCH: int = 1  # One at a time, so long jobs never wait behind each other on one process
+
+    # Async jobs (/jobs): Celery when its broker answers, else a process pool of the API
+    JOB_BACKEND: str = "auto"  # "auto", "celery" or "local"
+    JOB_BROKER_CHECK_SECONDS: float = 30.0  # How long a broker check is trusted
+    JOB_LOCAL_MAX_WORKERS: int = 0  # Local pool processes; 0 = one per CPU
+    JOB_HEARTBEAT_SECONDS: float = 15.0  # Running jobs refresh heartbeat_at this often; 4 missed beats mark a job failed
     
     class Config:
         env_file = ".env"
@@ -1,10 +1,15 @@
 """
 FastAPI application entry point
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.compute import ComputeOverloaded, compute_executor
 from app.core.config import settings
-from app.api.v1 import datasets, preprocessing, analysis, models, projects
+from app.core.database import SessionLocal
+from app.api.v1 import datasets, preprocessing, analysis, models, projects, jobs
+from app.services.modeling.model_cache import preload_recent_models
+from app.tasks.job_tasks import job_dispatcher
 
 app = FastAPI(
     title="TimeLab API",
@@ -27,6 +32,44 @@ app.include_router(preprocessing.router, prefix=settings.API_V1_STR)
 app.include_router(analysis.router, prefix=settings.API_V1_STR)
 app.include_router(models.router, prefix=settings.API_V1_STR)
 app.include_router(projects.router, prefix=settings.API_V1_STR)
+app.include_router(jobs.router, prefix=settings.API_V1_STR)
+
+
+@app.exception_handler(ComputeOverloaded)
+async def compute_overloaded(request: Request, exc: ComputeOverloaded):
+    """429/503 with Retry-After when the compute executor is saturated"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+@app.on_event("startup")
+def preload_model_cache():
+    """Warm the fitted model cache with each project's most recent models"""
+    if settings.MODEL_CACHE_PRELOAD_PER_PROJECT <= 0:
+        return
+    db = SessionLocal()
+    try:
+        loaded = preload_recent_models(db, settings.MODEL_CACHE_PRELOAD_PER_PROJECT)
+        print(f"Preloaded {loaded} model(s) into the model cache")
+    except Exception as e:
+        print(f"Warning: Model cache preload failed: {e}")
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def stop_local_jobs():
+    """Stop the process pool running jobs locally (without a Celery broker)"""
+    job_dispatcher.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_compute_executor():
+    """Stop the executor running CPU-bound endpoint work"""
+    compute_executor.shutdown()
 
 
 @app.get("/")
@@ -37,3 +80,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/compute/stats")
+async def compute_stats():
+    """Concurrency gauges of the executor running CPU-bound endpoint work"""
+    return compute_executor.stats()
@@ -2,6 +2,9 @@
 from app.models.dataset import Dataset
 from app.models.project import Project
 from app.models.model import Model, ModelMetrics
+from app.models.grid_search import GridSearchRun, GridSearchCandidate, CandidateFit
+from app.models.job import Job
+from app.models.fleet import FleetRun, FleetRunResult
 
-__all__ = ["Dataset", "Project", "Model", "ModelMetrics"]
+__all__ = ["Dataset", "Project", "Model", "ModelMetrics", "GridSearchRun", "GridSearchCandidate", "CandidateFit", "Job", "FleetRun", "FleetRunResult"]
 
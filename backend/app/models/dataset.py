@@ -16,6 +16,8 @@ class Dataset(Base):
     columns = Column(JSON, nullable=False)  # List of column names
     row_count = Column(Integer, nullable=False)
     file_path = Column(String, nullable=True)  # Path to stored file
+    content_hash = Column(String, nullable=True, index=True)  # SHA-256 of uploaded file; uploads with equal content share file and parsed data
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Bumped each time rows are appended
     meta_data = Column(JSON, nullable=True)  # Additional metadata (renamed from 'metadata' - reserved by SQLAlchemy)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
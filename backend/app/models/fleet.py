@@ -0,0 +1,54 @@
+"""
+FleetRun and FleetRunResult models
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Float, JSON, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+import uuid
+
+
+class FleetRun(Base):
+    __tablename__ = "fleet_runs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    dataset_id = Column(String, nullable=False, index=True)
+    model_type = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    targets = Column(JSON, nullable=False)  # [{target_column, series_id}] in training order
+    total = Column(Integer, nullable=False)
+    trained = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed by the process running the fleet
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    results = relationship(
+        "FleetRunResult",
+        back_populates="run",
+        order_by="FleetRunResult.position",
+        cascade="all, delete-orphan",
+    )
+
+
+class FleetRunResult(Base):
+    __tablename__ = "fleet_run_results"
+    __table_args__ = (UniqueConstraint("run_id", "position", name="uq_fleet_run_results_run_position"),)
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String, ForeignKey("fleet_runs.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # Index in the run's targets
+    target_column = Column(String, nullable=False)
+    series_id = Column(String, nullable=True)
+    status = Column(String, nullable=False)  # trained or failed
+    model_id = Column(String, nullable=True)
+    name = Column(String, nullable=True)
+    metrics = Column(JSON, nullable=True)
+    nobs = Column(Integer, nullable=True)
+    fit_seconds = Column(Float, nullable=True)
+    error = Column(Text, nullable=True)  # Set when the series failed
+
+    # Relationships
+    run = relationship("FleetRun", back_populates="results")
@@ -0,0 +1,72 @@
+"""
+GridSearchRun and GridSearchCandidate models
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Float, Boolean, JSON, Text, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.core.database import Base
+import uuid
+
+
+class GridSearchRun(Base):
+    __tablename__ = "grid_search_runs"
+
+    id = Column(String, primary_key=True)  # Celery task id of the search
+    status = Column(String, nullable=False, default="queued")  # queued, running, completed, failed, cancelled
+    config = Column(JSON, nullable=False)  # Ranges and fixed parameters searched
+    total = Column(Integer, nullable=False)  # Number of candidates in the grid (an upper bound for stepwise searches)
+    best_order = Column(JSON, nullable=True)  # [p, d, q, P, D, Q, s] once completed
+    task_ids = Column(JSON, nullable=True)  # Celery ids of the candidate subtasks, revoked on cancel
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    candidates = relationship(
+        "GridSearchCandidate",
+        back_populates="run",
+        order_by="GridSearchCandidate.position",
+        cascade="all, delete-orphan",
+    )
+
+
+class GridSearchCandidate(Base):
+    __tablename__ = "grid_search_candidates"
+    __table_args__ = (UniqueConstraint("run_id", "position", name="uq_grid_search_candidates_run_position"),)
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    run_id = Column(String, ForeignKey("grid_search_runs.id"), nullable=False, index=True)
+    position = Column(Integer, nullable=False)  # Index in grid order; breaks ties in the selection
+    order = Column(JSON, nullable=False)  # [p, d, q, P, D, Q, s]
+    aic = Column(Float, nullable=True)
+    bic = Column(Float, nullable=True)
+    hqic = Column(Float, nullable=True)
+    fit_seconds = Column(Float, nullable=True)
+    converged = Column(Boolean, nullable=True)
+    iterations = Column(Integer, nullable=True)  # Optimizer iterations of the fit
+    phase = Column(String, nullable=True)  # "screen" or "refine" in two-phase searches
+    error = Column(Text, nullable=True)  # Set when the fit failed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Relationships
+    run = relationship("GridSearchRun", back_populates="candidates")
+
+
+class CandidateFit(Base):
+    __tablename__ = "candidate_fits"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    key = Column(String, nullable=False, unique=True, index=True)  # Hash of all the fields below
+    data_hash = Column(String, nullable=False)  # Content hash of the training series
+    transformation = Column(String, nullable=True)  # Transformation applied to the series, as given by the client
+    order = Column(JSON, nullable=False)  # [p, d, q]
+    seasonal_order = Column(JSON, nullable=False)  # [P, D, Q, s]
+    exog_signature = Column(String, nullable=True)  # Content hash of the exogenous variables
+    aic = Column(Float, nullable=True)
+    bic = Column(Float, nullable=True)
+    hqic = Column(Float, nullable=True)
+    fit_seconds = Column(Float, nullable=True)
+    converged = Column(Boolean, nullable=True)
+    iterations = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)  # Set when the fit failed
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,25 @@
+"""
+Job model
+"""
+from sqlalchemy import Column, String, Integer, DateTime, Float, JSON, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+import uuid
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))  # Also the Celery task id
+    kind = Column(String, nullable=False, index=True)  # "train", "stationarity" or "forecast"
+    status = Column(String, nullable=False, default="pending")  # pending, running, completed, failed
+    backend = Column(String, nullable=True)  # "celery" or "local" (process pool of the API)
+    params = Column(JSON, nullable=False)  # Request body (and model_id for forecasts)
+    estimated_seconds = Column(Float, nullable=True)  # Cost estimate the job was routed by
+    result = Column(JSON, nullable=True)  # Response body of the equivalent synchronous endpoint
+    error = Column(Text, nullable=True)
+    error_status = Column(Integer, nullable=True)  # HTTP status the synchronous endpoint would have returned
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Refreshed by the process running the job
+    finished_at = Column(DateTime(timezone=True), nullable=True)
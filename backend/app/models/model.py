@@ -1,7 +1,7 @@
 """
 Model and ModelMetrics models
 """
-from sqlalchemy import Column, String, DateTime, Float, JSON, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, DateTime, Float, JSON, Text, ForeignKey
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,8 +16,12 @@ class Model(Base):
     type = Column(String, nullable=False)  # e.g., "SARIMAX"
     project_id = Column(String, ForeignKey("projects.id"), nullable=True)
     parameters = Column(JSON, nullable=False)  # Model parameters (p, d, q, etc.)
-    model_data = Column(Text, nullable=True)  # Serialized model (pickle as base64)
+    model_data = Column(Text, nullable=True)  # Serialized model as base64 (pickle, or compact format for ARTFIMA)
+    data_version = Column(Integer, nullable=False, default=1)  # Bumped whenever model_data is rewritten; cache version token
     summary = Column(Text, nullable=True)  # Model summary text
+    dataset_id = Column(String, ForeignKey("datasets.id"), nullable=True, index=True)  # Dataset the model was trained on
+    dataset_version = Column(Integer, nullable=True)  # Dataset version the model has seen
+    data_source = Column(JSON, nullable=True)  # date_column, target_column and end_date of the training series
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -12,6 +12,7 @@ class ACFPACFRequest(BaseModel):
     dataset_id: Optional[str] = None
     date_column: Optional[str] = None
     target_column: Optional[str] = None
+    series_id: Optional[str] = None  # Series to use from a panel dataset
     seasonality: int
 
 
@@ -23,6 +23,7 @@ class DatasetResponse(DatasetBase):
     columns: List[str]
     row_count: int
     file_path: Optional[str] = None
+    version: int = 1
     created_at: Union[datetime, str]
     updated_at: Optional[Union[datetime, str]] = None
     
@@ -51,5 +52,26 @@ class DatasetUploadResponse(BaseModel):
     message: str
 
 
+class DatasetAppendResponse(BaseModel):
+    dataset: DatasetResponse
+    appended_rows: int
+    refreshed_models: List[Dict[str, Any]]
+    message: str
+
+
 class LoadSampleRequest(BaseModel):
     filename: str
+
+
+class PanelRequest(BaseModel):
+    series_column: Optional[str] = None
+    date_column: Optional[str] = None
+
+
+class ResampleRequest(BaseModel):
+    date_column: str
+    columns: List[str]
+    frequency: str  # Hourly, Daily, Weekly, Monthly, Quarterly, Yearly or a pandas offset alias
+    aggregator: str = "mean"  # sum, mean, median, min, max, first, last, count, ohlc, quantile
+    quantiles: Optional[List[float]] = None  # Required for the quantile aggregator
+    series_id: Optional[str] = None  # Series of a panel dataset; required for panel datasets
@@ -0,0 +1,19 @@
+"""
+Job schemas
+"""
+from pydantic import BaseModel
+from typing import Optional, Any
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: str  # "train", "stationarity" or "forecast"
+    status: str  # pending, running, completed, failed
+    backend: Optional[str] = None  # "celery" or "local"
+    estimated_seconds: Optional[float] = None
+    result: Optional[Any] = None  # Response of the synchronous endpoint, once completed
+    error: Optional[str] = None
+    error_status: Optional[int] = None  # HTTP status the synchronous endpoint would have returned
+    created_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
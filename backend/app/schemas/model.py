@@ -49,6 +49,7 @@ class TrainModelRequest(BaseModel):
     dataset_id: Optional[str] = None
     date_column: Optional[str] = None
     target_column: Optional[str] = None
+    series_id: Optional[str] = None  # Series to train on from a panel dataset
     parameters: ModelParameters
     exog_variables: Optional[Dict[str, List[float]]] = None
     model_type: Optional[str] = "SARIMAX"  # "SARIMAX" or "ARTFIMA"
@@ -57,8 +58,30 @@ class TrainModelRequest(BaseModel):
     model_config = ConfigDict(protected_namespaces=())
 
 
+class FleetTrainRequest(BaseModel):
+    dataset_id: str
+    date_column: str
+    target_columns: Optional[List[str]] = None  # One model per column
+    target_column: Optional[str] = None  # Value column of a panel dataset
+    series_ids: Optional[List[str]] = None  # Panel series to train on (default all)
+    parameters: Optional[ModelParameters] = None
+    model_type: Optional[str] = "SARIMAX"  # "SARIMAX" or "ARTFIMA"
+    artfima_parameters: Optional[ARTFIMAParameters] = None
+    project_id: Optional[str] = None
+
+    model_config = ConfigDict(protected_namespaces=())
+
+
 class GridSearchRequest(BaseModel):
-    timeseries_data: Dict[str, float]
+    # Option 1: Direct timeseries data
+    timeseries_data: Optional[Dict[str, float]] = None  # {date: value}
+    # Option 2: Slice of a dataset, read by the worker
+    dataset_id: Optional[str] = None
+    date_column: Optional[str] = None
+    target_column: Optional[str] = None
+    series_id: Optional[str] = None  # Series of a panel dataset
+    start_date: Optional[str] = None  # Inclusive bounds of the slice
+    end_date: Optional[str] = None
     p_range: List[int]
     q_range: List[int]
     P_range: List[int]
@@ -67,6 +90,33 @@ class GridSearchRequest(BaseModel):
     D: int = 1
     s: int = 12
     exog_variables: Optional[Dict[str, List[float]]] = None
+    search_strategy: str = "grid"  # "grid" (every candidate), "two_phase" (screen, then refine the best) or "stepwise"
+    refine_top_k: Optional[int] = None  # Candidates refitted in two-phase searches (default from settings)
+    transformation: Optional[str] = None  # Transformation applied to timeseries_data; part of the candidate fit cache key
+
+
+class LeaderboardRequest(BaseModel):
+    # Option 1: Direct timeseries data
+    timeseries_data: Optional[Dict[str, float]] = None  # {date: value}
+    # Option 2: Slice of a dataset
+    dataset_id: Optional[str] = None
+    date_column: Optional[str] = None
+    target_column: Optional[str] = None
+    series_id: Optional[str] = None  # Series of a panel dataset
+    start_date: Optional[str] = None  # Inclusive bounds of the slice
+    end_date: Optional[str] = None
+    budget_seconds: Optional[float] = None  # Wall-clock budget (default from settings)
+    holdout: Optional[int] = None  # Last observations held out for scoring (default one season)
+    frequency: Optional[str] = None  # "Daily", "Monthly", ...; default s and stationarity test
+    s: Optional[int] = None
+    d: Optional[int] = None  # SARIMAX differencing orders (default from a stationarity test)
+    D: Optional[int] = None
+    transformation: str = "auto"  # "auto", "log" or "none"
+    families: Optional[List[str]] = None  # Subset of "SARIMAX", "ARIMA", "ARFIMA", "ARTFIMA"
+    max_p: int = 2
+    max_q: int = 2
+    max_seasonal: int = 1  # Largest seasonal P and Q of SARIMAX candidates
+    rank_by: str = "rmse"  # "rmse", "mae", "mape", "aic" or "bic"
 
 
 class PredictionRequest(BaseModel):
@@ -84,6 +134,7 @@ class ForecastRequest(BaseModel):
     transformation_type: Optional[str] = "none"
     last_date: Optional[str] = None  # Last date in the historical data (e.g., "2023-12-01")
     frequency: Optional[str] = None  # Frequency: "Daily", "Weekly", "Monthly", "Quarterly", "Yearly"
+    series_id: Optional[str] = None  # Forecast another series of the model's panel dataset with the model's parameters
 
     model_config = ConfigDict(protected_namespaces=())
 
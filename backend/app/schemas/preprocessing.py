@@ -10,6 +10,7 @@ class TransformRequest(BaseModel):
     date_column: str
     frequency: str
     target_column: str
+    series_id: Optional[str] = None  # Series to use from a panel dataset
 
 
 class StationarityTestRequest(BaseModel):
@@ -19,6 +20,7 @@ class StationarityTestRequest(BaseModel):
     dataset_id: Optional[str] = None
     date_column: Optional[str] = None
     target_column: Optional[str] = None
+    series_id: Optional[str] = None  # Series to use from a panel dataset
     frequency: str
     force_transformation: Optional[str] = None
     custom_transformation_size: Optional[Tuple[int, int]] = None
@@ -0,0 +1,999 @@
+"""
+Columnar dataset store
+
+Parsing a CSV (and its date column) on every request dominates latency for
+large datasets. Each dataset is converted once into a directory of
+per-column .npy files plus a JSON manifest; date-like text columns are
+parsed to datetime64 at conversion time. Requests open the columns
+memory-mapped, so loading costs a few file opens regardless of row count.
+
+Conversion is streamed: ColumnarWriter takes the parsed file a chunk at a
+time, spools each chunk to disk and keeps per-column statistics (nulls,
+min, max) as it goes, so building the artifact never needs the whole file
+in memory.
+
+Opened columns are kept in an LRU keyed by dataset id and the source
+file's mtime. Artifacts that are missing or older than their source file
+are rebuilt on first access, so datasets created before the store existed
+keep working. Rebuilds of one artifact are serialized by a lock file next
+to it, so API workers and Celery workers opening the same stale dataset
+build it once.
+"""
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from app.core.config import settings
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+PANEL_SUFFIX = ".panel"
+PANEL_WRITE_ROWS = 1_000_000
+
+
+def _json_scalar(value, kind: str):
+    """Convert a column min/max to a JSON-safe value"""
+    if value is None:
+        return None
+    if kind == "datetime":
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    return float(value)
+
+
+def _npy_header(dtype: np.dtype, rows: int) -> bytes:
+    """Header of a 1-D .npy file"""
+    buffer = io.BytesIO()
+    np.lib.format.write_array_header_1_0(buffer, {
+        "descr": np.lib.format.dtype_to_descr(dtype),
+        "fortran_order": False,
+        "shape": (rows,),
+    })
+    return buffer.getvalue()
+
+
+def _write_npy(path: Path, dtype: np.dtype, rows: int, parts) -> None:
+    """Write a 1-D .npy file from an iterable of array parts without joining them in memory"""
+    with open(path, "wb") as fp:
+        fp.write(_npy_header(dtype, rows))
+        for part in parts:
+            fp.write(np.ascontiguousarray(part, dtype=dtype).tobytes())
+
+
+def _extend_npy(path: Path, dtype: np.dtype, values: np.ndarray) -> None:
+    """
+    Append values to a 1-D .npy file
+
+    When the stored dtype is unchanged and the new header has the same
+    length (headers are padded, so it almost always does), the values are
+    written at the end of the file and only the header is rewritten.
+    Otherwise the file is rewritten with the combined values.
+    """
+    with open(path, "r+b") as fp:
+        np.lib.format.read_magic(fp)
+        shape, _, stored_dtype = np.lib.format.read_array_header_1_0(fp)
+        data_offset = fp.tell()
+        rows = shape[0] + len(values)
+        header = _npy_header(dtype, rows)
+        if stored_dtype == dtype and len(header) == data_offset:
+            # Data first, then the header: a crash in between leaves the old
+            # row count, which still reads as the old column
+            fp.seek(0, os.SEEK_END)
+            fp.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+            fp.flush()
+            fp.seek(0)
+            fp.write(header)
+            return
+
+    existing = np.load(path, mmap_mode="r", allow_pickle=False)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    _write_npy(tmp, dtype, rows, [existing.astype(dtype), values])
+    del existing
+    os.replace(tmp, path)
+
+
+def _valid_manifest(path: Path) -> Optional[Dict[str, Any]]:
+    """Manifest of the artifact in a directory, or None if it has no readable current one"""
+    try:
+        manifest = json.loads((path / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def _install(tmp: Path, target: Path) -> bool:
+    """
+    Move a finished artifact directory into place
+
+    The artifact already at target is renamed aside before being removed,
+    so this never deletes files another writer has just put in place. If
+    another writer installs its artifact between the two renames, the
+    replace fails; its artifact is kept when it has a valid manifest.
+
+    Returns:
+        False if tmp was dropped in favour of another writer's artifact
+    """
+    old = target.with_name(f".{target.name}.{uuid.uuid4().hex}.old")
+    try:
+        os.replace(target, old)
+    except FileNotFoundError:
+        old = None
+    try:
+        os.replace(tmp, target)
+        return True
+    except OSError:
+        if _valid_manifest(target) is None:
+            raise
+        shutil.rmtree(tmp, ignore_errors=True)
+        return False
+    finally:
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+
+def _combine_moments(parts: List[Dict[str, Any]]) -> Tuple[int, Optional[float], Optional[float]]:
+    """Merge per-chunk (count, mean, M2) into column mean and sample std (Chan et al.)"""
+    n, mean, m2 = 0, 0.0, 0.0
+    for p in parts:
+        if "m2" not in p:
+            continue
+        k = p["rows"] - p["nulls"]
+        delta = p["mean"] - mean
+        total = n + k
+        mean += delta * k / total
+        m2 += p["m2"] + delta * delta * n * k / total
+        n = total
+    if n == 0:
+        return 0, None, None
+    return n, mean, (float(np.sqrt(m2 / (n - 1))) if n > 1 else None)
+
+
+def _decode_column(kind: str, values: np.ndarray, mask: Optional[np.ndarray]):
+    """Turn a stored array back into column data for a DataFrame"""
+    if kind == "string":
+        out = values.astype(object)
+        if mask is not None:
+            out[mask] = np.nan
+        return out
+    return values
+
+
+class ColumnarWriter:
+    """
+    Build a columnar artifact from DataFrame chunks with bounded memory
+
+    Each chunk of each column is spooled to its own file. A column's final
+    type is only known once every chunk has been seen (pandas may infer int
+    for one chunk and float or text for the next), so commit() resolves the
+    type and streams the spooled parts into the final .npy file.
+    """
+
+    def __init__(
+        self,
+        target: Path,
+        source_path: Optional[str] = None,
+        date_formats: Optional[Dict[str, str]] = None,
+    ):
+        self.target = target
+        self.source_path = source_path
+        self.date_formats = date_formats or {}
+        self.tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard everything written so far"""
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        (self.tmp / "chunks").mkdir(parents=True)
+        self.columns: Optional[List[str]] = None
+        self.row_count = 0
+        self._parts: List[List[Dict[str, Any]]] = []
+        self._date_formats: Dict[int, Optional[str]] = {}
+        self._not_dates: set = set()
+
+    def abort(self) -> None:
+        """Remove the partial artifact"""
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _save(self, name: str, values: np.ndarray) -> str:
+        path = self.tmp / "chunks" / f"{name}.npy"
+        np.save(path, values, allow_pickle=False)
+        return str(path)
+
+    def _parse_dates(self, i: int, series: pd.Series) -> Optional[np.ndarray]:
+        """Parse a text chunk as dates using the column's known format, or one guessed from its first value"""
+        if i in self._not_dates:
+            return None
+        if i not in self._date_formats:
+            fmt = self.date_formats.get(self.columns[i])
+            if fmt is None:
+                fmt = guess_datetime_format(str(series.dropna().iloc[0]))
+            self._date_formats[i] = fmt
+        fmt = self._date_formats[i]
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                parsed = pd.to_datetime(series, format=fmt) if fmt else pd.to_datetime(series)
+        except (ValueError, TypeError, OverflowError):
+            parsed = None
+        if parsed is None or not pd.api.types.is_datetime64_dtype(parsed):
+            self._not_dates.add(i)
+            return None
+        return parsed.to_numpy(dtype="datetime64[ns]")
+
+    def _spool(self, i: int, series: pd.Series) -> Dict[str, Any]:
+        """Write one chunk of one column and record its type and statistics"""
+        name = f"c{i}_{len(self._parts[i])}"
+        mask = series.isna().to_numpy()
+        part = {"rows": len(series), "nulls": int(mask.sum())}
+
+        if part["nulls"] == part["rows"]:
+            # Empty or all-null chunk: compatible with any column type
+            part["kind"] = "null"
+            return part
+
+        if pd.api.types.is_bool_dtype(series) or pd.api.types.is_numeric_dtype(series):
+            values = series.to_numpy()
+            part.update(kind="numeric", dtype=values.dtype.str, values=self._save(name, values))
+            valid = values[~mask]
+            part["min"], part["max"] = valid.min(), valid.max()
+            moments = valid.astype("f8")
+            part["mean"] = float(moments.mean())
+            part["m2"] = float(((moments - part["mean"]) ** 2).sum())
+            return part
+
+        if pd.api.types.is_datetime64_dtype(series):
+            values = series.to_numpy(dtype="datetime64[ns]")
+            part.update(kind="datetime", values=self._save(name, values))
+            valid = values[~mask]
+            part["min"], part["max"] = valid.min(), valid.max()
+            return part
+
+        text = series.where(~mask, "").astype(str).to_numpy(dtype=str)
+        part.update(kind="text", values=self._save(name, text), width=text.dtype.itemsize // 4)
+        if part["nulls"]:
+            part["mask"] = self._save(f"{name}_mask", mask)
+
+        dates = self._parse_dates(i, series)
+        if dates is not None:
+            part["dates"] = self._save(f"{name}_dates", dates)
+            valid = dates[~np.isnat(dates)]
+            if valid.size:
+                part["min"], part["max"] = valid.min(), valid.max()
+        return part
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Add the next chunk of rows"""
+        names = [str(c) for c in df.columns]
+        if self.columns is None:
+            self.columns = names
+            self._parts = [[] for _ in names]
+        elif names != self.columns:
+            raise ValueError("Chunk columns do not match the first chunk")
+
+        for i in range(len(names)):
+            self._parts[i].append(self._spool(i, df.iloc[:, i]))
+        self.row_count += len(df)
+
+    @staticmethod
+    def _resolve_kind(parts: List[Dict[str, Any]]) -> Tuple[str, Optional[np.dtype]]:
+        """Pick one type for a column from the types of its chunks"""
+        kinds = {p["kind"] for p in parts} - {"null"}
+        if not kinds:
+            return "numeric", np.dtype("<f8")
+        if kinds == {"numeric"}:
+            dtype = np.result_type(*[np.dtype(p["dtype"]) for p in parts if p["kind"] == "numeric"])
+            if dtype.kind in "biu" and any(p["kind"] == "null" for p in parts):
+                dtype = np.dtype("<f8")
+            return "numeric", dtype
+        if kinds <= {"datetime", "text"} and all(
+            "dates" in p for p in parts if p["kind"] == "text"
+        ):
+            return "datetime", np.dtype("<M8[ns]")
+        return "string", None
+
+    def _column_parts(self, kind: str, dtype: np.dtype, parts: List[Dict[str, Any]]):
+        """Yield the column's values chunk by chunk, converted to the final type"""
+        for p in parts:
+            if p["kind"] == "null":
+                fill = "" if kind == "string" else (np.datetime64("NaT") if kind == "datetime" else np.nan)
+                yield np.full(p["rows"], fill, dtype=dtype)
+                continue
+            source = p["dates"] if (kind == "datetime" and p["kind"] == "text") else p["values"]
+            values = np.load(source, mmap_mode="r", allow_pickle=False)
+            if kind == "string" and p["kind"] != "text":
+                values = values.astype(str)
+            yield values
+
+    @staticmethod
+    def _mask_parts(parts: List[Dict[str, Any]]):
+        for p in parts:
+            if p["kind"] == "null":
+                yield np.ones(p["rows"], dtype=bool)
+            elif p["nulls"] and p["kind"] == "text":
+                yield np.load(p["mask"], mmap_mode="r", allow_pickle=False)
+            elif p["nulls"]:
+                values = np.load(p["values"], mmap_mode="r", allow_pickle=False)
+                yield np.isnat(values) if p["kind"] == "datetime" else np.isnan(values)
+            else:
+                yield np.zeros(p["rows"], dtype=bool)
+
+    def commit(self) -> Dict[str, Any]:
+        """
+        Finalize the artifact and move it into place
+
+        Returns:
+            Manifest, including per-column statistics (that of the
+            artifact in place if another writer installed one first)
+        """
+        columns = []
+        for i, name in enumerate(self.columns or []):
+            parts = self._parts[i]
+            kind, dtype = self._resolve_kind(parts)
+            if kind == "string":
+                width = max(
+                    [p["width"] for p in parts if p["kind"] == "text"]
+                    + [int(np.load(p["values"], mmap_mode="r").astype(str).dtype.itemsize // 4)
+                       for p in parts if p["kind"] in ("numeric", "datetime")]
+                    + [1]
+                )
+                dtype = np.dtype(f"<U{width}")
+
+            entry = {"name": name, "kind": kind, "file": f"c{i}.npy"}
+            _write_npy(self.tmp / entry["file"], dtype, self.row_count, self._column_parts(kind, dtype, parts))
+
+            null_count = sum(p["nulls"] for p in parts)
+            if kind == "string" and null_count:
+                entry["mask"] = f"c{i}.mask.npy"
+                _write_npy(self.tmp / entry["mask"], np.dtype(bool), self.row_count, self._mask_parts(parts))
+
+            stats = {"dtype": str(dtype), "null_count": null_count, "min": None, "max": None}
+            if kind != "string":
+                mins = [p["min"] for p in parts if "min" in p]
+                maxs = [p["max"] for p in parts if "max" in p]
+                if mins:
+                    stats["min"] = _json_scalar(min(mins), kind)
+                    stats["max"] = _json_scalar(max(maxs), kind)
+            if kind == "numeric":
+                _, stats["mean"], stats["std"] = _combine_moments(parts)
+            entry["stats"] = stats
+            columns.append(entry)
+
+        source_mtime = None
+        if self.source_path is not None:
+            try:
+                source_mtime = os.stat(self.source_path).st_mtime_ns
+            except OSError:
+                pass
+
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "row_count": self.row_count,
+            "source_mtime": source_mtime,
+            "columns": columns,
+        }
+        shutil.rmtree(self.tmp / "chunks")
+        (self.tmp / MANIFEST_NAME).write_text(json.dumps(manifest))
+
+        if not _install(self.tmp, self.target):
+            return _valid_manifest(self.target)
+        return manifest
+
+
+class DatasetStore:
+    """Columnar artifacts for datasets, opened memory-mapped through an LRU"""
+
+    def __init__(self, cache_dir: str, max_entries: int):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def artifact_dir(self, dataset_id: str) -> Path:
+        """Directory holding a dataset's columnar files"""
+        return Path(self.cache_dir) / dataset_id
+
+    @staticmethod
+    def artifact_key(dataset) -> str:
+        """Artifact id of a dataset: its content hash for uploads (shared by equal uploads), else its id"""
+        return getattr(dataset, "content_hash", None) or dataset.id
+
+    def has_artifact(self, dataset_id: str) -> bool:
+        """Whether a finished artifact exists for an id"""
+        return (self.artifact_dir(dataset_id) / MANIFEST_NAME).exists()
+
+    @staticmethod
+    def _source_mtime(dataset) -> Optional[int]:
+        try:
+            return os.stat(dataset.file_path).st_mtime_ns
+        except (OSError, TypeError):
+            return None
+
+    def open_writer(
+        self,
+        dataset_id: str,
+        source_path: Optional[str] = None,
+        date_formats: Optional[Dict[str, str]] = None,
+    ) -> ColumnarWriter:
+        """
+        Start a streamed artifact build for a dataset
+
+        Args:
+            dataset_id: Dataset id the artifact belongs to
+            source_path: File being converted; its mtime is recorded so the
+                artifact is rebuilt if the file changes
+            date_formats: Known formats of date columns ({column: format})
+
+        Returns:
+            Writer to append chunks to and commit
+        """
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        return ColumnarWriter(self.artifact_dir(dataset_id), source_path, date_formats)
+
+    def write(self, dataset_id: str, df: pd.DataFrame, source_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Write an in-memory DataFrame as a columnar artifact
+
+        Returns:
+            Manifest of the written artifact
+        """
+        writer = self.open_writer(dataset_id, source_path)
+        try:
+            writer.append(df)
+            manifest = writer.commit()
+        except Exception:
+            writer.abort()
+            raise
+        self.invalidate(dataset_id)
+        return manifest
+
+    def _read_manifest(self, dataset_id: str) -> Optional[Dict[str, Any]]:
+        return _valid_manifest(self.artifact_dir(dataset_id))
+
+    @contextmanager
+    def _build_lock(self, key: str):
+        """
+        Hold the rebuild lock of an artifact
+
+        The lock is a file created with O_EXCL, so it is shared by threads
+        and by processes (API and Celery workers) using the same cache
+        directory. A lock file older than DATASET_BUILD_LOCK_TIMEOUT is
+        taken to be left by a crashed process and removed.
+        """
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        path = Path(self.cache_dir) / f".{key}.lock"
+        while True:
+            try:
+                os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    age = time.time() - os.stat(path).st_mtime
+                except FileNotFoundError:
+                    continue
+                if age > settings.DATASET_BUILD_LOCK_TIMEOUT:
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                    continue
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _open(self, dataset) -> Dict[str, Any]:
+        """Open (building if needed) the memory-mapped columns of a dataset"""
+        key = self.artifact_key(dataset)
+        source_mtime = self._source_mtime(dataset)
+
+        def stale(manifest) -> bool:
+            return manifest is None or (source_mtime is not None and manifest["source_mtime"] != source_mtime)
+
+        manifest = self._read_manifest(key)
+        if stale(manifest):
+            if not dataset.file_path or source_mtime is None:
+                raise FileNotFoundError("Dataset file not found")
+            with self._build_lock(key):
+                # Another request or worker may have rebuilt it meanwhile
+                manifest = self._read_manifest(key)
+                if stale(manifest):
+                    from app.services.data.import_service import DataImportService
+                    # Reuse the dialect detected at upload instead of sniffing again
+                    dialect = (dataset.meta_data or {}).get("dialect")
+                    DataImportService.ingest_file(dataset.file_path, key, dialect=dialect)
+                    manifest = self._read_manifest(key)
+
+        return {"source_mtime": source_mtime, "columns": self._map_columns(key, manifest)}
+
+    def _map_columns(self, key: str, manifest: Dict[str, Any]) -> "OrderedDict[str, Tuple[str, np.ndarray, Optional[np.ndarray]]]":
+        """Memory-map the column files of an artifact"""
+        base = self.artifact_dir(key)
+        columns = OrderedDict()
+        for entry in manifest["columns"]:
+            # Plain ndarray views on the maps, so pandas never sees np.memmap
+            values = np.load(base / entry["file"], mmap_mode="r", allow_pickle=False).view(np.ndarray)
+            mask = None
+            if "mask" in entry:
+                mask = np.load(base / entry["mask"], mmap_mode="r", allow_pickle=False).view(np.ndarray)
+            columns[entry["name"]] = (entry["kind"], values, mask)
+        return columns
+
+    def _get_columns(self, dataset) -> "OrderedDict[str, Tuple[str, np.ndarray, Optional[np.ndarray]]]":
+        key = self.artifact_key(dataset)
+        source_mtime = self._source_mtime(dataset)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["source_mtime"] == source_mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["columns"]
+            self.misses += 1
+
+        entry = self._open(dataset)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry["columns"]
+
+    def column_names(self, dataset) -> List[str]:
+        """Column names of a dataset, in file order"""
+        return list(self._get_columns(dataset).keys())
+
+    def load_frame(self, dataset, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load a dataset as a DataFrame
+
+        Numeric and date columns are read-only views on the memory-mapped
+        files; date-like text columns come back already parsed as datetime64.
+
+        Args:
+            dataset: Dataset row
+            columns: Columns to load (default all). Names not in the dataset
+                are skipped, so callers can validate against the result.
+
+        Returns:
+            DataFrame with the requested columns
+
+        Raises:
+            FileNotFoundError: If neither the artifact nor the source file exists
+        """
+        stored = self._get_columns(dataset)
+        names = list(stored.keys()) if columns is None else [c for c in dict.fromkeys(columns) if c in stored]
+        data = {name: _decode_column(*stored[name]) for name in names}
+        return pd.DataFrame(data, columns=names, copy=False)
+
+    def panel_key(self, dataset) -> str:
+        """Artifact id of a dataset's panel layout"""
+        return f"{self.artifact_key(dataset)}{PANEL_SUFFIX}"
+
+    @staticmethod
+    def panel_config(dataset) -> Optional[Dict[str, Any]]:
+        """Panel settings of a dataset (series and date column), or None for a single series"""
+        return (getattr(dataset, "meta_data", None) or {}).get("panel")
+
+    @staticmethod
+    def _series_label(value) -> str:
+        """String id of a series-column value (integral floats without their .0)"""
+        if isinstance(value, np.generic):
+            value = value.item()
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    def build_panel(self, dataset, series_column: str, date_column: str) -> Dict[str, Any]:
+        """
+        Write a dataset's rows sorted by series and date, indexed by series
+
+        The panel layout is a second artifact with the same columns, ordered
+        by (series, date), and the [start, stop) row range of every series.
+        One series is then a contiguous slice of each column, found with a
+        dict lookup. Rows without a series id are left out. Columns are
+        written one at a time, in bounded slices.
+
+        Args:
+            dataset: Dataset row
+            series_column: Column identifying the series of each row
+            date_column: Date column to sort by within a series
+
+        Returns:
+            Panel index: series_column, date_column, series ({id: [start, stop]})
+            and dropped_rows
+
+        Raises:
+            ValueError: If a column is missing or of the wrong type
+        """
+        stored = self._get_columns(dataset)
+        for name in (series_column, date_column):
+            if name not in stored:
+                raise ValueError(f"Column '{name}' not found in dataset")
+        if stored[date_column][0] != "datetime":
+            raise ValueError(f"Column '{date_column}' does not contain dates")
+        if series_column == date_column:
+            raise ValueError("The series column must differ from the date column")
+
+        codes, uniques = pd.factorize(_decode_column(*stored[series_column]), sort=True)
+        dates = stored[date_column][1].view("i8")
+        order = np.lexsort((dates, codes))
+        keep = codes[order] >= 0  # null ids sort first (code -1)
+        order = order[keep]
+        sorted_codes = codes[order]
+
+        bounds = np.flatnonzero(np.diff(sorted_codes)) + 1
+        starts = np.concatenate([[0], bounds]) if len(order) else np.empty(0, dtype=np.int64)
+        stops = np.concatenate([bounds, [len(order)]]) if len(order) else np.empty(0, dtype=np.int64)
+        series = {
+            self._series_label(uniques[code]): [int(start), int(stop)]
+            for code, start, stop in zip(sorted_codes[starts], starts, stops)
+        }
+        if len(series) < len(starts):
+            raise ValueError(f"Column '{series_column}' has ids that only differ in type, e.g. 1 and '1'")
+
+        key = self.artifact_key(dataset)
+        manifest = self._read_manifest(key)
+        target = self.artifact_dir(self.panel_key(dataset))
+        tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        tmp.mkdir(parents=True)
+        try:
+            slices = [order[i:i + PANEL_WRITE_ROWS] for i in range(0, len(order), PANEL_WRITE_ROWS)]
+            for entry in manifest["columns"]:
+                _, values, mask = stored[entry["name"]]
+                _write_npy(tmp / entry["file"], values.dtype, len(order), (values[part] for part in slices))
+                if mask is not None:
+                    _write_npy(tmp / entry["mask"], mask.dtype, len(order), (mask[part] for part in slices))
+
+            panel = {
+                "series_column": series_column,
+                "date_column": date_column,
+                "series": series,
+                "dropped_rows": int(len(codes) - len(order)),
+            }
+            (tmp / MANIFEST_NAME).write_text(json.dumps({**manifest, "row_count": len(order), "panel": panel}))
+            _install(tmp, target)
+        except Exception:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self.invalidate(self.panel_key(dataset))
+        return panel
+
+    def _get_panel(self, dataset) -> Dict[str, Any]:
+        """Opened panel layout of a dataset (columns and series index), rebuilt if stale"""
+        config = self.panel_config(dataset)
+        if not config:
+            raise ValueError("Dataset is not a panel dataset")
+        key = self.panel_key(dataset)
+        source_mtime = self._source_mtime(dataset)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["source_mtime"] == source_mtime:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        self._get_columns(dataset)  # rebuilds the base artifact if stale
+
+        def stale(manifest) -> bool:
+            return (
+                manifest is None
+                or (source_mtime is not None and manifest["source_mtime"] != source_mtime)
+                or manifest["panel"]["series_column"] != config["series_column"]
+                or manifest["panel"]["date_column"] != config["date_column"]
+            )
+
+        manifest = self._read_manifest(key)
+        if stale(manifest):
+            with self._build_lock(key):
+                manifest = self._read_manifest(key)
+                if stale(manifest):
+                    self.build_panel(dataset, config["series_column"], config["date_column"])
+                    manifest = self._read_manifest(key)
+
+        entry = {
+            "source_mtime": source_mtime,
+            "columns": self._map_columns(key, manifest),
+            "series": manifest["panel"]["series"],
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def panel_series(self, dataset) -> List[Dict[str, Any]]:
+        """
+        Series of a panel dataset with their row counts and date ranges
+
+        Raises:
+            ValueError: If the dataset is not a panel dataset
+        """
+        entry = self._get_panel(dataset)
+        dates = entry["columns"][self.panel_config(dataset)["date_column"]][1]
+        result = []
+        for series_id, (start, stop) in entry["series"].items():
+            valid = dates[start:stop]
+            valid = valid[~np.isnat(valid)]
+            result.append({
+                "series_id": series_id,
+                "rows": stop - start,
+                "start_date": _json_scalar(valid[0], "datetime") if len(valid) else None,
+                "end_date": _json_scalar(valid[-1], "datetime") if len(valid) else None,
+            })
+        return result
+
+    def load_series(self, dataset, columns: Optional[List[str]] = None, series_id: Optional[str] = None) -> pd.DataFrame:
+        """
+        Load the rows of one series as a DataFrame
+
+        For panel datasets the series is sliced from the panel layout
+        without scanning other rows; its rows come sorted by date. Datasets
+        holding a single series are loaded whole.
+
+        Args:
+            dataset: Dataset row
+            columns: Columns to load (default all); unknown names are skipped
+            series_id: Series to load; required for panel datasets
+
+        Returns:
+            DataFrame with the requested columns
+
+        Raises:
+            ValueError: If series_id is missing for a panel dataset, given for
+                any other dataset, or not found
+        """
+        config = self.panel_config(dataset)
+        if not config:
+            if series_id is not None:
+                raise ValueError("Dataset is not a panel dataset; series_id is not supported")
+            return self.load_frame(dataset, columns)
+        if series_id is None:
+            raise ValueError(
+                f"Dataset holds {config['series_count']} series in column '{config['series_column']}'; "
+                "pass series_id to select one"
+            )
+
+        entry = self._get_panel(dataset)
+        bounds = entry["series"].get(str(series_id))
+        if bounds is None:
+            raise ValueError(f"Series '{series_id}' not found in column '{config['series_column']}'")
+        start, stop = bounds
+
+        stored = entry["columns"]
+        names = list(stored.keys()) if columns is None else [c for c in dict.fromkeys(columns) if c in stored]
+        data = {}
+        for name in names:
+            kind, values, mask = stored[name]
+            data[name] = _decode_column(kind, values[start:stop], None if mask is None else mask[start:stop])
+        return pd.DataFrame(data, columns=names, copy=False)
+
+    def invalidate(self, dataset_id: str) -> None:
+        """Forget the opened columns of a dataset"""
+        with self._lock:
+            self._entries.pop(dataset_id, None)
+
+    def _append_manifests(self, dataset_id: str, part_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Manifests of an artifact and of rows to append to it, after checking they fit"""
+        manifest = self._read_manifest(dataset_id)
+        part = self._read_manifest(part_id)
+        if manifest is None or part is None:
+            raise FileNotFoundError("Dataset artifact not found")
+
+        names = [c["name"] for c in manifest["columns"]]
+        part_names = [c["name"] for c in part["columns"]]
+        if part_names != names:
+            raise ValueError(f"New rows have columns {part_names}, expected {names}")
+
+        for entry, new in zip(manifest["columns"], part["columns"]):
+            kind = entry["kind"]
+            all_null = new["stats"]["null_count"] == part["row_count"]
+            if new["kind"] != kind and kind != "string" and not all_null:
+                raise ValueError(
+                    f"Column '{entry['name']}' holds {kind} values, but the new rows hold {new['kind']} values"
+                )
+        return manifest, part
+
+    def check_append(self, dataset_id: str, part_id: str) -> None:
+        """
+        Check that an artifact's rows can be appended to another artifact
+
+        Raises:
+            ValueError: If the columns or their types do not match
+        """
+        self._append_manifests(dataset_id, part_id)
+
+    def append(self, dataset_id: str, part_id: str, source_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Append the rows of another artifact to a dataset's artifact
+
+        Column files are extended in place where possible (see _extend_npy),
+        so the existing rows are not rewritten. Integer columns become float
+        when the new rows hold nulls, and string columns widen as needed.
+        Column statistics are merged without reading the existing rows.
+
+        Args:
+            dataset_id: Artifact to extend
+            part_id: Artifact holding the new rows, with the same columns;
+                removed afterwards
+            source_path: Source file the dataset's rows now live in; its
+                mtime is recorded as the artifact's new version
+
+        Returns:
+            Updated manifest
+
+        Raises:
+            ValueError: If the columns or their types do not match
+        """
+        manifest, part = self._append_manifests(dataset_id, part_id)
+        base, part_base = self.artifact_dir(dataset_id), self.artifact_dir(part_id)
+        old_rows, new_rows = manifest["row_count"], part["row_count"]
+
+        with self._lock:
+            for entry, new in zip(manifest["columns"], part["columns"]):
+                all_null = new["stats"]["null_count"] == new_rows
+                self._append_column(entry, new, all_null, base, part_base, old_rows, new_rows)
+
+            manifest["row_count"] = old_rows + new_rows
+            if source_path is not None:
+                manifest["source_mtime"] = os.stat(source_path).st_mtime_ns
+            tmp = base / f".{MANIFEST_NAME}.{uuid.uuid4().hex}.tmp"
+            tmp.write_text(json.dumps(manifest))
+            os.replace(tmp, base / MANIFEST_NAME)
+            self._entries.pop(dataset_id, None)
+
+        self.delete(part_id)
+        return manifest
+
+    @staticmethod
+    def _append_column(
+        entry: Dict[str, Any],
+        new: Dict[str, Any],
+        all_null: bool,
+        base: Path,
+        part_base: Path,
+        old_rows: int,
+        new_rows: int,
+    ) -> None:
+        """Extend one column file (and its null mask) and merge its statistics in the manifest entry"""
+        kind = entry["kind"]
+        old_stats, new_stats = entry["stats"], new["stats"]
+        dtype = np.dtype(old_stats["dtype"])
+
+        if all_null:
+            values = raw = None
+        else:
+            values = raw = np.load(part_base / new["file"], mmap_mode="r", allow_pickle=False)
+
+        if kind == "numeric":
+            if values is not None:
+                dtype = np.result_type(dtype, values.dtype)
+            if dtype.kind in "biu" and new_stats["null_count"]:
+                dtype = np.dtype("<f8")
+            if values is None:
+                values = np.full(new_rows, np.nan, dtype=dtype)
+        elif kind == "datetime":
+            if values is None:
+                values = np.full(new_rows, np.datetime64("NaT"), dtype=dtype)
+        else:
+            values = np.full(new_rows, "", dtype="<U1") if values is None else values.astype(str)
+            if new_stats["null_count"] and new["kind"] == "string" and "mask" in new:
+                values = np.where(np.load(part_base / new["mask"], allow_pickle=False), "", values)
+            dtype = np.dtype(f"<U{max(dtype.itemsize, values.dtype.itemsize) // 4}")
+
+        _extend_npy(base / entry["file"], dtype, values)
+
+        if kind == "string" and (new_stats["null_count"] or "mask" in entry):
+            if all_null:
+                new_mask = np.ones(new_rows, dtype=bool)
+            elif "mask" in new:
+                new_mask = np.load(part_base / new["mask"], allow_pickle=False)
+            elif new["kind"] == "string":
+                new_mask = np.zeros(new_rows, dtype=bool)
+            else:
+                new_mask = np.isnat(raw) if new["kind"] == "datetime" else np.isnan(raw.astype("f8"))
+            if "mask" in entry:
+                _extend_npy(base / entry["mask"], np.dtype(bool), new_mask)
+            else:
+                entry["mask"] = entry["file"].replace(".npy", ".mask.npy")
+                _write_npy(base / entry["mask"], np.dtype(bool), old_rows + new_rows,
+                           [np.zeros(old_rows, dtype=bool), new_mask])
+
+        stats = {
+            **old_stats,
+            "dtype": str(dtype),
+            "null_count": old_stats["null_count"] + new_stats["null_count"],
+        }
+        if kind != "string":
+            parse = pd.Timestamp if kind == "datetime" else float
+            for key, pick in (("min", min), ("max", max)):
+                candidates = [v for v in (old_stats[key], new_stats[key]) if v is not None]
+                stats[key] = _json_scalar(pick(candidates, key=parse), kind) if candidates else None
+                if kind == "numeric" and dtype.kind in "biu" and stats[key] is not None:
+                    stats[key] = int(stats[key])
+        if kind == "numeric":
+            moments = []
+            for rows, column_stats in ((old_rows, old_stats), (new_rows, new_stats)):
+                if column_stats.get("mean") is None:
+                    continue
+                count = rows - column_stats["null_count"]
+                std = column_stats.get("std") or 0.0
+                moments.append({
+                    "rows": rows,
+                    "nulls": column_stats["null_count"],
+                    "mean": column_stats["mean"],
+                    "m2": std * std * (count - 1),
+                })
+            _, stats["mean"], stats["std"] = _combine_moments(moments)
+        entry["stats"] = stats
+
+    def move(self, source_id: str, dataset_id: str) -> None:
+        """Rename an artifact (and its panel layout) to another id"""
+        if source_id == dataset_id:
+            return
+        for suffix in ("", PANEL_SUFFIX):
+            source = self.artifact_dir(f"{source_id}{suffix}")
+            target = self.artifact_dir(f"{dataset_id}{suffix}")
+            shutil.rmtree(target, ignore_errors=True)
+            if source.exists():
+                os.replace(source, target)
+            self.invalidate(f"{source_id}{suffix}")
+            self.invalidate(f"{dataset_id}{suffix}")
+
+    def clone(self, source_id: str, dataset_id: str) -> None:
+        """Copy an existing artifact to another dataset id without re-parsing the source"""
+        target = self.artifact_dir(dataset_id)
+        tmp = target.with_name(f".{dataset_id}.{uuid.uuid4().hex}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        shutil.copytree(self.artifact_dir(source_id), tmp)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(tmp, target)
+        self.invalidate(dataset_id)
+
+    def delete(self, dataset_id: str) -> None:
+        """Remove a dataset's artifact (and panel layout) from disk and from the LRU"""
+        for key in (dataset_id, f"{dataset_id}{PANEL_SUFFIX}"):
+            self.invalidate(key)
+            shutil.rmtree(self.artifact_dir(key), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+
+dataset_store = DatasetStore(
+    cache_dir=settings.DATASET_CACHE_DIR,
+    max_entries=settings.DATASET_CACHE_MAX_ENTRIES,
+)
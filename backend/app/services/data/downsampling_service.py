@@ -0,0 +1,171 @@
+"""
+Series downsampling for charts
+
+Reduces a column to a bounded number of points while keeping its visual
+shape, so large datasets can be plotted without shipping every row.
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+
+class DownsamplingService:
+    """Service for range queries and shape-preserving downsampling"""
+
+    METHODS = ("lttb", "minmax")
+
+    @staticmethod
+    def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        Largest-Triangle-Three-Buckets downsampling
+
+        Keeps the first and last points and, from each of n_out - 2 equal
+        buckets in between, the point forming the largest triangle with the
+        previously kept point and the mean of the next bucket. Bucket means
+        are computed up front; each bucket's selection is one vectorized
+        pass over its points.
+
+        Args:
+            x: Increasing x coordinates (float)
+            y: Values (float, no NaNs)
+            n_out: Number of points to keep
+
+        Returns:
+            Sorted indices of the kept points
+        """
+        n = len(x)
+        if n_out >= n or n_out < 3:
+            return np.arange(n)
+
+        inner_x, inner_y = x[1:-1], y[1:-1]
+        m = n_out - 2
+        starts = (np.arange(m) * len(inner_x)) // m
+        counts = np.diff(np.append(starts, len(inner_x)))
+        next_x = np.append(np.add.reduceat(inner_x, starts)[1:] / counts[1:], x[-1])
+        next_y = np.append(np.add.reduceat(inner_y, starts)[1:] / counts[1:], y[-1])
+
+        out = np.empty(n_out, dtype=np.int64)
+        out[0], out[-1] = 0, n - 1
+        a = 0
+        for i in range(m):
+            s, e = starts[i], starts[i] + counts[i]
+            bx, by = inner_x[s:e], inner_y[s:e]
+            area = np.abs((x[a] - next_x[i]) * (by - y[a]) - (x[a] - bx) * (next_y[i] - y[a]))
+            a = s + int(np.argmax(area)) + 1
+            out[i + 1] = a
+        return out
+
+    @staticmethod
+    def min_max(y: np.ndarray, n_out: int) -> np.ndarray:
+        """
+        Min/max bucketing
+
+        Splits the series into n_out // 2 equal buckets and keeps the
+        minimum and maximum of each, so spikes are never dropped.
+
+        Args:
+            y: Values (float, no NaNs)
+            n_out: Maximum number of points to keep
+
+        Returns:
+            Sorted indices of the kept points
+        """
+        n = len(y)
+        if n_out >= n:
+            return np.arange(n)
+
+        buckets = max(n_out // 2, 1)
+        starts = (np.arange(buckets) * n) // buckets
+        bucket_of = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+
+        kept = []
+        for reduce in (np.minimum, np.maximum):
+            extreme = reduce.reduceat(y, starts)
+            hits = np.flatnonzero(y == extreme[bucket_of])
+            _, first = np.unique(bucket_of[hits], return_index=True)
+            kept.append(hits[first])
+        return np.unique(np.concatenate(kept))
+
+    @staticmethod
+    def series(
+        df: pd.DataFrame,
+        column: str,
+        date_column: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        max_points: int = 2000,
+        method: str = "lttb",
+    ) -> Dict[str, Any]:
+        """
+        Select a date range of a column and downsample it for plotting
+
+        Args:
+            df: Dataset frame holding the value column (and date column)
+            column: Numeric column to return
+            date_column: Column to use as x axis; row positions if omitted
+            start: Inclusive start date (requires date_column)
+            end: Inclusive end date (requires date_column)
+            max_points: Maximum number of points to return
+            method: "lttb" or "minmax"
+
+        Returns:
+            Dict with the selected points and how many were in range
+
+        Raises:
+            ValueError: If a column is missing or not usable, or the method is unknown
+        """
+        if method not in DownsamplingService.METHODS:
+            raise ValueError(f"Unknown downsampling method '{method}'. Use one of: {', '.join(DownsamplingService.METHODS)}")
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found in dataset")
+        if not pd.api.types.is_numeric_dtype(df[column]):
+            raise ValueError(f"Column '{column}' is not numeric")
+        if date_column is None and (start or end):
+            raise ValueError("start and end require date_column")
+
+        y = df[column].to_numpy(dtype="f8")
+        positions = np.arange(len(y))
+        keep = np.isfinite(y)
+
+        dates = None
+        if date_column is not None:
+            if date_column not in df.columns:
+                raise ValueError(f"Date column '{date_column}' not found in dataset")
+            if not pd.api.types.is_datetime64_dtype(df[date_column]):
+                raise ValueError(f"Column '{date_column}' does not contain dates")
+            dates = df[date_column].to_numpy(dtype="datetime64[ns]")
+            keep &= ~np.isnat(dates)
+            if start:
+                keep &= dates >= np.datetime64(pd.Timestamp(start).to_datetime64(), "ns")
+            if end:
+                keep &= dates <= np.datetime64(pd.Timestamp(end).to_datetime64(), "ns")
+
+        selected = np.flatnonzero(keep)
+        y = y[selected]
+        if dates is not None:
+            dates = dates[selected]
+            if not np.all(dates[1:] >= dates[:-1]):
+                order = np.argsort(dates, kind="stable")
+                selected, y, dates = selected[order], y[order], dates[order]
+            x = (dates - dates[0]).astype("f8") if len(dates) else np.empty(0)
+        else:
+            x = positions[selected].astype("f8")
+
+        if method == "lttb":
+            idx = DownsamplingService.lttb(x, y, max_points)
+        else:
+            idx = DownsamplingService.min_max(y, max_points)
+
+        result = {
+            "column": column,
+            "date_column": date_column,
+            "method": method,
+            "total_points": int(len(y)),
+            "returned_points": int(len(idx)),
+            "values": y[idx].tolist(),
+        }
+        if dates is not None:
+            result["dates"] = np.datetime_as_string(dates[idx], unit="s").tolist()
+        else:
+            result["index"] = selected[idx].tolist()
+        return result
@@ -1,11 +1,34 @@
 """
 Data import service - adapted from arauto/lib/file_selector.py
 """
+import codecs
+import csv
+import io
 import os
+import re
+import shutil
+import uuid
 import pandas as pd
-from typing import Tuple, Dict, Any
+from pandas.tseries.api import guess_datetime_format
+from typing import Tuple, Dict, Any, Callable, Optional
 from pathlib import Path
 
+from app.core.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # Optional: pandas' C parser is used without it
+    pa = None
+    pa_csv = None
+
+SNIFF_BYTES = 64 * 1024
+SNIFF_ROWS = 200
+ARROW_BLOCK_BYTES = 8 * 1024 * 1024
+DELIMITER_CANDIDATES = [",", ";", "\t", "|"]
+NULL_TOKENS = {"", "na", "n/a", "nan", "null", "none", "#n/a"}
+NUMBER_PATTERN = r"^[+-]?(\d+({dec}\d*)?|{dec}\d+)([eE][+-]?\d+)?$"
+
 
 class DataImportService:
     """Service for importing and parsing data files"""
@@ -37,7 +60,9 @@ class DataImportService:
         
         # Handle CSV/TXT files
         if file_ext in ['.csv', '.txt']:
-            df = DataImportService._parse_csv(file_path)
+            dialect = DataImportService.sniff_csv(file_path)
+            df = DataImportService._parse_csv(file_path, dialect)
+            metadata["dialect"] = dialect
             
         # Handle Excel files
         elif file_ext in ['.xls', '.xlsx']:
@@ -62,23 +87,392 @@ class DataImportService:
         return df, metadata
     
     @staticmethod
-    def _parse_csv(file_path: str) -> pd.DataFrame:
-        """Parse CSV file with automatic encoding/delimiter detection"""
-        # Try default CSV parsing
+    def ingest_file(
+        file_path: str,
+        artifact_id: str,
+        chunk_rows: Optional[int] = None,
+        dialect: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream a data file into the dataset's columnar artifact
+        
+        CSV/TXT files are sniffed once and parsed in a single chunked pass,
+        so memory use does not grow with file size. Row count, schema and
+        per-column null counts and min/max are computed along the way. Excel
+        files cannot be read incrementally and are parsed whole.
+        
+        Args:
+            file_path: Path to the file to ingest
+            artifact_id: Id the artifact is written under (see DatasetStore.artifact_key)
+            chunk_rows: Rows per chunk for the pandas parser (defaults to
+                settings.UPLOAD_CHUNK_ROWS)
+            dialect: Previously detected CSV dialect; sniffed if not given
+            
+        Returns:
+            Metadata dict with the same keys as parse_file, plus column_stats
+            and, for CSV/TXT, the dialect and parser_engine used
+            
+        Raises:
+            ValueError: If file format is not supported or parsing fails
+        """
+        from app.services.data.dataset_store import dataset_store
+        
+        file_ext = Path(file_path).suffix.lower()
+        if file_ext not in ['.csv', '.txt', '.xls', '.xlsx']:
+            raise ValueError(f"File format {file_ext} is not supported. Supported formats: CSV, TXT, XLS, XLSX")
+        
+        metadata = {
+            "filename": os.path.basename(file_path),
+            "file_path": file_path,
+            "file_extension": file_ext,
+        }
+        
+        is_csv = file_ext in ['.csv', '.txt']
+        if is_csv:
+            dialect = dict(dialect or DataImportService.sniff_csv(file_path))
+        
+        writer = dataset_store.open_writer(
+            artifact_id, file_path, date_formats=dialect["date_formats"] if is_csv else None
+        )
         try:
-            return pd.read_csv(file_path)
-        except pd.errors.ParserError:
-            # Try semicolon delimiter
+            if is_csv:
+                metadata["parser_engine"] = DataImportService._read_csv_chunks(
+                    file_path,
+                    dialect,
+                    chunk_rows or settings.UPLOAD_CHUNK_ROWS,
+                    on_chunk=writer.append,
+                    on_restart=writer.reset,
+                )
+                metadata["dialect"] = dialect
+            else:
+                writer.append(DataImportService._parse_excel(file_path))
+            manifest = writer.commit()
+        except Exception:
+            writer.abort()
+            raise
+        dataset_store.invalidate(artifact_id)
+        
+        return {**metadata, **DataImportService.metadata_from_manifest(file_path, manifest)}
+    
+    @staticmethod
+    def append_file(
+        file_path: str,
+        rows_path: str,
+        artifact_id: str,
+        dialect: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Append the rows of a CSV file to a dataset's file and columnar artifact
+        
+        The new file must use the dataset's layout: same columns, delimiter,
+        decimal mark, encoding and header row. It is parsed into a temporary
+        artifact first, so rows that do not fit the schema are rejected
+        before anything is written. Its data lines are then appended to the
+        source file as they are and its parsed columns to the artifact, so
+        the existing rows are neither re-parsed nor rewritten.
+        
+        Args:
+            file_path: Dataset source file (CSV/TXT) to append to
+            rows_path: CSV file holding the new rows
+            artifact_id: Artifact of the dataset (see DatasetStore.artifact_key)
+            dialect: Dialect detected when the dataset was uploaded; sniffed
+                from the source file if not given
+            
+        Returns:
+            Metadata for the whole dataset (as from ingest_file) plus
+            appended_rows
+            
+        Raises:
+            ValueError: If the dataset is not CSV/TXT or the new rows do not
+                match its schema
+        """
+        from app.services.data.dataset_store import dataset_store
+        
+        if Path(file_path).suffix.lower() not in ['.csv', '.txt']:
+            raise ValueError("Rows can only be appended to CSV/TXT datasets")
+        dialect = dict(dialect or DataImportService.sniff_csv(file_path))
+        
+        part_id = f".append-{uuid.uuid4().hex}"
+        try:
+            part = DataImportService.ingest_file(rows_path, part_id, dialect=dialect)
+            if part["row_count"] == 0:
+                raise ValueError("The file holds no rows to append")
+            if part["dialect"]["encoding"] != dialect["encoding"]:
+                raise ValueError(f"New rows must use the dataset's encoding ({dialect['encoding']})")
+            dataset_store.check_append(artifact_id, part_id)
+            
+            DataImportService._append_lines(file_path, rows_path, skip_header=dialect["header"])
+            manifest = dataset_store.append(artifact_id, part_id, file_path)
+        except Exception:
+            dataset_store.delete(part_id)
+            raise
+        
+        metadata = {
+            "filename": os.path.basename(file_path),
+            "file_path": file_path,
+            "file_extension": Path(file_path).suffix.lower(),
+            "dialect": dialect,
+            "appended_rows": part["row_count"],
+        }
+        return {**metadata, **DataImportService.metadata_from_manifest(file_path, manifest)}
+    
+    @staticmethod
+    def _append_lines(file_path: str, rows_path: str, skip_header: bool) -> None:
+        """Copy the data lines of rows_path to the end of file_path, streaming"""
+        with open(rows_path, "rb") as src, open(file_path, "r+b") as dst:
+            if src.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+                src.seek(0)
+            if skip_header:
+                src.readline()
+            
+            dst.seek(0, os.SEEK_END)
+            if dst.tell() > 0:
+                dst.seek(-1, os.SEEK_END)
+                if dst.read(1) not in (b"\n", b"\r"):
+                    dst.write(b"\n")
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    
+    @staticmethod
+    def metadata_from_manifest(file_path: str, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build dataset metadata from a columnar artifact manifest
+        
+        Args:
+            file_path: Source file of the artifact
+            manifest: Manifest returned by the columnar writer
+            
+        Returns:
+            Metadata dict with the same keys as parse_file, plus column_stats
+        """
+        metadata = {
+            "filename": os.path.basename(file_path),
+            "file_path": file_path,
+            "file_extension": Path(file_path).suffix.lower(),
+        }
+        if manifest["row_count"] < 30:
+            metadata["warning"] = (
+                "The dataset contains too few data points to make a prediction. "
+                "It is recommended to have at least 50 data points, but preferably 100 data points. "
+                "This may lead to inaccurate predictions."
+            )
+        metadata.update({
+            "row_count": manifest["row_count"],
+            "column_count": len(manifest["columns"]),
+            "columns": [c["name"] for c in manifest["columns"]],
+            "column_stats": {c["name"]: c["stats"] for c in manifest["columns"]},
+        })
+        return metadata
+    
+    @staticmethod
+    def _read_csv_chunks(
+        file_path: str,
+        dialect: Dict[str, Any],
+        chunk_rows: int,
+        on_chunk: Callable[[pd.DataFrame], None],
+        on_restart: Callable[[], None],
+    ) -> str:
+        """
+        Read a CSV file chunk by chunk in a single pass using a sniffed dialect
+        
+        Uses pyarrow's streaming reader when pyarrow is installed and falls
+        back to pandas' C parser if pyarrow rejects the file (for example a
+        column whose type changes after the first block). Non-UTF-8 bytes past
+        the sniffed sample switch the encoding to latin1. In both cases
+        on_restart is called before reading starts over.
+        
+        Returns:
+            Name of the parser that read the file
+        """
+        if pa_csv is not None:
+            try:
+                DataImportService._read_csv_arrow(file_path, dialect, on_chunk)
+                return "pyarrow"
+            except (pa.ArrowException, ValueError, UnicodeDecodeError) as e:
+                print(f"pyarrow could not read {os.path.basename(file_path)}, using pandas: {e}")
+                on_restart()
+        
+        options = DataImportService._pandas_csv_options(dialect)
+        while True:
             try:
-                return pd.read_csv(file_path, delimiter=';')
+                with pd.read_csv(file_path, chunksize=chunk_rows, **options) as reader:
+                    for chunk in reader:
+                        on_chunk(chunk)
+                return "c"
             except UnicodeDecodeError:
-                return pd.read_csv(file_path, delimiter=';', encoding='latin1')
-        except UnicodeDecodeError:
-            # Try latin1 encoding
+                if options["encoding"] == "latin1":
+                    raise
+                dialect["encoding"] = options["encoding"] = "latin1"
+            on_restart()
+    
+    @staticmethod
+    def _read_csv_arrow(
+        file_path: str,
+        dialect: Dict[str, Any],
+        on_chunk: Callable[[pd.DataFrame], None],
+    ) -> None:
+        """Stream a CSV file through pyarrow, one record batch per chunk"""
+        encoding = "utf8" if dialect["encoding"] in ("utf-8", "utf-8-sig") else dialect["encoding"]
+        read_options = pa_csv.ReadOptions(
+            encoding=encoding,
+            block_size=ARROW_BLOCK_BYTES,
+            column_names=None if dialect["header"] else [str(i) for i in range(dialect["column_count"])],
+        )
+        parse_options = pa_csv.ParseOptions(delimiter=dialect["delimiter"])
+        convert_options = pa_csv.ConvertOptions(
+            decimal_point=dialect["decimal"],
+            strings_can_be_null=True,
+        )
+        with pa_csv.open_csv(file_path, read_options, parse_options, convert_options) as reader:
+            names = reader.schema.names
+            if len(set(names)) != len(names):
+                # pandas renames duplicates ("a", "a.1"); let it handle them
+                raise ValueError("Duplicate column names")
+            empty = True
+            for batch in reader:
+                empty = False
+                on_chunk(batch.to_pandas(date_as_object=False))
+            if empty:
+                on_chunk(reader.schema.empty_table().to_pandas(date_as_object=False))
+    
+    @staticmethod
+    def _pandas_csv_options(dialect: Dict[str, Any]) -> Dict[str, Any]:
+        """read_csv keyword arguments for a sniffed dialect"""
+        options = {
+            "sep": dialect["delimiter"],
+            "encoding": dialect["encoding"],
+            "decimal": dialect["decimal"],
+        }
+        if not dialect["header"]:
+            options["header"] = None
+            options["names"] = [str(i) for i in range(dialect["column_count"])]
+        return options
+    
+    @staticmethod
+    def _cell_kind(value: str, decimal: str) -> str:
+        """Classify a raw CSV field as empty, num, date or text"""
+        value = value.strip()
+        if value.lower() in NULL_TOKENS:
+            return "empty"
+        if re.match(NUMBER_PATTERN.format(dec=re.escape(decimal)), value):
+            return "num"
+        if guess_datetime_format(value) is not None:
+            return "date"
+        return "text"
+    
+    @staticmethod
+    def sniff_csv(file_path: str, sample_bytes: int = SNIFF_BYTES) -> Dict[str, Any]:
+        """
+        Detect how a CSV file is written from its first few KB
+        
+        Args:
+            file_path: Path to the CSV file
+            sample_bytes: Number of bytes to inspect
+            
+        Returns:
+            Dialect dict with encoding, delimiter, decimal, header (bool),
+            column_count and date_formats ({column: strftime format})
+        """
+        with open(file_path, "rb") as f:
+            raw = f.read(sample_bytes)
+            truncated = bool(f.read(1))
+        
+        # Encoding: BOM, then strict UTF-8 (allowing a character cut at the
+        # end of the sample), otherwise latin1 which accepts any byte
+        if raw.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8-sig"
+        else:
             try:
-                return pd.read_csv(file_path, encoding='latin1')
-            except pd.errors.ParserError:
-                return pd.read_csv(file_path, encoding='latin1', delimiter=';')
+                codecs.getincrementaldecoder("utf-8")().decode(raw, final=not truncated)
+                encoding = "utf-8"
+            except UnicodeDecodeError:
+                encoding = "latin1"
+        text = raw.decode(encoding, errors="ignore")
+        
+        # Delimiter: the candidate that splits the most rows into the same
+        # number (> 1) of fields
+        delimiter, best = ",", (0.0, 0)
+        for candidate in DELIMITER_CANDIDATES:
+            rows = list(csv.reader(io.StringIO(text), delimiter=candidate))
+            if truncated:
+                rows = rows[:-1]
+            counts = [len(r) for r in rows if any(field.strip() for field in r)][:SNIFF_ROWS]
+            if not counts:
+                continue
+            mode = max(set(counts), key=counts.count)
+            score = (counts.count(mode) / len(counts), mode)
+            if mode > 1 and score > best:
+                delimiter, best = candidate, score
+        
+        rows = list(csv.reader(io.StringIO(text), delimiter=delimiter))
+        if truncated:
+            rows = rows[:-1]
+        rows = [r for r in rows if any(field.strip() for field in r)][:SNIFF_ROWS]
+        column_count = max((len(r) for r in rows), default=0)
+        body = rows[1:]
+        
+        # Decimal separator: comma only when fields use it and never a dot
+        decimal = "."
+        if delimiter != ",":
+            cells = [field.strip() for r in body for field in r]
+            if any(re.match(r"^[+-]?\d+,\d+$", c) for c in cells) and \
+                    not any(re.match(r"^[+-]?\d+\.\d+$", c) for c in cells):
+                decimal = ","
+        
+        # Header: assumed unless the first row has the same kinds of values
+        # as the rows below it (and some of them are numbers or dates)
+        header = True
+        if rows and body:
+            first_kinds = [DataImportService._cell_kind(v, decimal) for v in rows[0]]
+            body_kinds = []
+            for j in range(len(rows[0])):
+                kinds = [DataImportService._cell_kind(r[j], decimal) for r in body if j < len(r)]
+                kinds = [k for k in kinds if k != "empty"]
+                body_kinds.append(max(set(kinds), key=kinds.count) if kinds else "empty")
+            if first_kinds == body_kinds and any(k in ("num", "date") for k in first_kinds):
+                header = False
+        
+        names = [name.strip() for name in rows[0]] if (rows and header) else [str(i) for i in range(column_count)]
+        data_rows = body if header else rows
+        
+        # Date columns: every sampled value is a date, and one format
+        # (month-first or day-first where ambiguous) parses all of them
+        date_formats = {}
+        for j, name in enumerate(names):
+            values = [r[j].strip() for r in data_rows if j < len(r)]
+            values = [v for v in values if v.lower() not in NULL_TOKENS]
+            if not values or any(DataImportService._cell_kind(v, decimal) != "date" for v in values):
+                continue
+            candidates = dict.fromkeys(
+                fmt for v in values[:2] for fmt in (guess_datetime_format(v), guess_datetime_format(v, dayfirst=True))
+                if fmt is not None
+            )
+            for fmt in candidates:
+                try:
+                    pd.to_datetime(pd.Series(values), format=fmt)
+                except (ValueError, TypeError):
+                    continue
+                date_formats[name] = fmt
+                break
+        
+        return {
+            "encoding": encoding,
+            "delimiter": delimiter,
+            "decimal": decimal,
+            "header": header,
+            "column_count": column_count,
+            "date_formats": date_formats,
+        }
+    
+    @staticmethod
+    def _parse_csv(file_path: str, dialect: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Parse CSV file in one pass using a sniffed dialect"""
+        options = DataImportService._pandas_csv_options(dialect or DataImportService.sniff_csv(file_path))
+        if pa_csv is not None:
+            try:
+                return pd.read_csv(file_path, engine="pyarrow", **options)
+            except Exception:
+                pass
+        return pd.read_csv(file_path, **options)
     
     @staticmethod
     def _parse_excel(file_path: str) -> pd.DataFrame:
@@ -92,6 +486,45 @@ class DataImportService:
             except Exception:
                 raise ValueError(f"Failed to parse Excel file: {file_path}")
     
+    @staticmethod
+    def validate_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate an ingested dataset from its metadata, without loading it
+        
+        Same checks as validate_dataframe, using the row count and null
+        counts collected by ingest_file.
+        
+        Returns:
+            Dict with validation results and warnings
+        """
+        validation = {
+            "is_valid": True,
+            "warnings": [],
+            "errors": [],
+        }
+        
+        # Check minimum data points
+        if metadata["row_count"] < 30:
+            validation["warnings"].append(
+                "Dataset contains fewer than 30 data points. "
+                "At least 50 data points are recommended for accurate predictions."
+            )
+        
+        # Check for missing values
+        column_stats = metadata.get("column_stats", {})
+        cols_with_missing = [name for name, stats in column_stats.items() if stats["null_count"] > 0]
+        if cols_with_missing:
+            validation["warnings"].append(
+                f"Found missing values in columns: {cols_with_missing}"
+            )
+        
+        # Check for empty dataframe
+        if metadata["row_count"] == 0 or metadata["column_count"] == 0:
+            validation["is_valid"] = False
+            validation["errors"].append("DataFrame is empty")
+        
+        return validation
+    
     @staticmethod
     def validate_dataframe(df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -0,0 +1,124 @@
+"""
+Panel (long-format) datasets
+
+A panel dataset holds many series in one file, one row per series and
+date (e.g. ``series_id, date, value``). The series column is detected at
+upload or set explicitly; the rows are then stored sorted by series and
+date with the row range of each series (see DatasetStore.build_panel), so
+endpoints can work on one series at a time.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.services.data.dataset_store import dataset_store
+
+# Column names that usually identify a series
+SERIES_NAME_PATTERN = re.compile(r"(^|_)(id|key|series|sku|item|store|product|symbol|ticker|code|group|unit)s?($|_)", re.I)
+
+
+class PanelService:
+    """Service for detecting and configuring panel datasets"""
+
+    @staticmethod
+    def default_date_column(column_stats: Dict[str, Dict[str, Any]]) -> Optional[str]:
+        """First column stored as dates, if any"""
+        return next(
+            (name for name, stats in column_stats.items() if stats["dtype"].startswith("datetime64")),
+            None,
+        )
+
+    @staticmethod
+    def _candidates(column_stats: Dict[str, Dict[str, Any]], date_column: str) -> List[str]:
+        """Columns that could identify series: text columns, and integer columns named like ids"""
+        text, integer = [], []
+        for name, stats in column_stats.items():
+            if name == date_column:
+                continue
+            if stats["dtype"].startswith("<U"):
+                text.append(name)
+            elif stats["dtype"].startswith("int") and SERIES_NAME_PATTERN.search(name):
+                integer.append(name)
+        # Columns named like ids first
+        text.sort(key=lambda name: not SERIES_NAME_PATTERN.search(name))
+        return text + integer
+
+    @staticmethod
+    def detect_series_column(df: pd.DataFrame, date_column: str, candidates: List[str]) -> Optional[str]:
+        """
+        Find the column that splits a long-format frame into series
+
+        A series column has between 2 and rows / 2 distinct values, and
+        together with the date column identifies (almost) every row, while
+        the dates alone repeat.
+
+        Args:
+            df: Frame with the date column and the candidate columns
+            date_column: Date column of the dataset
+            candidates: Columns to try, in order of preference
+
+        Returns:
+            Name of the first matching column, or None
+        """
+        rows = len(df)
+        date_codes, date_values = pd.factorize(df[date_column])
+        if rows < 4 or len(date_values) == rows:
+            return None
+
+        for name in candidates:
+            codes, values = pd.factorize(df[name])
+            if not 2 <= len(values) <= rows // 2:
+                continue
+            valid = (codes >= 0) & (date_codes >= 0)
+            pairs = codes[valid].astype(np.int64) * (len(date_values) + 1) + date_codes[valid]
+            if len(pd.unique(pairs)) >= 0.99 * valid.sum():
+                return name
+        return None
+
+    @staticmethod
+    def configure(
+        dataset,
+        series_column: Optional[str] = None,
+        date_column: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Set up the panel layout of a dataset
+
+        Args:
+            dataset: Dataset row (meta_data must hold column_stats)
+            series_column: Series id column; detected if not given
+            date_column: Date column; the first date column if not given
+
+        Returns:
+            Panel settings to store as meta_data["panel"] (series_column,
+            date_column, series_count, dropped_rows), or None if no series
+            column was given or detected
+
+        Raises:
+            ValueError: If the given columns cannot form a panel
+        """
+        column_stats = (dataset.meta_data or {}).get("column_stats", {})
+        date_column = date_column or PanelService.default_date_column(column_stats)
+        if date_column is None:
+            if series_column is not None:
+                raise ValueError("A panel dataset needs a date column")
+            return None
+
+        if series_column is None:
+            candidates = PanelService._candidates(column_stats, date_column)
+            if not candidates:
+                return None
+            df = dataset_store.load_frame(dataset, [date_column] + candidates)
+            series_column = PanelService.detect_series_column(df, date_column, candidates)
+            if series_column is None:
+                return None
+
+        panel = dataset_store.build_panel(dataset, series_column, date_column)
+        return {
+            "series_column": series_column,
+            "date_column": date_column,
+            "series_count": len(panel["series"]),
+            "dropped_rows": panel["dropped_rows"],
+        }
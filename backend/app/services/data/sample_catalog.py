@@ -0,0 +1,190 @@
+"""
+Sample dataset catalog
+
+Each sample CSV is ingested once into a columnar artifact. Its row count,
+column schema, date range and column statistics are kept in memory, so
+listing the samples does not touch the CSV files. An entry is rebuilt
+when its file's mtime or size changes. Loading a sample copies the
+catalog's artifact instead of parsing the CSV again.
+"""
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.core.config import settings
+from app.services.data.import_service import DataImportService
+from app.services.data.dataset_store import dataset_store
+
+# Descriptive text for the bundled samples; anything else found in the
+# samples directory is listed with a name derived from its file name
+SAMPLE_INFO = {
+    "air_passengers.csv": {
+        "name": "Air Passengers",
+        "description": "Monthly totals of international airline passengers (1949-1960)",
+        "frequency": "Monthly",
+    },
+    "co2_levels.csv": {
+        "name": "CO2 Levels",
+        "description": "Monthly atmospheric CO2 concentrations at Mauna Loa Observatory",
+        "frequency": "Monthly",
+    },
+    "sunspots.csv": {
+        "name": "Sunspots",
+        "description": "Monthly mean total sunspot numbers (1749-2023)",
+        "frequency": "Monthly",
+    },
+    "retail_sales.csv": {
+        "name": "Retail Sales",
+        "description": "Monthly retail sales in the US (1992-2023)",
+        "frequency": "Monthly",
+    },
+    "temperature.csv": {
+        "name": "Temperature",
+        "description": "Global average temperature anomalies (1880-2023)",
+        "frequency": "Monthly",
+    },
+    "stock_aapl.csv": {
+        "name": "Stock Price - AAPL",
+        "description": "Apple Inc. (AAPL) daily closing stock prices (2010-2023)",
+        "frequency": "Daily",
+    },
+    "electricity.csv": {
+        "name": "Electricity Consumption",
+        "description": "Monthly electricity consumption in a region (2000-2023)",
+        "frequency": "Monthly",
+    },
+    "gdp_growth.csv": {
+        "name": "GDP Growth",
+        "description": "Quarterly GDP growth rate (1960-2023)",
+        "frequency": "Quarterly",
+    },
+}
+
+# pandas offset prefixes -> frequency labels used across the API
+FREQUENCY_LABELS = {
+    "h": "Hourly", "H": "Hourly",
+    "D": "Daily", "B": "Daily",
+    "W": "Weekly",
+    "MS": "Monthly", "ME": "Monthly", "M": "Monthly",
+    "QS": "Quarterly", "QE": "Quarterly", "Q": "Quarterly",
+    "YS": "Yearly", "YE": "Yearly", "Y": "Yearly", "AS": "Yearly", "A": "Yearly",
+}
+
+
+def _infer_frequency(dates: pd.Series) -> str:
+    """Frequency label for a date column, or "Unknown" if irregular"""
+    index = pd.DatetimeIndex(dates.dropna())
+    if len(index) < 3:
+        return "Unknown"
+    try:
+        freq = pd.infer_freq(index)
+    except (TypeError, ValueError):
+        freq = None
+    if freq is None:
+        return "Unknown"
+    return FREQUENCY_LABELS.get(freq.split("-")[0].lstrip("0123456789"), "Unknown")
+
+
+class SampleCatalog:
+    """In-memory catalog of the sample datasets, invalidated by file mtime"""
+
+    def __init__(self, samples_dir: str):
+        self.samples_dir = samples_dir
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def artifact_id(filename: str) -> str:
+        """Dataset store id of a sample's columnar artifact"""
+        return f"sample-{Path(filename).stem}"
+
+    @staticmethod
+    def _build_entry(path: Path, stamp: Tuple[int, int]) -> Dict[str, Any]:
+        """Ingest a sample file and describe it"""
+        artifact_id = SampleCatalog.artifact_id(path.name)
+        metadata = DataImportService.ingest_file(str(path), artifact_id)
+        column_stats = metadata["column_stats"]
+
+        date_column = next(
+            (name for name, stats in column_stats.items() if stats["dtype"].startswith("datetime64")),
+            None,
+        )
+        info = SAMPLE_INFO.get(path.name)
+        if info is None:
+            frequency = "Unknown"
+            if date_column is not None:
+                ref = SimpleNamespace(id=artifact_id, file_path=str(path), meta_data=metadata)
+                frequency = _infer_frequency(dataset_store.load_frame(ref, [date_column])[date_column])
+            info = {
+                "name": path.stem.replace("_", " ").title(),
+                "description": "",
+                "frequency": frequency,
+            }
+
+        return {
+            "stamp": stamp,
+            "artifact_id": artifact_id,
+            "metadata": metadata,
+            "info": {
+                "filename": path.name,
+                "name": info["name"],
+                "description": info["description"],
+                "frequency": info["frequency"],
+                "rows": metadata["row_count"],
+                "columns": metadata["columns"],
+                "date_column": date_column,
+                "start_date": column_stats[date_column]["min"] if date_column else None,
+                "end_date": column_stats[date_column]["max"] if date_column else None,
+                "column_stats": column_stats,
+            },
+        }
+
+    def _refresh(self) -> None:
+        """Rebuild entries whose file changed and drop those whose file is gone"""
+        samples_dir = Path(self.samples_dir)
+        files = sorted(samples_dir.glob("*.csv")) if samples_dir.exists() else []
+
+        seen = set()
+        for path in files:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            stamp = (st.st_mtime_ns, st.st_size)
+            seen.add(path.name)
+            entry = self._entries.get(path.name)
+            if entry is not None and entry["stamp"] == stamp:
+                continue
+            try:
+                self._entries[path.name] = self._build_entry(path, stamp)
+            except Exception as e:
+                print(f"Warning: Could not catalog sample dataset {path.name}: {e}")
+                self._entries.pop(path.name, None)
+
+        for name in list(self._entries):
+            if name not in seen:
+                dataset_store.delete(self._entries.pop(name)["artifact_id"])
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Descriptions of all sample datasets, ordered by file name"""
+        with self._lock:
+            self._refresh()
+            return [self._entries[name]["info"] for name in sorted(self._entries)]
+
+    def get(self, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Catalog entry for one sample file
+
+        Returns:
+            Dict with artifact_id, metadata (as returned by ingest_file) and
+            info, or None if the sample does not exist
+        """
+        with self._lock:
+            self._refresh()
+            return self._entries.get(filename)
+
+
+sample_catalog = SampleCatalog(settings.SAMPLES_DIR)
@@ -0,0 +1,282 @@
+"""
+Series references for task payloads
+
+Sending a training series through the broker as a {date-string: value}
+dict bloats every message (a grid search sends it once per subtask) and
+makes each worker parse every date string again. Tasks take a small
+reference instead, resolved in the worker:
+
+- {"blob": key}: a series (and optional exogenous columns) written once
+  by the API as .npy files in a content-addressed directory of the local
+  artifact store; workers must share SERIES_ARTIFACT_DIR with the API.
+- {"dataset_id": ..., "version": ..., "date_column": ..., "target_column":
+  ..., "series_id": ..., "start": ..., "end": ...}: a slice of a dataset,
+  read from its columnar artifact (see dataset_store). The version pins
+  the data the reference was made for.
+
+Either way the values come memory-mapped, so resolving a reference costs a
+few file opens regardless of the series length.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.data.dataset_store import dataset_store
+
+META_NAME = "series.json"
+
+
+def _load(path: Path) -> np.ndarray:
+    # Plain ndarray view on the map, so pandas never sees np.memmap
+    return np.load(path, mmap_mode="r", allow_pickle=False).view(np.ndarray)
+
+
+class SeriesArtifactStore:
+    """Content-addressed series (with exogenous columns) as memory-mappable .npy files"""
+
+    def __init__(self, root: str, max_age_hours: float):
+        self.root = root
+        self.max_age_hours = max_age_hours
+
+    def path(self, key: str) -> Path:
+        """Directory holding one series"""
+        return Path(self.root) / key
+
+    @staticmethod
+    def _arrays(series: pd.Series, exog: Optional[pd.DataFrame]) -> Dict[str, np.ndarray]:
+        arrays = {
+            "index": np.ascontiguousarray(pd.DatetimeIndex(series.index).asi8),
+            "values": np.ascontiguousarray(series.to_numpy(dtype=float)),
+        }
+        if exog is not None:
+            for i, column in enumerate(exog.columns):
+                arrays[f"exog_{i}"] = np.ascontiguousarray(exog[column].to_numpy(dtype=float))
+        return arrays
+
+    def put(self, series: pd.Series, exog: Optional[pd.DataFrame] = None) -> str:
+        """
+        Write a series (and exogenous variables aligned with it)
+
+        Equal content maps to the same key, so writing a series again is a
+        no-op.
+
+        Args:
+            series: Series with a datetime index
+            exog: Exogenous variables, one row per observation
+
+        Returns:
+            Key of the stored series
+
+        Raises:
+            ValueError: If exog does not have one row per observation
+        """
+        if exog is not None and len(exog) != len(series):
+            raise ValueError(f"exog has {len(exog)} rows, the series {len(series)} observations")
+        arrays = self._arrays(series, exog)
+        meta = {
+            "name": None if series.name is None else str(series.name),
+            "exog_columns": None if exog is None else [str(c) for c in exog.columns],
+        }
+        digest = hashlib.sha256(json.dumps(meta).encode("utf-8"))
+        for name, values in arrays.items():
+            digest.update(name.encode("utf-8"))
+            digest.update(values.tobytes())
+        key = digest.hexdigest()
+
+        target = self.path(key)
+        if (target / META_NAME).exists():
+            os.utime(target / META_NAME)
+            return key
+
+        Path(self.root).mkdir(parents=True, exist_ok=True)
+        self.prune()
+        tmp = target.with_name(f".{key}.{uuid.uuid4().hex}.tmp")
+        tmp.mkdir()
+        try:
+            for name, values in arrays.items():
+                np.save(tmp / f"{name}.npy", values, allow_pickle=False)
+            (tmp / META_NAME).write_text(json.dumps(meta))
+            os.replace(tmp, target)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+            # Written concurrently by another request with the same series
+            if not (target / META_NAME).exists():
+                raise
+        return key
+
+    def load(self, key: str) -> Tuple[pd.Series, Optional[pd.DataFrame]]:
+        """
+        Open a stored series memory-mapped
+
+        Raises:
+            FileNotFoundError: If no series is stored under the key
+        """
+        base = self.path(key)
+        try:
+            meta = json.loads((base / META_NAME).read_text())
+        except OSError:
+            raise FileNotFoundError(f"Series artifact '{key}' not found")
+        os.utime(base / META_NAME)
+
+        index = pd.DatetimeIndex(_load(base / "index.npy").view("M8[ns]"))
+        series = pd.Series(_load(base / "values.npy"), index=index, name=meta["name"], copy=False)
+        exog = None
+        if meta["exog_columns"] is not None:
+            exog = pd.DataFrame(
+                {column: _load(base / f"exog_{i}.npy") for i, column in enumerate(meta["exog_columns"])},
+                index=index,
+                copy=False,
+            )
+        return series, exog
+
+    def prune(self) -> int:
+        """
+        Remove series not written or read for SERIES_ARTIFACT_MAX_AGE_HOURS
+
+        Returns:
+            Number of series removed
+        """
+        if not self.max_age_hours:
+            return 0
+        cutoff = time.time() - self.max_age_hours * 3600
+        removed = 0
+        try:
+            entries = list(Path(self.root).iterdir())
+        except OSError:
+            return 0
+        for entry in entries:
+            try:
+                if entry.name.startswith(".") or (entry / META_NAME).stat().st_mtime >= cutoff:
+                    continue
+            except OSError:
+                continue
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+        return removed
+
+
+series_artifacts = SeriesArtifactStore(
+    root=settings.SERIES_ARTIFACT_DIR,
+    max_age_hours=settings.SERIES_ARTIFACT_MAX_AGE_HOURS,
+)
+
+
+def dataset_series(
+    dataset,
+    date_column: str,
+    target_column: str,
+    series_id: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> pd.Series:
+    """
+    Load one series of a dataset, indexed by date
+
+    Args:
+        dataset: Dataset row
+        date_column: Date column
+        target_column: Value column
+        series_id: Series of a panel dataset
+        start, end: Inclusive date bounds of the slice
+
+    Returns:
+        Series without missing values, indexed and sorted by date
+
+    Raises:
+        ValueError: If a column is missing or the slice holds no values
+    """
+    df = dataset_store.load_series(dataset, [date_column, target_column], series_id)
+    for column in (date_column, target_column):
+        if column not in df.columns:
+            raise ValueError(f"Column '{column}' not found in dataset")
+
+    series = pd.Series(
+        pd.to_numeric(df[target_column], errors="coerce").to_numpy(dtype=float),
+        index=pd.DatetimeIndex(pd.to_datetime(df[date_column])),
+        name=target_column,
+    )
+    series = series[series.index.notna()].dropna()
+    if not series.index.is_monotonic_increasing:
+        series = series.sort_index(kind="stable")
+    if start is not None:
+        series = series[series.index >= pd.Timestamp(start)]
+    if end is not None:
+        series = series[series.index <= pd.Timestamp(end)]
+    if len(series) == 0:
+        raise ValueError("No valid data points found in the selected series")
+    return series
+
+
+def dataset_ref(
+    dataset,
+    date_column: str,
+    target_column: str,
+    series_id: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Reference to a slice of a dataset at its current version"""
+    length = dataset.row_count
+    panel = dataset_store.panel_config(dataset)
+    if panel and series_id is not None and panel.get("series_count"):
+        length = -(-length // panel["series_count"])
+    return {
+        "dataset_id": dataset.id,
+        "version": dataset.version,
+        "date_column": date_column,
+        "target_column": target_column,
+        "series_id": series_id,
+        "start": start,
+        "end": end,
+        "length": length,  # Rows, at most; for cost estimates (see app.tasks.routing)
+    }
+
+
+def blob_ref(series: pd.Series, exog: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+    """Reference to a series written to the local artifact store"""
+    return {"blob": series_artifacts.put(series, exog), "length": len(series)}
+
+
+def resolve_series_ref(ref: Dict[str, Any]) -> Tuple[pd.Series, Optional[pd.DataFrame]]:
+    """
+    Load the series (and exogenous variables) a reference points to
+
+    Raises:
+        FileNotFoundError: If the blob or dataset no longer exists
+        ValueError: If the dataset changed since the reference was made, or
+            the reference is malformed
+    """
+    if "blob" in ref:
+        return series_artifacts.load(ref["blob"])
+    if "dataset_id" not in ref:
+        raise ValueError("Series reference needs 'blob' or 'dataset_id'")
+
+    from app.core.database import SessionLocal
+    from app.models.dataset import Dataset
+
+    db = SessionLocal()
+    try:
+        dataset = db.query(Dataset).filter(Dataset.id == ref["dataset_id"]).first()
+    finally:
+        db.close()
+    if dataset is None:
+        raise FileNotFoundError(f"Dataset '{ref['dataset_id']}' not found")
+    if ref.get("version") is not None and dataset.version != ref["version"]:
+        raise ValueError(
+            f"Dataset '{dataset.id}' is at version {dataset.version}, "
+            f"the task was created for version {ref['version']}"
+        )
+    series = dataset_series(
+        dataset, ref["date_column"], ref["target_column"],
+        ref.get("series_id"), ref.get("start"), ref.get("end"),
+    )
+    return series, None
@@ -0,0 +1,188 @@
+"""
+Forecast result cache
+
+A forecast is a pure function of the fitted model and the request inputs,
+so results are memoized on (model id, model version, transformation,
+last date, frequency). Each entry keeps the longest horizon computed so
+far; shorter requests are served by slicing it, longer ones recompute and
+replace it. Entries live in-process and, when enabled, in Redis so they are
+shared between API workers.
+"""
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+def slice_forecast(result: Dict[str, Any], periods: int) -> Dict[str, Any]:
+    """Return the first `periods` steps of a generate_forecast result"""
+    forecasts = result["forecasts"]
+    intervals = result["confidence_intervals"]
+    return {
+        "forecasts": {
+            "dates": forecasts["dates"][:periods],
+            "values": forecasts["values"][:periods],
+        },
+        "confidence_intervals": {
+            "dates": intervals["dates"][:periods],
+            "lower": intervals["lower"][:periods],
+            "upper": intervals["upper"][:periods],
+        },
+    }
+
+
+class ForecastCache:
+    """Memoize forecast results per model and request inputs"""
+
+    KEY_PREFIX = "timelab:forecast"
+
+    def __init__(self, max_entries: int, redis_url: Optional[str] = None, ttl: int = 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_url = redis_url
+        self.hits = 0
+        self.misses = 0
+
+    def _redis_client(self):
+        """Connect lazily; Redis stays optional and failures fall back to in-process only"""
+        if self._redis is None and self._redis_url:
+            try:
+                import redis
+                client = redis.Redis.from_url(self._redis_url, socket_timeout=0.5)
+                client.ping()
+                self._redis = client
+            except Exception as e:
+                print(f"Warning: Forecast cache Redis unavailable, using in-process cache only: {e}")
+                self._redis_url = None
+        return self._redis
+
+    @staticmethod
+    def make_key(
+        model_id: str,
+        version: Optional[str],
+        transformation_type: Optional[str],
+        last_date: Optional[str],
+        frequency: Optional[str],
+        series_id: Optional[str] = None,
+        data_version: Optional[int] = None,
+    ) -> Tuple:
+        """
+        Cache key for everything that determines a forecast except its horizon
+
+        series_id and data_version identify the panel series (and dataset
+        version) the model is applied to, if not its own training data.
+        """
+        return (
+            model_id,
+            version or "",
+            (transformation_type or "none").lower(),
+            last_date or "",
+            (frequency or "").lower(),
+            "" if series_id is None else str(series_id),
+            data_version or 0,
+        )
+
+    def _redis_key(self, key: Tuple) -> str:
+        return f"{self.KEY_PREFIX}:{key[0]}:" + json.dumps(list(key[1:]))
+
+    def _lookup(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                raw = client.get(self._redis_key(key))
+            except Exception:
+                raw = None
+            if raw is not None:
+                entry = json.loads(raw)
+                self._store_local(key, entry)
+                return entry
+        return None
+
+    def _store_local(self, key: Tuple, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _store(self, key: Tuple, entry: Dict[str, Any]) -> None:
+        self._store_local(key, entry)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(self._redis_key(key), json.dumps(entry), ex=self.ttl)
+            except Exception:
+                pass
+
+    def get_or_compute(
+        self,
+        key: Tuple,
+        periods: int,
+        compute: Callable[[int], Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Return the forecast for `periods` steps
+
+        Args:
+            key: Cache key from make_key
+            periods: Requested horizon
+            compute: Function generating the forecast for a given horizon
+
+        Returns:
+            Forecast result, sliced from a longer cached horizon when possible
+        """
+        entry = self._lookup(key)
+        if entry is not None and entry["periods"] >= periods:
+            self.hits += 1
+            return slice_forecast(entry["result"], periods)
+
+        self.misses += 1
+        result = compute(periods)
+        self._store(key, {"periods": periods, "result": result})
+        return result
+
+    def invalidate(self, model_id: str) -> None:
+        """Drop every cached forecast for a model"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == model_id]:
+                del self._entries[key]
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                keys = list(client.scan_iter(match=f"{self.KEY_PREFIX}:{model_id}:*"))
+                if keys:
+                    client.delete(*keys)
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "redis": self._redis is not None,
+            }
+
+
+forecast_cache = ForecastCache(
+    max_entries=settings.FORECAST_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL if settings.FORECAST_CACHE_USE_REDIS else None,
+    ttl=settings.FORECAST_CACHE_TTL,
+)
@@ -127,14 +127,13 @@ class ForecastService:
                     forecasts = np.expm1(forecasts)
                     confidence_interval = np.expm1(confidence_interval)
             else:
-                # SARIMAX model - use standard forecast method
+                # SARIMAX model - one get_forecast call gives both the mean and the intervals
+                forecast_obj = model.get_forecast(periods, exog=exog_variables)
                 if is_log_transform:
-                    forecasts = np.expm1(model.forecast(periods, exog=exog_variables))
-                    forecast_obj = model.get_forecast(periods, exog=exog_variables)
+                    forecasts = np.expm1(forecast_obj.predicted_mean)
                     confidence_interval = np.expm1(forecast_obj.conf_int())
                 else:
-                    forecasts = model.forecast(periods, exog=exog_variables)
-                    forecast_obj = model.get_forecast(periods, exog=exog_variables)
+                    forecasts = forecast_obj.predicted_mean
                     confidence_interval = forecast_obj.conf_int()
         except Exception as e:
             raise ValueError(f"Failed to generate forecast: {str(e)}")
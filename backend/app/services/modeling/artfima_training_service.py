@@ -30,6 +30,7 @@ if artfima_path and str(artfima_path) not in sys.path:
 
 try:
     from artfima_python import artfima as artfima_fit
+    from artfima_python.serialization import isCompactResult, resultToBytes, resultFromBytes
 except ImportError as e:
     raise ImportError(
         f"Failed to import ARTFIMA package. Tried paths: {[str(p) for p in possible_paths]}. "
@@ -304,13 +305,34 @@ class ARTFIMATrainingService:
     
     @staticmethod
     def _serialize_model(model) -> str:
-        """Serialize ARTFIMA model result to base64 string"""
-        pickled = pickle.dumps(model)
-        return base64.b64encode(pickled).decode('utf-8')
+        """
+        Serialize ARTFIMA model result to base64 string
+
+        Uses the compact, versioned artfima_python format: parameters, fit
+        metadata and the arrays needed for forecasting only.
+        """
+        return base64.b64encode(resultToBytes(model)).decode('utf-8')
+    
+    @staticmethod
+    def is_compact_payload(payload: bytes) -> bool:
+        """Check whether decoded model data uses the compact ARTFIMA format"""
+        return isCompactResult(payload)
+    
+    @staticmethod
+    def load_model(payload: bytes):
+        """
+        Load an ARTFIMA model from decoded model data
+
+        Compact payloads are loaded without copying array data; anything
+        else is treated as a legacy pickled ARTFIMAResult.
+        """
+        if isCompactResult(payload):
+            return resultFromBytes(payload)
+        return pickle.loads(payload)
     
     @staticmethod
     def deserialize_model(model_data: str):
         """Deserialize ARTFIMA model from base64 string"""
-        pickled = base64.b64decode(model_data.encode('utf-8'))
-        return pickle.loads(pickled)
+        payload = base64.b64decode(model_data.encode('utf-8'))
+        return ARTFIMATrainingService.load_model(payload)
 
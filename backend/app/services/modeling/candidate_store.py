@@ -0,0 +1,146 @@
+"""
+Store of fitted grid search candidates
+
+A SARIMAX fit depends only on the data, the orders and the exogenous
+variables, so its information criteria can be reused by any later search
+over the same series. Results are keyed by (data content hash,
+transformation, order, seasonal order, exog signature) and written as soon
+as each candidate is fitted: a repeated or overlapping search only fits
+the orders it has not seen, and a search interrupted by a dying worker
+picks up where it stopped when it is run again.
+
+Only full fits are stored; screening fits of two-phase searches stop
+early and are not comparable.
+"""
+import hashlib
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.exc import IntegrityError
+
+from app.core.database import SessionLocal
+from app.models.grid_search import CandidateFit
+
+Order = Tuple[int, int, int, int, int, int, int]
+
+RESULT_FIELDS = ("aic", "bic", "hqic", "fit_seconds", "converged", "iterations", "error")
+
+
+def _hash_index(index: pd.Index, digest) -> None:
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(np.asarray(index).astype(str).astype("U").tobytes())
+
+
+def fingerprint_series(series: pd.Series) -> str:
+    """Content hash of a series: its values and index"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype=float)).tobytes())
+    _hash_index(series.index, digest)
+    return digest.hexdigest()
+
+
+def fingerprint_exog(exog: Optional[pd.DataFrame]) -> Optional[str]:
+    """Content hash of exogenous variables (column names, values and index), None without any"""
+    if exog is None:
+        return None
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in exog.columns]).encode("utf-8"))
+    digest.update(np.ascontiguousarray(exog.to_numpy(dtype=float)).tobytes())
+    _hash_index(exog.index, digest)
+    return digest.hexdigest()
+
+
+class CandidateFitStore:
+    """Fitted candidates of one training series (and exog) in the candidate_fits table"""
+
+    def __init__(
+        self,
+        data_hash: str,
+        transformation: Optional[str] = None,
+        exog_signature: Optional[str] = None,
+        session_factory: Callable = SessionLocal,
+    ):
+        self.data_hash = data_hash
+        self.transformation = transformation
+        self.exog_signature = exog_signature
+        self.session_factory = session_factory
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_data(
+        cls,
+        train_data: pd.Series,
+        exog: Optional[pd.DataFrame] = None,
+        transformation: Optional[str] = None,
+    ) -> "CandidateFitStore":
+        """Store for the fits of a training series"""
+        return cls(fingerprint_series(train_data), transformation, fingerprint_exog(exog))
+
+    def key(self, order: Order) -> str:
+        """Key of a candidate: hash of data, transformation, orders and exog"""
+        order = [int(v) for v in order]
+        payload = json.dumps(
+            [self.data_hash, self.transformation, order[:3], order[3:], self.exog_signature]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, orders: List[Order]) -> Dict[Tuple[int, ...], Dict[str, Any]]:
+        """
+        Stored results of the given orders
+
+        Returns:
+            Results (as returned by GridSearchService.fit_candidate, with
+            cached=True) by order tuple; orders never fitted are absent
+        """
+        if not orders:
+            return {}
+        keys = {self.key(order): tuple(int(v) for v in order) for order in orders}
+        db = self.session_factory()
+        try:
+            rows = db.query(CandidateFit).filter(CandidateFit.key.in_(list(keys))).all()
+        finally:
+            db.close()
+
+        found = {}
+        for row in rows:
+            order = keys[row.key]
+            found[order] = {
+                "order": list(order),
+                **{field: getattr(row, field) for field in RESULT_FIELDS},
+                "cached": True,
+            }
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, order: Order) -> Optional[Dict[str, Any]]:
+        """Stored result of one order, or None"""
+        return self.get_many([order]).get(tuple(int(v) for v in order))
+
+    def put(self, order: Order, result: Dict[str, Any]) -> None:
+        """Store the result of a fit; an order already stored (e.g. by a concurrent search) is kept"""
+        order = [int(v) for v in order]
+        db = self.session_factory()
+        try:
+            db.add(CandidateFit(
+                key=self.key(order),
+                data_hash=self.data_hash,
+                transformation=self.transformation,
+                order=order[:3],
+                seasonal_order=order[3:],
+                exog_signature=self.exog_signature,
+                **{field: result.get(field) for field in RESULT_FIELDS},
+            ))
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+        except Exception as e:
+            db.rollback()
+            print(f"Warning: Could not store candidate fit {order}: {e}")
+        finally:
+            db.close()
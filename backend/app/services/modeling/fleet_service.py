@@ -0,0 +1,491 @@
+"""
+Fleet training: one model spec fitted across many series
+
+Fits the same SARIMAX or ARTFIMA spec to every target column of a dataset,
+or to every series of a panel dataset. The data is read once from the
+columnar artifact, the fits run in a process pool a chunk of series at a
+time, and each finished chunk is written to the database in one commit.
+Only a bounded number of chunks is queued at once, so memory stays flat
+however many series the fleet has.
+
+Runs execute in a background thread of the API process that started them.
+Their progress and per-series outcomes are stored in the fleet_runs and
+fleet_run_results tables as each chunk finishes, so any API worker can
+report them. The running process refreshes the run's heartbeat; a run
+whose heartbeat stops (the process was restarted or died) is reported as
+failed, with the outcomes stored until then.
+"""
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.dataset import Dataset
+from app.models.fleet import FleetRun, FleetRunResult
+from app.models.model import Model, ModelMetrics
+from app.services.data.dataset_store import dataset_store
+
+
+def _fit_chunk(
+    model_type: str,
+    parameters: Dict[str, Any],
+    items: List[Tuple[int, np.ndarray, np.ndarray]],
+) -> List[Dict[str, Any]]:
+    """
+    Fit one chunk of series (runs in a worker process)
+
+    Args:
+        model_type: "SARIMAX" or "ARTFIMA"
+        parameters: Model parameters, as passed to TrainingService.train_model
+        items: (position, dates, values) per series
+
+    Returns:
+        One dict per series with position and either the training result
+        (model_data, summary, metrics, parameters, nobs, end_date) or error
+    """
+    from app.services.modeling.training_service import TrainingService
+
+    outcomes = []
+    for position, dates, values in items:
+        started = time.perf_counter()
+        try:
+            Y = pd.Series(values, index=pd.DatetimeIndex(dates))
+            if len(Y) == 0:
+                raise ValueError("No valid data points")
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                result = TrainingService.train_model(Y=Y, model_type=model_type, parameters=parameters)
+            outcomes.append({
+                "position": position,
+                "model_data": result["model_data"],
+                "summary": result["summary"],
+                "metrics": result["metrics"],
+                "parameters": result["parameters"],
+                "nobs": int(len(Y)),
+                "end_date": Y.index.max().isoformat(),
+                "fit_seconds": time.perf_counter() - started,
+            })
+        except Exception as e:
+            outcomes.append({"position": position, "error": str(e)})
+    return outcomes
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps read back from SQLite are naive UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+class FleetTrainingService:
+    """Service for training one model spec across many series"""
+
+    @staticmethod
+    def resolve_targets(
+        dataset,
+        date_column: str,
+        target_columns: Optional[List[str]] = None,
+        target_column: Optional[str] = None,
+        series_ids: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        List the series a fleet run trains on
+
+        Either several target columns of a single-series dataset, or one
+        target column across series of a panel dataset (all series when
+        series_ids is not given).
+
+        Args:
+            dataset: Dataset row
+            date_column: Date column
+            target_columns: Columns to train on, one model each
+            target_column: Value column of a panel dataset
+            series_ids: Panel series to train on
+
+        Returns:
+            One dict per series with target_column and series_id
+
+        Raises:
+            ValueError: If the columns or series do not fit the dataset
+        """
+        columns = set(dataset_store.column_names(dataset))
+        if date_column not in columns:
+            raise ValueError(f"Date column '{date_column}' not found in dataset")
+
+        panel = dataset_store.panel_config(dataset)
+        if panel:
+            if target_columns:
+                raise ValueError("Panel datasets are trained per series: pass target_column and series_ids")
+            if not target_column:
+                raise ValueError("target_column is required for panel datasets")
+            if target_column not in columns:
+                raise ValueError(f"Target column '{target_column}' not found in dataset")
+            known = [s["series_id"] for s in dataset_store.panel_series(dataset)]
+            if series_ids is None:
+                series_ids = known
+            else:
+                missing = sorted(set(map(str, series_ids)) - set(known))
+                if missing:
+                    shown = ", ".join(f"'{s}'" for s in missing[:5])
+                    raise ValueError(f"Series not found in column '{panel['series_column']}': {shown}")
+            targets = [{"target_column": target_column, "series_id": str(s)} for s in dict.fromkeys(series_ids)]
+        else:
+            if series_ids:
+                raise ValueError("Dataset is not a panel dataset; series_ids is not supported")
+            target_columns = target_columns or ([target_column] if target_column else [])
+            missing = [c for c in target_columns if c not in columns]
+            if missing:
+                raise ValueError(f"Target columns not found in dataset: {', '.join(missing)}")
+            targets = [{"target_column": c, "series_id": None} for c in dict.fromkeys(target_columns)]
+
+        if not targets:
+            raise ValueError("No series to train")
+        return targets
+
+    @staticmethod
+    def _iter_series(dataset, date_column: str, targets: List[Dict[str, Any]]) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Yield (position, dates, values) per target, without missing values
+
+        Column targets share one frame loaded up front; panel series are
+        sliced one at a time from the memory-mapped panel layout.
+        """
+        frame = None
+        if not dataset_store.panel_config(dataset):
+            frame = dataset_store.load_frame(dataset, [date_column] + [t["target_column"] for t in targets])
+            frame[date_column] = pd.to_datetime(frame[date_column])
+
+        for position, target in enumerate(targets):
+            if frame is None:
+                df = dataset_store.load_series(dataset, [date_column, target["target_column"]], target["series_id"])
+                dates = pd.to_datetime(df[date_column]).to_numpy()
+                values = pd.to_numeric(df[target["target_column"]], errors="coerce").to_numpy(dtype=float)
+            else:
+                dates = frame[date_column].to_numpy()
+                values = pd.to_numeric(frame[target["target_column"]], errors="coerce").to_numpy(dtype=float)
+            valid = ~np.isnan(values) & ~np.isnat(dates)
+            yield position, dates[valid], values[valid]
+
+    @staticmethod
+    def _model_row(model_type: str, parameters: Dict[str, Any], fit: Dict[str, Any], label: str) -> Model:
+        """Model row (with metrics) for one fitted series, named like /models/train names them"""
+        if model_type.upper() == "ARTFIMA":
+            estimated = fit["parameters"]
+            d = estimated.get("d", parameters["d"])
+            model = Model(
+                name=f"{parameters['glp']}({parameters['p']},{d:.3f},{parameters['q']}) - {label}",
+                type=parameters["glp"],
+                parameters={
+                    "p": parameters["p"],
+                    "d": d,
+                    "q": parameters["q"],
+                    "glp": parameters["glp"],
+                    "lambda": estimated.get("lambda", parameters.get("lambda")),
+                },
+            )
+        else:
+            p = parameters
+            model = Model(
+                name=f"SARIMAX({p['p']},{p['d']},{p['q']})x({p['P']},{p['D']},{p['Q']},{p['s']}) - {label}",
+                type="SARIMAX",
+                parameters=dict(parameters),
+            )
+        model.id = str(uuid.uuid4())
+        model.model_data = fit["model_data"]
+        model.summary = fit["summary"]
+        model.metrics = ModelMetrics(
+            aic=fit["metrics"].get("aic"),
+            bic=fit["metrics"].get("bic"),
+            hqic=fit["metrics"].get("hqic"),
+        )
+        return model
+
+    @staticmethod
+    def train(
+        db,
+        dataset,
+        date_column: str,
+        targets: List[Dict[str, Any]],
+        model_type: str,
+        parameters: Dict[str, Any],
+        project_id: Optional[str] = None,
+        on_outcomes: Optional[Callable[[List[Tuple[int, Dict[str, Any]]]], None]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fit a model spec to every target and save the models
+
+        Args:
+            db: Database session
+            dataset: Dataset row
+            date_column: Date column
+            targets: Series to train on (see resolve_targets)
+            model_type: "SARIMAX" or "ARTFIMA"
+            parameters: Model parameters, as passed to TrainingService.train_model
+            project_id: Project to attach the models to
+            on_outcomes: Called with the (position, outcome) pairs of each
+                finished chunk, once its models are saved
+
+        Returns:
+            One outcome per target, in target order: status ("trained" or
+            "failed") with model_id, metrics and nobs, or error
+        """
+        outcomes: List[Optional[Dict[str, Any]]] = [None] * len(targets)
+        chunk_size = max(1, settings.FLEET_CHUNK_SIZE)
+        chunk_count = -(-len(targets) // chunk_size)
+        workers = min(settings.FLEET_MAX_WORKERS or os.cpu_count() or 1, chunk_count)
+        max_pending = workers * max(1, settings.FLEET_MAX_PENDING_CHUNKS)
+
+        def save(fits: List[Dict[str, Any]]) -> None:
+            rows = []
+            for fit in fits:
+                position = fit["position"]
+                target = targets[position]
+                if "error" in fit:
+                    outcomes[position] = {"status": "failed", "error": fit["error"]}
+                    continue
+                model = FleetTrainingService._model_row(
+                    model_type, parameters, fit, target["series_id"] or target["target_column"]
+                )
+                model.project_id = project_id
+                model.dataset_id = dataset.id
+                model.dataset_version = dataset.version
+                model.data_source = {
+                    "date_column": date_column,
+                    "target_column": target["target_column"],
+                    "series_id": target["series_id"],
+                    "end_date": fit["end_date"],
+                }
+                rows.append(model)
+                outcomes[position] = {
+                    "status": "trained",
+                    "model_id": model.id,
+                    "name": model.name,
+                    "metrics": fit["metrics"],
+                    "nobs": fit["nobs"],
+                    "fit_seconds": round(fit["fit_seconds"], 3),
+                }
+            if rows:
+                try:
+                    db.add_all(rows)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    print(f"Warning: Could not save fleet models: {e}")
+                    for fit in fits:
+                        if "error" not in fit:
+                            outcomes[fit["position"]] = {"status": "failed", "error": f"Could not save model: {e}"}
+            if on_outcomes:
+                on_outcomes([(fit["position"], outcomes[fit["position"]]) for fit in fits])
+
+        series = FleetTrainingService._iter_series(dataset, date_column, targets)
+
+        def next_chunk() -> List[Tuple[int, np.ndarray, np.ndarray]]:
+            chunk = []
+            for item in series:
+                chunk.append(item)
+                if len(chunk) == chunk_size:
+                    break
+            return chunk
+
+        # Spawned workers do not inherit the server's threads, locks or open connections
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            pending: Dict[Future, List[int]] = {}
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < max_pending:
+                    chunk = next_chunk()
+                    if not chunk:
+                        exhausted = True
+                        break
+                    future = pool.submit(_fit_chunk, model_type, parameters, chunk)
+                    pending[future] = [position for position, _, _ in chunk]
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    positions = pending.pop(future)
+                    try:
+                        fits = future.result()
+                    except Exception as e:
+                        # The worker died (e.g. out of memory); fail its series only
+                        fits = [{"position": position, "error": f"Worker failed: {e}"} for position in positions]
+                    save(fits)
+
+        return outcomes
+
+    @staticmethod
+    def start(
+        db,
+        dataset,
+        date_column: str,
+        targets: List[Dict[str, Any]],
+        model_type: str,
+        parameters: Dict[str, Any],
+        project_id: Optional[str] = None,
+    ) -> FleetRun:
+        """
+        Store a fleet run and start it in a background thread
+
+        Returns:
+            The stored run
+        """
+        run = FleetRun(
+            dataset_id=dataset.id,
+            model_type=model_type,
+            status="pending",
+            targets=targets,
+            total=len(targets),
+            trained=0,
+            failed=0,
+            heartbeat_at=_now(),
+        )
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        run_id, dataset_id = run.id, dataset.id
+
+        def heartbeat(stop: threading.Event):
+            while not stop.wait(settings.FLEET_HEARTBEAT_SECONDS):
+                beat_db = SessionLocal()
+                try:
+                    beat_db.query(FleetRun).filter(FleetRun.id == run_id).update(
+                        {"heartbeat_at": _now()}, synchronize_session=False
+                    )
+                    beat_db.commit()
+                except Exception as e:
+                    print(f"Warning: Could not record fleet run {run_id} heartbeat: {e}")
+                finally:
+                    beat_db.close()
+
+        def execute():
+            stop = threading.Event()
+            threading.Thread(target=heartbeat, args=(stop,), name=f"fleet-{run_id}-heartbeat", daemon=True).start()
+            db = SessionLocal()
+            try:
+                row = db.query(FleetRun).filter(FleetRun.id == run_id).first()
+                row.status = "running"
+                db.commit()
+
+                def record(outcomes: List[Tuple[int, Dict[str, Any]]]) -> None:
+                    for position, outcome in outcomes:
+                        db.add(FleetRunResult(
+                            run_id=run_id,
+                            position=position,
+                            target_column=targets[position]["target_column"],
+                            series_id=targets[position]["series_id"],
+                            status=outcome["status"],
+                            model_id=outcome.get("model_id"),
+                            name=outcome.get("name"),
+                            metrics=outcome.get("metrics"),
+                            nobs=outcome.get("nobs"),
+                            fit_seconds=outcome.get("fit_seconds"),
+                            error=outcome.get("error"),
+                        ))
+                        if outcome["status"] == "trained":
+                            row.trained += 1
+                        else:
+                            row.failed += 1
+                    db.commit()
+
+                dataset_row = db.query(Dataset).filter(Dataset.id == dataset_id).first()
+                if dataset_row is None:
+                    raise ValueError("Dataset not found")
+                FleetTrainingService.train(
+                    db, dataset_row, date_column, targets, model_type, parameters, project_id, on_outcomes=record
+                )
+                FleetTrainingService._finish(db, run_id, "completed")
+            except Exception as e:
+                print(f"Warning: Fleet run {run_id} failed: {e}")
+                db.rollback()
+                FleetTrainingService._finish(db, run_id, "failed", str(e))
+            finally:
+                stop.set()
+                db.close()
+
+        threading.Thread(target=execute, name=f"fleet-{run_id}", daemon=True).start()
+        return run
+
+    @staticmethod
+    def _finish(db, run_id: str, status: str, error: Optional[str] = None) -> None:
+        try:
+            db.query(FleetRun).filter(FleetRun.id == run_id).update(
+                {"status": status, "error": error, "finished_at": _now()}, synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            print(f"Warning: Could not record fleet run {run_id} outcome: {e}")
+
+    @staticmethod
+    def status(db, fleet_id: str, include_results: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Status of a fleet run, with the outcomes of finished series
+
+        A pending or running run whose heartbeat is more than four
+        FLEET_HEARTBEAT_SECONDS old lost the process running it; it is
+        marked failed, keeping the outcomes stored so far.
+
+        Returns:
+            Dict with fleet_id, dataset_id, model_type, status, total, done,
+            trained, failed, elapsed_seconds, error and (optionally)
+            results, or None if the run does not exist
+        """
+        run = db.query(FleetRun).filter(FleetRun.id == fleet_id).first()
+        if run is None:
+            return None
+
+        heartbeat = _aware(run.heartbeat_at)
+        if (
+            run.status in ("pending", "running")
+            and heartbeat is not None
+            and (_now() - heartbeat).total_seconds() > 4 * settings.FLEET_HEARTBEAT_SECONDS
+        ):
+            run.status = "failed"
+            run.error = "Fleet run interrupted: the server running it stopped"
+            run.finished_at = heartbeat
+            db.commit()
+            db.refresh(run)
+
+        started = _aware(run.created_at)
+        until = _aware(run.finished_at) or _now()
+        snapshot = {
+            "fleet_id": run.id,
+            "dataset_id": run.dataset_id,
+            "model_type": run.model_type,
+            "status": run.status,
+            "total": run.total,
+            "done": run.trained + run.failed,
+            "trained": run.trained,
+            "failed": run.failed,
+            "elapsed_seconds": round(max((until - started).total_seconds(), 0.0), 3) if started else None,
+            "error": run.error,
+        }
+        if include_results:
+            snapshot["results"] = [
+                {
+                    "target_column": r.target_column,
+                    "series_id": r.series_id,
+                    "status": r.status,
+                    "model_id": r.model_id,
+                    "name": r.name,
+                    "metrics": r.metrics,
+                    "nobs": r.nobs,
+                    "fit_seconds": r.fit_seconds,
+                    "error": r.error,
+                }
+                for r in run.results
+            ]
+        return snapshot
@@ -1,15 +1,285 @@
 """
 Grid search service - adapted from arauto/lib/grid_search_arima.py
 """
+import multiprocessing
+import os
+import time
+import warnings
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
 import numpy as np
 import pandas as pd
 import statsmodels.api as sm
-from typing import Optional, Tuple, List
+
+from app.core.config import settings
+
+Order = Tuple[int, int, int, int, int, int, int]
+
+
+class SearchCancelled(Exception):
+    """Raised from an on_result callback to stop a search"""
+
+
+def _fit_candidates(
+    train_data: pd.Series,
+    exog: Optional[pd.DataFrame],
+    candidates: List[Dict[str, Any]],
+    options: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Fit candidates ({position, order, start_params}) in turn (runs in a worker process)"""
+    return [
+        {
+            "position": candidate["position"],
+            **GridSearchService.fit_candidate(
+                train_data, exog, tuple(candidate["order"]),
+                start_params=candidate.get("start_params"),
+                **options,
+            ),
+        }
+        for candidate in candidates
+    ]
+
+
+class _CandidatePool:
+    """
+    Fits batches of candidates, in a process pool when one can be used
+
+    The pool is started once and reused for every batch of a search.
+    Daemonic processes (Celery prefork workers) cannot start one, so there
+    the candidates are fitted in turn.
+    """
+
+    def __init__(self, train_data: pd.Series, exog: Optional[pd.DataFrame], max_workers: Optional[int], size: int):
+        self.train_data = train_data
+        self.exog = exog
+        if max_workers is None:
+            max_workers = settings.GRID_SEARCH_MAX_WORKERS
+        self.workers = min(max_workers or os.cpu_count() or 1, max(size, 1))
+        if multiprocessing.current_process().daemon:
+            self.workers = 1
+        self.pool = None
+
+    def __enter__(self) -> "_CandidatePool":
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self.pool is not None:
+            # On errors (e.g. SearchCancelled) drop the candidates not started yet
+            self.pool.shutdown(cancel_futures=exc_type is not None)
+
+    def fit(
+        self,
+        candidates: List[Dict[str, Any]],
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        store=None,
+        **options,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fit a batch of candidates; on_result sees each result as it finishes
+
+        With a CandidateFitStore, full fits already stored are not fitted
+        again and new ones are stored as they finish. Screening fits
+        (maxiter or concentrate_scale set) bypass the store.
+        """
+        results = []
+        if options.get("maxiter") is not None or options.get("concentrate_scale"):
+            store = None
+
+        def collect(fits: List[Dict[str, Any]], fitted: bool = True) -> None:
+            for fit in fits:
+                if store is not None and fitted:
+                    store.put(fit["order"], fit)
+                results.append(fit)
+                if on_result:
+                    on_result(fit)
+
+        if store is not None:
+            cached = store.get_many([tuple(c["order"]) for c in candidates])
+            todo = []
+            for candidate in candidates:
+                hit = cached.get(tuple(candidate["order"]))
+                if hit is None:
+                    todo.append(candidate)
+                else:
+                    collect([{"position": candidate["position"], **hit}], fitted=False)
+            candidates = todo
+
+        if self.pool is None:
+            for candidate in candidates:
+                collect(_fit_candidates(self.train_data, self.exog, [candidate], options))
+        else:
+            chunk_size = max(1, settings.GRID_SEARCH_CHUNK_SIZE)
+            pending = {
+                self.pool.submit(_fit_candidates, self.train_data, self.exog, candidates[i:i + chunk_size], options)
+                for i in range(0, len(candidates), chunk_size)
+            }
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    collect(future.result())
+        return results
 
 
 class GridSearchService:
     """Service for hyperparameter optimization via grid search"""
-    
+
+    @staticmethod
+    def candidate_grid(
+        p_range: List[int],
+        q_range: List[int],
+        P_range: List[int],
+        Q_range: List[int],
+        d: int = 1,
+        D: int = 1,
+        s: int = 12
+    ) -> List[Order]:
+        """
+        Orders (p, d, q, P, D, Q, s) of a grid, in search order
+
+        The position of an order in this list decides ties in select_best,
+        the same way the original nested loops did.
+        """
+        return [
+            (p_, d, q_, P_, D, Q_, s)
+            for p_ in p_range
+            for q_ in q_range
+            for P_ in P_range
+            for Q_ in Q_range
+        ]
+
+    @staticmethod
+    def fit_candidate(
+        train_data: pd.Series,
+        exog: Optional[pd.DataFrame],
+        order: Order,
+        start_params: Optional[Dict[str, float]] = None,
+        maxiter: Optional[int] = None,
+        concentrate_scale: bool = False,
+        keep_params: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Fit one SARIMAX candidate of a grid
+
+        Args:
+            train_data: Training time series
+            exog: Exogenous variables
+            order: (p, d, q, P, D, Q, s)
+            start_params: Parameter values by name (e.g. "ar.L1") to start
+                the optimizer from; parameters not given keep the model's
+                default start values
+            maxiter: Optimizer iteration limit (default: statsmodels')
+            concentrate_scale: Concentrate the variance out of the likelihood,
+                one parameter less to optimize
+            keep_params: Include the fitted params (and scale) in the result,
+                to warm-start other fits
+
+        Returns:
+            Dict with order, aic, bic, hqic, fit_seconds, converged,
+            iterations and error (None unless the fit failed or diverged,
+            in which case the criteria are None)
+        """
+        p_, d, q_, P_, D, Q_, s = order
+        started = time.perf_counter()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                # SARIMAX reshapes the data it is given in place; keep the caller's series intact
+                mod = sm.tsa.statespace.SARIMAX(
+                    endog=train_data.copy(),
+                    order=(p_, d, q_),
+                    exog=exog,
+                    seasonal_order=(P_, D, Q_, s),
+                    enforce_invertibility=False,
+                    concentrate_scale=concentrate_scale
+                )
+                fit_kwargs = {"disp": False}
+                if maxiter is not None:
+                    fit_kwargs["maxiter"] = maxiter
+                if start_params:
+                    values = np.array(mod.start_params, dtype=float)
+                    for i, name in enumerate(mod.param_names):
+                        if name in start_params and np.isfinite(start_params[name]):
+                            values[i] = start_params[name]
+                    fit_kwargs["start_params"] = values
+                model = mod.fit(**fit_kwargs)
+            criteria = [float(model.aic), float(model.bic), float(model.hqic)]
+            if not all(np.isfinite(criteria)) or not np.all(np.isfinite(model.params)):
+                raise ValueError("Fit diverged: information criteria or parameters are not finite")
+            retvals = model.mle_retvals or {}
+            result = {
+                "order": list(order),
+                "aic": criteria[0],
+                "bic": criteria[1],
+                "hqic": criteria[2],
+                "fit_seconds": time.perf_counter() - started,
+                "converged": bool(retvals.get("converged", True)),
+                "iterations": int(retvals["iterations"]) if "iterations" in retvals else None,
+                "error": None,
+            }
+            if keep_params:
+                result["params"] = {name: float(value) for name, value in zip(mod.param_names, model.params)}
+                result["scale"] = float(model.scale)
+            return result
+        except Exception as e:
+            # Invalid parameter combinations are skipped by select_best
+            return {
+                "order": list(order),
+                "aic": None,
+                "bic": None,
+                "hqic": None,
+                "fit_seconds": time.perf_counter() - started,
+                "converged": False,
+                "iterations": None,
+                "error": str(e),
+            }
+
+    @staticmethod
+    def select_best(candidates: List[Dict[str, Any]], d: int = 1, D: int = 1, s: int = 12) -> Order:
+        """
+        Pick the best order from fitted candidates
+
+        Replays the original rule over the candidates in grid order: a
+        candidate becomes the best when at least two of its AIC, BIC and
+        HQIC are lower than or equal to the (rounded) best so far. Sorting
+        by position first makes the result independent of the order in
+        which parallel fits finished.
+
+        Args:
+            candidates: Results of fit_candidate, each with its grid position
+            d, D, s: Fixed parameters, for the default order
+
+        Returns:
+            Best parameter tuple (p, d, q, P, D, Q, s)
+        """
+        best_model_aic = np.inf
+        best_model_bic = np.inf
+        best_model_hqic = np.inf
+        best_model_order = (0, d, 0, 0, D, 0, s)
+
+        for candidate in sorted(candidates, key=lambda c: c["position"]):
+            if candidate.get("error"):
+                continue
+            no_of_lower_metrics = 0
+            if candidate["aic"] <= best_model_aic:
+                no_of_lower_metrics += 1
+            if candidate["bic"] <= best_model_bic:
+                no_of_lower_metrics += 1
+            if candidate["hqic"] <= best_model_hqic:
+                no_of_lower_metrics += 1
+
+            # Update best if at least 2 metrics improved
+            if no_of_lower_metrics >= 2:
+                best_model_aic = np.round(candidate["aic"], 0)
+                best_model_bic = np.round(candidate["bic"], 0)
+                best_model_hqic = np.round(candidate["hqic"], 0)
+                best_model_order = tuple(candidate["order"])
+
+        return best_model_order
+
     @staticmethod
     def grid_search_arima(
         train_data: pd.Series,
@@ -20,62 +290,316 @@ class GridSearchService:
         Q_range: List[int],
         d: int = 1,
         D: int = 1,
-        s: int = 12
+        s: int = 12,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        store=None
     ) -> Tuple[int, int, int, int, int, int, int]:
         """
         Grid search for SARIMAX models
-        
-        Adapted from arauto/lib/grid_search_arima.py
-        
+
+        Adapted from arauto/lib/grid_search_arima.py. Candidates are fitted
+        in a process pool; inside daemonic processes (Celery prefork
+        workers), which cannot start one, they are fitted in turn - the
+        Celery task spreads the grid over subtasks instead.
+
         Args:
             train_data: Training time series
             exog: Exogenous variables
             p_range, q_range, P_range, Q_range: Parameter ranges to search
             d, D, s: Fixed parameters
-            
+            max_workers: Worker processes (default GRID_SEARCH_MAX_WORKERS,
+                0 meaning one per CPU); 1 fits in this process
+            on_result: Called with each candidate result (with its grid
+                position) as soon as it is fitted
+            store: CandidateFitStore consulted before fitting and written
+                as each fit completes
+
         Returns:
             Best parameter tuple (p, d, q, P, D, Q, s)
         """
-        best_model_aic = np.Inf
-        best_model_bic = np.Inf
-        best_model_hqic = np.Inf
-        best_model_order = (0, d, 0, 0, D, 0, s)
-        current_best_model = None
-        
-        for p_ in p_range:
-            for q_ in q_range:
-                for P_ in P_range:
-                    for Q_ in Q_range:
-                        try:
-                            no_of_lower_metrics = 0
-                            
-                            model = sm.tsa.statespace.SARIMAX(
-                                endog=train_data,
-                                order=(p_, d, q_),
-                                exog=exog,
-                                seasonal_order=(P_, D, Q_, s),
-                                enforce_invertibility=False
-                            ).fit()
-                            
-                            # Check if this model improves metrics
-                            if model.aic <= best_model_aic:
-                                no_of_lower_metrics += 1
-                            if model.bic <= best_model_bic:
-                                no_of_lower_metrics += 1
-                            if model.hqic <= best_model_hqic:
-                                no_of_lower_metrics += 1
-                            
-                            # Update best if at least 2 metrics improved
-                            if no_of_lower_metrics >= 2:
-                                best_model_aic = np.round(model.aic, 0)
-                                best_model_bic = np.round(model.bic, 0)
-                                best_model_hqic = np.round(model.hqic, 0)
-                                best_model_order = (p_, d, q_, P_, D, Q_, s)
-                                current_best_model = model
-                                
-                        except Exception:
-                            # Skip invalid parameter combinations
-                            pass
-        
-        return best_model_order
+        grid = GridSearchService.candidate_grid(p_range, q_range, P_range, Q_range, d, D, s)
+        candidates = [{"position": position, "order": order} for position, order in enumerate(grid)]
+        with _CandidatePool(train_data, exog, max_workers, len(grid)) as pool:
+            results = pool.fit(candidates, on_result, store)
+        return GridSearchService.select_best(results, d, D, s)
+
+    @staticmethod
+    def _nearest_params(order: Order, fitted: List[Dict[str, Any]]) -> Optional[Dict[str, float]]:
+        """Params of the fitted order closest to order in (p, q, P, Q); earlier grid positions win ties"""
+        if not fitted:
+            return None
+        def distance(candidate: Dict[str, Any]) -> Tuple[int, int]:
+            other = candidate["order"]
+            return sum(abs(other[i] - order[i]) for i in (0, 2, 3, 5)), candidate["position"]
+
+        return min(fitted, key=distance)["params"]
+
+    @staticmethod
+    def two_phase_search(
+        train_data: pd.Series,
+        exog: Optional[pd.DataFrame],
+        p_range: List[int],
+        q_range: List[int],
+        P_range: List[int],
+        Q_range: List[int],
+        d: int = 1,
+        D: int = 1,
+        s: int = 12,
+        top_k: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        store=None
+    ) -> Tuple[int, int, int, int, int, int, int]:
+        """
+        Screen-and-refine grid search
+
+        Phase one ("screen") fits every candidate cheaply: at most
+        GRID_SEARCH_SCREEN_MAXITER iterations, with the variance
+        concentrated out. Candidates are screened in waves of increasing
+        p + q + P + Q, each one starting from the params of the nearest
+        order already screened. Phase two ("refine") fully refits the top_k
+        candidates by AIC, starting from their screened params, and the
+        existing 2-of-3-criteria rule picks among them. Candidates that
+        failed or diverged in phase one are not refitted.
+
+        Args:
+            train_data: Training time series
+            exog: Exogenous variables
+            p_range, q_range, P_range, Q_range: Parameter ranges to search
+            d, D, s: Fixed parameters
+            top_k: Candidates to refit (default GRID_SEARCH_REFINE_TOP_K)
+            max_workers: Worker processes, as for grid_search_arima
+            on_result: Called with each result (with its grid position and
+                phase) as soon as it is fitted; a refined result replaces
+                the screened one at the same position
+            store: CandidateFitStore for the refits (screening fits are
+                never stored)
+
+        Returns:
+            Best parameter tuple (p, d, q, P, D, Q, s)
+        """
+        top_k = max(1, top_k or settings.GRID_SEARCH_REFINE_TOP_K)
+        grid = GridSearchService.candidate_grid(p_range, q_range, P_range, Q_range, d, D, s)
+
+        def report(phase: str):
+            def callback(result: Dict[str, Any]) -> None:
+                if on_result:
+                    on_result({k: v for k, v in result.items() if k not in ("params", "scale")} | {"phase": phase})
+            return callback
+
+        waves: Dict[int, List[int]] = {}
+        for position, order in enumerate(grid):
+            waves.setdefault(order[0] + order[2] + order[3] + order[5], []).append(position)
+
+        screened: List[Dict[str, Any]] = []
+        with _CandidatePool(train_data, exog, max_workers, len(grid)) as pool:
+            for complexity in sorted(waves):
+                fitted = [c for c in screened if not c["error"]]
+                batch = [
+                    {
+                        "position": position,
+                        "order": grid[position],
+                        "start_params": GridSearchService._nearest_params(grid[position], fitted),
+                    }
+                    for position in waves[complexity]
+                ]
+                screened += pool.fit(
+                    batch,
+                    report("screen"),
+                    maxiter=settings.GRID_SEARCH_SCREEN_MAXITER,
+                    concentrate_scale=True,
+                    keep_params=True,
+                )
+
+            shortlist = sorted((c for c in screened if not c["error"]), key=lambda c: (c["aic"], c["position"]))[:top_k]
+            refined = pool.fit(
+                [
+                    {"position": c["position"], "order": c["order"], "start_params": {**c["params"], "sigma2": c["scale"]}}
+                    for c in shortlist
+                ],
+                report("refine"),
+                store,
+            )
+
+        return GridSearchService.select_best(refined, d, D, s)
+
+    @staticmethod
+    def stepwise_search(
+        train_data: pd.Series,
+        exog: Optional[pd.DataFrame],
+        p_range: List[int],
+        q_range: List[int],
+        P_range: List[int],
+        Q_range: List[int],
+        d: int = 1,
+        D: int = 1,
+        s: int = 12,
+        max_workers: Optional[int] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], None]] = None,
+        store=None
+    ) -> Tuple[int, int, int, int, int, int, int]:
+        """
+        Stepwise order search (Hyndman-Khandakar style)
+
+        Fits a few seed orders, then repeatedly fits the neighbors of the
+        best order so far - p, q, P and Q each moved by one, within the
+        bounds of the given ranges - and moves to the best neighbor by AIC
+        until none improves on it. Every fitted order is remembered and
+        never refitted, so the number of fits grows with the distance
+        walked rather than with the size of the grid. The neighbors of a
+        step are fitted together, in parallel when a pool is available.
+
+        Args:
+            train_data: Training time series
+            exog: Exogenous variables
+            p_range, q_range, P_range, Q_range: Parameter ranges; only their
+                minimum and maximum bound the search
+            d, D, s: Fixed parameters
+            max_workers: Worker processes, as for grid_search_arima
+            on_result: Called with each result as soon as it is fitted; the
+                position is the order in which candidates were fitted
+            store: CandidateFitStore consulted before fitting and written
+                as each fit completes
+
+        Returns:
+            Best parameter tuple (p, d, q, P, D, Q, s)
+
+        Raises:
+            ValueError: If a parameter range is empty
+        """
+        ranges = {"p_range": p_range, "q_range": q_range, "P_range": P_range, "Q_range": Q_range}
+        empty = [name for name, values in ranges.items() if not values]
+        if empty:
+            raise ValueError(f"Parameter ranges must not be empty: {', '.join(empty)}")
+        bounds = [(min(r), max(r)) for r in ranges.values()]
+
+        def clip(orders: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+            return [tuple(min(max(v, lo), hi) for v, (lo, hi) in zip(order, bounds)) for order in orders]
+
+        def full(key: Tuple[int, int, int, int]) -> Order:
+            return (key[0], d, key[1], key[2], D, key[3], s)
+
+        # Seeds of auto.arima: (2,2)(1,1), (0,0)(0,0), (1,0)(1,0), (0,1)(0,1) as (p,q)(P,Q)
+        seeds = clip([(2, 2, 1, 1), (0, 0, 0, 0), (1, 0, 1, 0), (0, 1, 0, 1)])
+        evaluated: Dict[Tuple[int, int, int, int], Dict[str, Any]] = {}
+
+        max_fits = np.prod([hi - lo + 1 for lo, hi in bounds])
+        with _CandidatePool(train_data, exog, max_workers, int(max_fits)) as pool:
+            def evaluate(keys: List[Tuple[int, int, int, int]]) -> List[Dict[str, Any]]:
+                new = [key for key in dict.fromkeys(keys) if key not in evaluated]
+                batch = [
+                    {"position": len(evaluated) + i, "order": full(key)}
+                    for i, key in enumerate(new)
+                ]
+                for key, result in zip(new, sorted(pool.fit(batch, on_result, store), key=lambda r: r["position"])):
+                    evaluated[key] = result
+                return [evaluated[key] for key in keys]
+
+            def best_of(results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+                fitted = [r for r in results if not r["error"]]
+                return min(fitted, key=lambda r: (r["aic"], r["position"])) if fitted else None
+
+            best = best_of(evaluate(seeds))
+            while best is not None:
+                current = (best["order"][0], best["order"][2], best["order"][3], best["order"][5])
+                neighbors = []
+                for i in range(4):
+                    for step in (-1, 1):
+                        key = list(current)
+                        key[i] += step
+                        if bounds[i][0] <= key[i] <= bounds[i][1]:
+                            neighbors.append(tuple(key))
+                candidate = best_of(evaluate(neighbors))
+                if candidate is None or candidate["aic"] >= best["aic"]:
+                    break
+                best = candidate
+
+        if best is None:
+            return (0, d, 0, 0, D, 0, s)
+        return tuple(best["order"])
+
+    @staticmethod
+    def run_status(run, include_candidates: bool = True) -> Dict[str, Any]:
+        """
+        Progress of a grid search run
+
+        Args:
+            run: GridSearchRun row, with its candidates
+            include_candidates: Include every fitted candidate
+
+        Returns:
+            Dict with task_id, status, total, completed, failed, the best
+            order so far (by the 2-of-3-criteria rule over the candidates
+            fitted so far, refined ones only in two-phase searches once
+            any is refined) and its criteria, best_so_far_phase ("screen"
+            or "refine" in two-phase searches, else None), elapsed_seconds
+            and eta_seconds (None once finished, and for stepwise
+            searches, whose total is only an upper bound)
+        """
+        config = run.config or {}
+        candidates = [
+            {
+                "position": c.position,
+                "order": c.order,
+                "aic": c.aic,
+                "bic": c.bic,
+                "hqic": c.hqic,
+                "fit_seconds": c.fit_seconds,
+                "converged": c.converged,
+                "iterations": c.iterations,
+                "phase": c.phase,
+                "error": c.error,
+            }
+            for c in run.candidates
+        ]
+        fitted = [c for c in candidates if not c["error"]]
+        completed = len(candidates)
+
+        # Screening fits stop early with a concentrated scale, so their
+        # criteria are not comparable with refined fits: once refining has
+        # started, only refined candidates count. Until then the best is a
+        # screen estimate (best_so_far_phase "screen").
+        ranked = fitted
+        best_phase = None
+        if config.get("search_strategy") == "two_phase" and fitted:
+            refined = [c for c in fitted if c["phase"] == "refine"]
+            ranked = refined or fitted
+            best_phase = "refine" if refined else "screen"
+
+        best = None
+        if ranked:
+            best_order = list(GridSearchService.select_best(ranked, config.get("d", 1), config.get("D", 1), config.get("s", 12)))
+            best = next((c for c in ranked if c["order"] == best_order), None)
+
+        started = run.created_at
+        if started is not None and started.tzinfo is None:
+            started = started.replace(tzinfo=timezone.utc)
+        finished = run.status in ("completed", "failed", "cancelled")
+        until = run.updated_at if finished and run.updated_at is not None else datetime.now(timezone.utc)
+        if until.tzinfo is None:
+            until = until.replace(tzinfo=timezone.utc)
+        elapsed = max((until - started).total_seconds(), 0.0) if started is not None else None
+
+        eta = None
+        if not finished and elapsed and completed and config.get("search_strategy") != "stepwise":
+            eta = round(max(run.total - completed, 0) * elapsed / completed, 1)
+
+        status = {
+            "task_id": run.id,
+            "status": run.status,
+            "search_strategy": config.get("search_strategy", "grid"),
+            "total": run.total,
+            "completed": completed,
+            "failed": completed - len(fitted),
+            "best_order": run.best_order or (best["order"] if best else None),
+            "best_so_far": best,
+            "best_so_far_phase": best_phase,
+            "elapsed_seconds": round(elapsed, 1) if elapsed is not None else None,
+            "eta_seconds": eta,
+            "error": run.error,
+        }
+        if include_candidates:
+            status["candidates"] = candidates
+        return status
 
@@ -0,0 +1,362 @@
+"""
+Cross-family model leaderboard under a wall-clock budget
+
+Fits SARIMAX and ARIMA/ARFIMA/ARTFIMA candidates of several orders to one
+series and ranks them by holdout error, so a model can be picked without
+training each family by hand. The series is prepared once: the last
+`holdout` observations are held out, and one stationarity test of the
+training part picks the differencing orders (d, D) of the SARIMAX
+candidates and whether to fit on log1p values. Every candidate is then
+fitted to the same training values and forecasts the holdout; errors are
+measured on the original scale.
+
+Candidates run in a process pool cheapest first, by the cost model of
+app.tasks.routing, so a short budget still yields the simple models.
+When the budget runs out no further candidate is started and the fits
+still running are stopped (the pool is terminated). Candidates whose
+estimated cost exceeds the time left are skipped rather than started.
+Daemonic processes (Celery prefork workers) cannot start a pool; there
+the candidates are fitted in turn, and the last fit may overrun the
+budget.
+
+AIC and BIC are reported with each fit but are only comparable within a
+family: SARIMAX uses a diffuse-initialized state space likelihood on the
+levels, the ARTFIMA family an exact likelihood of the differenced series.
+The holdout errors are comparable across families.
+"""
+import multiprocessing
+import os
+import queue
+import time
+import warnings
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.tasks.routing import estimate_fit_seconds
+
+FAMILIES = ("SARIMAX", "ARIMA", "ARFIMA", "ARTFIMA")
+RANK_KEYS = ("rmse", "mae", "mape", "aic", "bic")
+
+# Series handed to each pool process once, by the pool initializer
+_worker_data: Optional[Dict[str, Any]] = None
+
+
+def _init_worker(data: Dict[str, Any]) -> None:
+    global _worker_data
+    _worker_data = data
+    # Import the model libraries before the first candidate arrives
+    from app.services.modeling.training_service import TrainingService  # noqa: F401
+
+
+def _fit_pooled(position: int, candidate: Dict[str, Any]) -> Dict[str, Any]:
+    return _fit_candidate(position, candidate, _worker_data)
+
+
+def _fit_candidate(position: int, candidate: Dict[str, Any], data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fit one candidate and score its forecast of the holdout
+
+    Args:
+        position: Index of the candidate
+        candidate: Candidate from LeaderboardService.candidates
+        data: Prepared series (dates, values, holdout, log)
+
+    Returns:
+        Dict with position and fit_seconds, plus aic, bic and (with a
+        holdout) rmse, mae and mape, or error
+    """
+    from app.services.evaluation.metrics_service import MetricsService
+    from app.services.forecasting.forecast_service import ForecastService
+    from app.services.modeling.training_service import TrainingService
+
+    started = time.perf_counter()
+    try:
+        # A copy per fit: statsmodels reshapes the endog array in place
+        Y = pd.Series(data["values"].copy(), index=pd.DatetimeIndex(data["dates"]))
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = TrainingService.train_model(
+                Y=Y, model_type=candidate["model_type"], parameters=candidate["parameters"]
+            )
+            outcome = {
+                "position": position,
+                "aic": result["metrics"].get("aic"),
+                "bic": result["metrics"].get("bic"),
+            }
+            holdout = data["holdout"]
+            if len(holdout):
+                if "artfima_result" in result:
+                    model = result["artfima_result"]
+                else:
+                    model = TrainingService.deserialize_model(result["model_data"])
+                forecast = ForecastService.generate_forecast(
+                    model, len(holdout), transformation_type="log" if data["log"] else "none"
+                )
+                predicted = np.asarray(forecast["forecasts"]["values"], dtype=float)
+                if not np.all(np.isfinite(predicted)):
+                    raise ValueError("Forecast of the holdout is not finite")
+                outcome.update(MetricsService.calculate_all_metrics(holdout, predicted))
+    except Exception as e:
+        outcome = {"position": position, "error": str(e)}
+    outcome["fit_seconds"] = time.perf_counter() - started
+    return outcome
+
+
+class LeaderboardService:
+    """Service for ranking candidate models of several families on one series"""
+
+    @staticmethod
+    def prepare(
+        series: pd.Series,
+        holdout: Optional[int] = None,
+        s: Optional[int] = None,
+        frequency: Optional[str] = None,
+        d: Optional[int] = None,
+        D: Optional[int] = None,
+        transformation: str = "auto",
+    ) -> Dict[str, Any]:
+        """
+        Split off the holdout and pick the transformation, once per leaderboard
+
+        Args:
+            series: Series indexed by date
+            holdout: Observations held out (default one season, at most a fifth of the series)
+            s: Seasonal period (default from frequency)
+            frequency: Data frequency ("Daily", "Monthly", ...), for the default s
+            d, D: Differencing orders of the SARIMAX candidates (default from the stationarity test)
+            transformation: "auto" (from the stationarity test), "log" or "none"
+
+        Returns:
+            Dict with dates, values (training part, transformed), holdout
+            (original scale), log, s, d, D and the stationarity test outcome
+
+        Raises:
+            ValueError: If the series is too short or an option is invalid
+        """
+        from app.services.preprocessing.stationarity_service import StationarityService
+        from app.services.preprocessing.transformer import TimeSeriesTransformer
+
+        if transformation not in ("auto", "log", "none"):
+            raise ValueError(f"Unknown transformation '{transformation}'; use 'auto', 'log' or 'none'")
+        series = series.dropna()
+        if not series.index.is_monotonic_increasing:
+            series = series.sort_index(kind="stable")
+        series = series[~series.index.duplicated(keep="last")]
+
+        if s is None:
+            s = TimeSeriesTransformer.SEASONALITY_DICT.get(frequency, 12)
+        if s < 1:
+            raise ValueError("Seasonality (s) must be positive")
+        if holdout is None:
+            holdout = max(1, min(s, len(series) // 5))
+        if holdout < 0:
+            raise ValueError("holdout must be non-negative")
+        train = series.iloc[:len(series) - holdout] if holdout else series
+        min_train = max(10, 2 * s + 2)
+        if len(train) < min_train:
+            raise ValueError(
+                f"{len(train)} observations left for training after a holdout of {holdout}; "
+                f"at least {min_train} needed"
+            )
+
+        test = StationarityService.test_stationarity(train, frequency or "Monthly")
+        chosen = test["transformation"]
+        log = transformation == "log" or (
+            transformation == "auto" and "log" in chosen["type"].lower() and bool((train > 0).all())
+        )
+        if log and not (train > -1).all():
+            raise ValueError("log transformation needs values greater than -1")
+        values = np.log1p(train.to_numpy(dtype=float)) if log else train.to_numpy(dtype=float)
+
+        return {
+            "dates": train.index.to_numpy(),
+            "values": values,
+            "holdout": series.iloc[len(train):].to_numpy(dtype=float),
+            "log": log,
+            "s": int(s),
+            "d": int(chosen["d"] if d is None else d),
+            "D": int((chosen["D"] if D is None else D) if s > 1 else 0),
+            "stationarity": {
+                "transformation": chosen["type"],
+                "is_stationary": test["is_stationary"],
+                "p_value": test["p_value"],
+            },
+        }
+
+    @staticmethod
+    def candidates(
+        prepared: Dict[str, Any],
+        families: Optional[List[str]] = None,
+        max_p: int = 2,
+        max_q: int = 2,
+        max_seasonal: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        Candidate models, cheapest first
+
+        SARIMAX candidates take d and D from the prepared series; ARIMA,
+        ARFIMA and ARTFIMA candidates estimate d (fractional for ARFIMA and
+        ARTFIMA) after one integer difference.
+
+        Args:
+            prepared: Output of prepare()
+            families: Families to include (default all of FAMILIES)
+            max_p, max_q: Largest AR/MA orders
+            max_seasonal: Largest seasonal AR/MA orders of SARIMAX candidates
+
+        Returns:
+            Dicts with family, model_type, parameters (as taken by
+            TrainingService.train_model), label and estimated_seconds
+
+        Raises:
+            ValueError: If a family is unknown
+        """
+        families = [f.upper() for f in (families or FAMILIES)]
+        unknown = sorted(set(families) - set(FAMILIES))
+        if unknown:
+            raise ValueError(f"Unknown model families {unknown}; use {list(FAMILIES)}")
+
+        n_obs, s, d, D = len(prepared["values"]), prepared["s"], prepared["d"], prepared["D"]
+        seasonal = range(max_seasonal + 1) if s > 1 else [0]
+        candidates = []
+        for family in dict.fromkeys(families):
+            for p in range(max_p + 1):
+                for q in range(max_q + 1):
+                    if family == "SARIMAX":
+                        for P in seasonal:
+                            for Q in seasonal:
+                                if Q > 0 and q >= s:
+                                    continue  # Overlapping MA lags, rejected by train_sarimax
+                                parameters = {"p": p, "d": d, "q": q, "P": P, "D": D, "Q": Q, "s": s}
+                                label = f"SARIMAX({p},{d},{q})({P},{D},{Q},{s})"
+                                candidates.append((family, "SARIMAX", parameters, label))
+                    else:
+                        parameters = {"p": p, "d": 0.0, "q": q, "glp": family, "lambda": None, "fixd": None, "likAlg": "exact"}
+                        candidates.append((family, "ARTFIMA", parameters, f"{family}({p},d,{q})"))
+
+        ranked = [
+            {
+                "family": family,
+                "model_type": model_type,
+                "parameters": parameters,
+                "label": label,
+                "estimated_seconds": estimate_fit_seconds(family, n_obs, parameters),
+            }
+            for family, model_type, parameters, label in candidates
+        ]
+        ranked.sort(key=lambda c: c["estimated_seconds"])
+        return ranked
+
+    @staticmethod
+    def run(
+        prepared: Dict[str, Any],
+        candidates: List[Dict[str, Any]],
+        budget_seconds: float,
+        rank_by: str = "rmse",
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fit candidates until they are done or the budget runs out, and rank them
+
+        Args:
+            prepared: Output of prepare()
+            candidates: Output of candidates(), in the order to fit them
+            budget_seconds: Wall-clock budget, including pool start-up
+            rank_by: Metric to rank by, lowest first (one of RANK_KEYS)
+            max_workers: Pool processes (default LEADERBOARD_MAX_WORKERS)
+
+        Returns:
+            Dict with the ranked leaderboard (completed fits), the
+            candidates not ranked (failed, timed_out or skipped), counts
+            per status and timing
+
+        Raises:
+            ValueError: If rank_by is unknown, or needs a holdout there is not
+        """
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"Unknown rank_by '{rank_by}'; use one of {list(RANK_KEYS)}")
+        if rank_by in ("rmse", "mae", "mape") and not len(prepared["holdout"]):
+            raise ValueError(f"rank_by '{rank_by}' needs a holdout")
+
+        started = time.monotonic()
+        deadline = started + budget_seconds
+        entries = [dict(candidate, status="skipped") for candidate in candidates]
+        data = {key: prepared[key] for key in ("dates", "values", "holdout", "log")}
+
+        if max_workers is None:
+            max_workers = settings.LEADERBOARD_MAX_WORKERS
+        workers = min(max_workers or os.cpu_count() or 1, max(len(entries), 1))
+        if multiprocessing.current_process().daemon:
+            workers = 0
+
+        def record(outcome: Dict[str, Any]) -> None:
+            entry = entries[outcome.pop("position")]
+            entry.update(outcome)
+            entry["status"] = "failed" if "error" in outcome else "completed"
+
+        def affordable(entry: Dict[str, Any]) -> bool:
+            return entry["estimated_seconds"] <= deadline - time.monotonic()
+
+        if workers:
+            finished: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+            pool = multiprocessing.get_context("spawn").Pool(workers, initializer=_init_worker, initargs=(data,))
+            try:
+                next_position = in_flight = 0
+                while time.monotonic() < deadline:
+                    # Keep one candidate per process in flight, so the rest can still be skipped
+                    while in_flight < workers and next_position < len(entries):
+                        position = next_position
+                        next_position += 1
+                        if not affordable(entries[position]):
+                            continue
+                        entries[position]["status"] = "timed_out"  # Until its outcome arrives
+                        pool.apply_async(
+                            _fit_pooled, (position, candidates[position]),
+                            callback=finished.put,
+                            error_callback=lambda e, position=position: finished.put({"position": position, "error": str(e)}),
+                        )
+                        in_flight += 1
+                    if not in_flight:
+                        break
+                    try:
+                        record(finished.get(timeout=max(deadline - time.monotonic(), 0)))
+                    except queue.Empty:
+                        break
+                    in_flight -= 1
+                    while True:
+                        try:
+                            record(finished.get_nowait())
+                        except queue.Empty:
+                            break
+                        in_flight -= 1
+            finally:
+                # Stops the fits still running when the budget ran out
+                pool.terminate()
+                pool.join()
+        else:
+            for position, entry in enumerate(entries):
+                if time.monotonic() >= deadline:
+                    break
+                if affordable(entry):
+                    record(_fit_candidate(position, entry, data))
+
+        completed = [e for e in entries if e["status"] == "completed"]
+        completed.sort(key=lambda e: (e.get(rank_by) is None, e.get(rank_by), e.get("aic") is None, e.get("aic")))
+        for rank, entry in enumerate(completed, start=1):
+            entry["rank"] = rank
+        counts = {status: 0 for status in ("completed", "failed", "timed_out", "skipped")}
+        for entry in entries:
+            counts[entry["status"]] += 1
+
+        return {
+            "rank_by": rank_by,
+            "budget_seconds": budget_seconds,
+            "elapsed_seconds": time.monotonic() - started,
+            "workers": workers or 1,
+            "counts": counts,
+            "leaderboard": completed,
+            "unranked": [e for e in entries if e["status"] != "completed"],
+        }
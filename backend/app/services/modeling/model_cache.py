@@ -0,0 +1,202 @@
+"""
+In-process cache of deserialized fitted models
+
+Forecast and predict requests for the same model otherwise pay for a
+base64 decode and a full model rebuild on every call. Entries are keyed by
+model id and tagged with a version token (the row's data_version, bumped
+whenever model_data is rewritten) so a refreshed model is reloaded rather
+than served stale. Eviction is LRU,
+bounded by the estimated in-memory size of the cached objects.
+"""
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.services.modeling.training_service import TrainingService
+
+
+def estimate_nbytes(obj: Any, _seen: Optional[set] = None, _depth: int = 0) -> int:
+    """
+    Estimate the memory held by an object graph
+
+    Counts numpy arrays and pandas objects by their buffer size and walks
+    containers and instance attributes a few levels deep. Shared objects
+    are counted once.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen or _depth > 8:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        return int(obj.nbytes)
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=False))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=False).sum())
+    if isinstance(obj, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        items = obj.values()
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = obj
+    elif hasattr(obj, "__dict__"):
+        items = vars(obj).values()
+    else:
+        return size
+    for item in items:
+        size += estimate_nbytes(item, _seen, _depth + 1)
+    return size
+
+
+def model_version(model) -> Optional[str]:
+    """
+    Version token for a Model row; changes whenever its model_data is rewritten
+
+    An integer counter rather than updated_at: timestamps can repeat within
+    a second (SQLite's now() has one-second resolution), and edits that
+    leave model_data alone must not invalidate cached models and forecasts.
+    """
+    return str(model.data_version) if model.data_version is not None else None
+
+
+class ModelCache:
+    """Bounded LRU cache of live model objects keyed by model id"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model_id: str, version: Optional[str] = None):
+        """Return the cached model, or None if absent or built from an older version"""
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is None or entry["version"] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(model_id)
+            self.hits += 1
+            return entry["model"]
+
+    def put(self, model_id: str, model: Any, version: Optional[str] = None) -> None:
+        """Add a model, evicting least recently used entries to stay within max_bytes"""
+        nbytes = estimate_nbytes(model)
+        with self._lock:
+            self._pop(model_id)
+            if nbytes > self.max_bytes:
+                # Larger than the whole cache: serve it uncached
+                return
+            self._entries[model_id] = {"model": model, "version": version, "nbytes": nbytes}
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+                self.evictions += 1
+
+    def get_or_load(self, model_id: str, version: Optional[str], loader: Callable[[], Any]):
+        """Return the cached model, calling loader() and caching the result on a miss"""
+        model = self.get(model_id, version)
+        if model is None:
+            model = loader()
+            self.put(model_id, model, version)
+        return model
+
+    def get_fitted_model(self, model):
+        """
+        Return the deserialized fitted model for a Model row
+
+        The row's model_data is only read (and decoded) on a cache miss.
+        """
+        return self.get_or_load(
+            model.id,
+            model_version(model),
+            lambda: TrainingService.deserialize_model(model.model_data),
+        )
+
+    def invalidate(self, model_id: str) -> None:
+        """Drop a model, e.g. after it was deleted or retrained"""
+        with self._lock:
+            self._pop(model_id)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current occupancy"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _pop(self, model_id: str) -> None:
+        entry = self._entries.pop(model_id, None)
+        if entry is not None:
+            self._bytes -= entry["nbytes"]
+
+
+model_cache = ModelCache(max_bytes=settings.MODEL_CACHE_MAX_BYTES)
+
+
+def preload_recent_models(db, per_project: int) -> int:
+    """
+    Load the most recently trained models of each project into the cache
+
+    Models without a project are grouped together. Returns the number of
+    models loaded; models that fail to deserialize are skipped.
+    """
+    from sqlalchemy import func
+    from app.models.model import Model
+
+    if per_project <= 0:
+        return 0
+
+    # Ids only: the model blobs are loaded one at a time, for the models kept
+    rows = (
+        db.query(Model.id, Model.project_id)
+        .filter(Model.model_data.isnot(None))
+        .order_by(func.coalesce(Model.updated_at, Model.created_at).desc())
+        .all()
+    )
+
+    loaded = 0
+    per_group: Dict[Optional[str], int] = {}
+    for model_id, project_id in rows:
+        if per_group.get(project_id, 0) >= per_project:
+            continue
+        model = db.query(Model).filter(Model.id == model_id).first()
+        if model is None:
+            continue
+        try:
+            model_cache.get_fitted_model(model)
+        except Exception as e:
+            print(f"Warning: Could not preload model {model.id}: {e}")
+            continue
+        finally:
+            # Drop the row (and its blob) from the session once cached
+            db.expunge(model)
+        per_group[project_id] = per_group.get(project_id, 0) + 1
+        loaded += 1
+    return loaded
@@ -0,0 +1,182 @@
+"""
+Incremental model refresh
+
+When rows are appended to a dataset, the SARIMAX models trained on it are
+brought up to date by running the Kalman filter over the extended series
+with the fitted parameters held fixed, instead of estimating them again.
+A refresh costs one filter pass; a fit costs one per optimizer iteration.
+"""
+import warnings
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from app.models.model import Model
+from app.services.data.dataset_store import dataset_store
+from app.services.modeling.training_service import TrainingService
+from app.services.modeling.model_cache import model_cache, model_version
+from app.services.forecasting.forecast_cache import forecast_cache
+
+
+class ModelRefreshService:
+    """Service for refreshing fitted models with new observations"""
+
+    @staticmethod
+    def extend_results(results, new_values: pd.Series):
+        """
+        Add observations to fitted SARIMAX results without re-estimating
+
+        Equivalent to results.append(new_values, refit=False): the model is
+        cloned on the combined series and filtered with the fitted params.
+        apply() is called on the combined series directly because append()
+        cannot concatenate the 1-D endog of models rebuilt by
+        SARIMAXSerializer under pandas 2.
+
+        Args:
+            results: Fitted SARIMAXResults without exogenous variables
+            new_values: Observations following the last fitted one
+
+        Returns:
+            SARIMAXResults over the whole series, with the same params
+        """
+        model = results.model
+        history = np.asarray(model.data.orig_endog, dtype=float).reshape(-1)
+        values = np.concatenate([history, new_values.to_numpy(dtype=float)])
+
+        index = model._index
+        if isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index.append(pd.DatetimeIndex(new_values.index)))
+        else:
+            # Dates were not usable for the original fit; keep counting rows
+            index = pd.RangeIndex(index.start, index.start + index.step * len(values), index.step)
+
+        endog = pd.Series(values, index=index, name=model.endog_names)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return results.apply(endog, refit=False)
+
+    @staticmethod
+    def apply_to_series(results, series: pd.Series):
+        """
+        Run fitted SARIMAX parameters over another series
+
+        Used to forecast the other series of a panel dataset with a model
+        trained on one of them: one filter pass, no estimation.
+
+        Args:
+            results: Fitted SARIMAXResults without exogenous variables
+            series: Observations of the other series, indexed by date
+
+        Returns:
+            SARIMAXResults over the series, with the same params
+
+        Raises:
+            ValueError: If the model uses exogenous variables
+        """
+        if results.model.exog is not None:
+            raise ValueError("Models with exogenous variables cannot be applied to another series")
+        endog = pd.Series(series.to_numpy(dtype=float), index=pd.DatetimeIndex(series.index), name=results.model.endog_names)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return results.apply(endog, refit=False)
+
+    @staticmethod
+    def refresh_dataset_models(db, dataset) -> List[Dict[str, Any]]:
+        """
+        Bring the models trained on a dataset up to its current version
+
+        Models that cannot be extended in place (ARTFIMA, SARIMAX with
+        exogenous variables) are reported as skipped and need retraining.
+
+        Args:
+            db: Database session
+            dataset: Dataset row whose rows were appended
+
+        Returns:
+            One dict per model with model_id, name, status ("refreshed",
+            "up_to_date", "skipped" or "failed") and details
+        """
+        models = (
+            db.query(Model)
+            .filter(Model.dataset_id == dataset.id)
+            .order_by(Model.created_at)
+            .all()
+        )
+
+        series_cache: Dict[tuple, pd.Series] = {}
+        outcomes = []
+        for model in models:
+            outcome = {"model_id": model.id, "name": model.name}
+            outcomes.append(outcome)
+            source = model.data_source or {}
+
+            if model.type != "SARIMAX":
+                outcome.update(status="skipped", reason=f"{model.type} models must be retrained")
+                continue
+            if not source.get("end_date"):
+                outcome.update(status="skipped", reason="Model has no record of its training data")
+                continue
+
+            try:
+                fitted = model_cache.get_fitted_model(model)
+                if fitted.model.exog is not None:
+                    outcome.update(
+                        status="skipped",
+                        reason="Models with exogenous variables need values for the new rows and must be retrained",
+                    )
+                    continue
+
+                date_column, target_column = source["date_column"], source["target_column"]
+                series_id = source.get("series_id")
+                key = (date_column, target_column, series_id)
+                if key not in series_cache:
+                    df = dataset_store.load_series(dataset, [date_column, target_column], series_id)
+                    if date_column not in df.columns or target_column not in df.columns:
+                        raise ValueError(f"Columns '{date_column}' and '{target_column}' are no longer in the dataset")
+                    series = pd.Series(
+                        df[target_column].to_numpy(),
+                        index=pd.to_datetime(df[date_column]),
+                    ).dropna()
+                    series_cache[key] = series
+                series = series_cache[key]
+
+                new_values = series[series.index > pd.Timestamp(source["end_date"])].sort_index()
+                if new_values.empty:
+                    # Only write the row if it has not seen this version yet
+                    if model.dataset_version != dataset.version:
+                        model.dataset_version = dataset.version
+                        db.commit()
+                    outcome.update(status="up_to_date", new_observations=0)
+                    continue
+
+                refreshed = ModelRefreshService.extend_results(fitted, new_values)
+
+                model.model_data = TrainingService._serialize_model(refreshed)
+                # Incremented in SQL, so concurrent refreshes still get distinct versions
+                model.data_version = Model.data_version + 1
+                model.summary = str(refreshed.summary())
+                model.dataset_version = dataset.version
+                model.data_source = {**source, "end_date": new_values.index[-1].isoformat()}
+                if model.metrics:
+                    model.metrics.aic = float(refreshed.aic)
+                    model.metrics.bic = float(refreshed.bic)
+                    model.metrics.hqic = float(refreshed.hqic)
+                db.commit()
+                db.refresh(model)
+
+                # Serve the refreshed results straight away; cached forecasts are stale
+                model_cache.put(model.id, refreshed, model_version(model))
+                forecast_cache.invalidate(model.id)
+
+                outcome.update(
+                    status="refreshed",
+                    new_observations=int(len(new_values)),
+                    nobs=int(refreshed.nobs),
+                )
+            except Exception as e:
+                db.rollback()
+                print(f"Warning: Could not refresh model {model.id}: {e}")
+                outcome.update(status="failed", reason=str(e))
+
+        return outcomes
@@ -0,0 +1,220 @@
+"""
+Compact SARIMAX model persistence
+
+Instead of pickling the full SARIMAXResults (data, filter output and
+smoother matrices), only the model specification, the fitted parameters,
+their covariance and the observed data are stored. Loading rebuilds the
+model and runs a single Kalman filter pass with the parameters held fixed,
+which gives the same forecasts as the original results object. The stored
+covariance is attached as is, so loading skips the numerical
+differentiation filter() would otherwise run to estimate it, and
+summary() and standard errors match the original fit. Version 1 payloads
+carry no covariance; it is recomputed for them.
+
+Layout (all integers little-endian):
+
+    magic        8 bytes   b"SARIMAX\\0"
+    version      uint16
+    reserved     uint16
+    header_len   uint32
+    header       JSON, padded with spaces to an 8-byte boundary
+    data         float64 / int64 arrays, back to back
+"""
+import json
+import struct
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from typing import Dict, Any, Tuple
+
+
+class SARIMAXSerializer:
+    """Serialize fitted SARIMAX models as spec + params + data"""
+
+    FORMAT_MAGIC = b"SARIMAX\x00"
+    FORMAT_VERSION = 2
+
+    _PREAMBLE = struct.Struct("<8sHHI")
+
+    @staticmethod
+    def is_compact_payload(payload: bytes) -> bool:
+        """Check whether decoded model data uses the compact SARIMAX format"""
+        magic = SARIMAXSerializer.FORMAT_MAGIC
+        return bytes(payload[:len(magic)]) == magic
+
+    @staticmethod
+    def _index_spec(index: pd.Index) -> Tuple[Dict[str, Any], np.ndarray]:
+        """
+        Describe the endog index
+
+        Regular date indexes are stored as start + freq; anything else
+        keeps the full array of timestamps.
+        """
+        if isinstance(index, pd.DatetimeIndex):
+            if index.freq is not None and len(index) > 0:
+                return {
+                    "kind": "date_range",
+                    "start": index[0].isoformat(),
+                    "freq": index.freqstr,
+                }, None
+            return {"kind": "datetime"}, index.asi8.astype("<i8")
+        if isinstance(index, pd.RangeIndex):
+            return {"kind": "range", "start": int(index.start), "step": int(index.step)}, None
+        raise ValueError(f"Unsupported index type for SARIMAX persistence: {type(index).__name__}")
+
+    @staticmethod
+    def _build_index(spec: Dict[str, Any], nobs: int, stamps: np.ndarray) -> pd.Index:
+        """Rebuild the endog index from its description"""
+        kind = spec["kind"]
+        if kind == "date_range":
+            return pd.date_range(spec["start"], periods=nobs, freq=spec["freq"])
+        if kind == "datetime":
+            return pd.DatetimeIndex(stamps.astype("datetime64[ns]"))
+        if kind == "range":
+            return pd.RangeIndex(spec["start"], spec["start"] + spec["step"] * nobs, spec["step"])
+        raise ValueError(f"Unknown index kind: {kind}")
+
+    @staticmethod
+    def to_bytes(results) -> bytes:
+        """
+        Serialize fitted SARIMAX results
+
+        Args:
+            results: Fitted SARIMAXResults
+
+        Returns:
+            Serialized model
+        """
+        model = results.model
+        endog = pd.Series(np.asarray(model.data.orig_endog).reshape(-1), index=model._index)
+        initialization = model.ssm.initialization.initialization_type
+
+        arrays = {
+            "endog": np.ascontiguousarray(endog.values, dtype="<f8"),
+            "params": np.ascontiguousarray(results.params, dtype="<f8"),
+        }
+
+        cov_type = results.cov_type
+        if cov_type != "none":
+            arrays["cov_params"] = np.ascontiguousarray(results.cov_params_default, dtype="<f8")
+
+        index_spec, stamps = SARIMAXSerializer._index_spec(endog.index)
+        if stamps is not None:
+            arrays["index"] = stamps
+
+        exog_names = None
+        if model.exog is not None:
+            arrays["exog"] = np.ascontiguousarray(model.exog, dtype="<f8")
+            exog_names = list(model.exog_names)
+
+        spec = {
+            "order": list(model.order),
+            "seasonal_order": list(model.seasonal_order),
+            "trend": model.trend,
+            "enforce_stationarity": bool(model.enforce_stationarity),
+            "enforce_invertibility": bool(model.enforce_invertibility),
+            "initialization": (
+                "approximate_diffuse" if initialization == "approximate_diffuse" else None
+            ),
+            "endog_name": model.endog_names,
+            "exog_names": exog_names,
+            "param_names": list(model.param_names),
+            "index": index_spec,
+            "cov_type": cov_type,
+            "cov_description": (getattr(results, "cov_kwds", None) or {}).get("description"),
+        }
+
+        layout = {}
+        chunks = []
+        offset = 0
+        for name, arr in arrays.items():
+            layout[name] = [offset, arr.dtype.str, list(arr.shape)]
+            chunks.append(arr.tobytes())
+            offset += arr.nbytes
+
+        header = json.dumps({"spec": spec, "arrays": layout}).encode("utf-8")
+        preamble_size = SARIMAXSerializer._PREAMBLE.size
+        header += b" " * ((-(preamble_size + len(header))) % 8)
+        preamble = SARIMAXSerializer._PREAMBLE.pack(
+            SARIMAXSerializer.FORMAT_MAGIC, SARIMAXSerializer.FORMAT_VERSION, 0, len(header)
+        )
+        return b"".join([preamble, header] + chunks)
+
+    @staticmethod
+    def from_bytes(payload: bytes):
+        """
+        Rebuild fitted SARIMAX results from the compact format
+
+        Args:
+            payload: Data produced by to_bytes
+
+        Returns:
+            SARIMAXResults from filtering the stored data with the stored params
+
+        Raises:
+            ValueError: If the payload is not in the compact format or uses a newer version
+        """
+        preamble = SARIMAXSerializer._PREAMBLE
+        if len(payload) < preamble.size:
+            raise ValueError("Payload is too short for a SARIMAX model")
+        magic, version, _, header_len = preamble.unpack_from(payload, 0)
+        if magic != SARIMAXSerializer.FORMAT_MAGIC:
+            raise ValueError("Payload is not a compact SARIMAX model")
+        if version > SARIMAXSerializer.FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported SARIMAX model format version {version} "
+                f"(this service reads up to {SARIMAXSerializer.FORMAT_VERSION})"
+            )
+
+        data_start = preamble.size + header_len
+        header = json.loads(bytes(payload[preamble.size:data_start]).decode("utf-8"))
+        spec = header["spec"]
+
+        arrays = {}
+        for name, (offset, dtype, shape) in header["arrays"].items():
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape)) if shape else 1
+            arrays[name] = np.frombuffer(
+                payload, dtype=dtype, count=count, offset=data_start + offset
+            ).reshape(shape)
+
+        endog_values = arrays["endog"]
+        index = SARIMAXSerializer._build_index(spec["index"], len(endog_values), arrays.get("index"))
+        endog = pd.Series(endog_values, index=index, name=spec["endog_name"])
+
+        exog = None
+        if "exog" in arrays:
+            exog = pd.DataFrame(arrays["exog"], index=index, columns=spec["exog_names"])
+
+        kwargs = {}
+        if spec["initialization"]:
+            kwargs["initialization"] = spec["initialization"]
+
+        mod = sm.tsa.statespace.SARIMAX(
+            endog,
+            order=tuple(spec["order"]),
+            exog=exog,
+            seasonal_order=tuple(spec["seasonal_order"]),
+            trend=spec["trend"],
+            enforce_stationarity=spec["enforce_stationarity"],
+            enforce_invertibility=spec["enforce_invertibility"],
+            **kwargs
+        )
+
+        if list(mod.param_names) != spec["param_names"]:
+            raise ValueError("Stored SARIMAX parameters do not match the rebuilt model")
+
+        params = pd.Series(arrays["params"], index=mod.param_names)
+        if version < 2:
+            return mod.filter(params)
+        if "cov_params" not in arrays:
+            return mod.filter(params, cov_type="none")
+        return mod.filter(
+            params,
+            cov_type="custom",
+            cov_kwds={
+                "custom_cov_type": spec["cov_type"],
+                "custom_cov_params": np.array(arrays["cov_params"]),
+                "custom_description": spec["cov_description"] or f"Covariance matrix of the original fit ({spec['cov_type']})",
+            },
+        )
@@ -7,6 +7,7 @@ import statsmodels.api as sm
 import pickle
 import base64
 from typing import Optional, Dict, Any
+from app.services.modeling.sarimax_serialization import SARIMAXSerializer
 
 
 class TrainingService:
@@ -114,15 +115,30 @@ class TrainingService:
     
     @staticmethod
     def _serialize_model(model) -> str:
-        """Serialize model to base64 string"""
-        pickled = pickle.dumps(model)
-        return base64.b64encode(pickled).decode('utf-8')
+        """
+        Serialize model to base64 string
+
+        Stores the spec, fitted params and data in the compact SARIMAX
+        format rather than pickling the full results object.
+        """
+        return base64.b64encode(SARIMAXSerializer.to_bytes(model)).decode('utf-8')
     
     @staticmethod
     def deserialize_model(model_data: str):
         """Deserialize model from base64 string"""
-        pickled = base64.b64decode(model_data.encode('utf-8'))
-        return pickle.loads(pickled)
+        payload = base64.b64decode(model_data.encode('utf-8'))
+        
+        # SARIMAX models are rebuilt from spec + params with a single filter pass
+        if SARIMAXSerializer.is_compact_payload(payload):
+            return SARIMAXSerializer.from_bytes(payload)
+        
+        # ARTFIMA results are stored in their own compact format
+        from app.services.modeling.artfima_training_service import ARTFIMATrainingService
+        if ARTFIMATrainingService.is_compact_payload(payload):
+            return ARTFIMATrainingService.load_model(payload)
+        
+        # Legacy rows hold a pickled results object
+        return pickle.loads(payload)
     
     @staticmethod
     def train_model(
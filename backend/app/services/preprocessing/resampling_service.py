@@ -0,0 +1,119 @@
+"""
+Resampling service - roll a time series up to a coarser frequency
+"""
+import pandas as pd
+from typing import List, Optional
+
+
+class ResamplingService:
+    """Service for resampling dataset columns to a target frequency"""
+
+    # Frequency labels used across the API, plus their pandas offsets.
+    # Raw pandas offset aliases (e.g. "15min", "W-MON") are accepted as well.
+    FREQUENCY_MAP = {
+        'Hourly': 'h',
+        'Daily': 'D',
+        'Weekly': 'W',
+        'Monthly': 'MS',
+        'Quarterly': 'QS',
+        'Yearly': 'YS',
+    }
+
+    AGGREGATORS = ("sum", "mean", "median", "min", "max", "first", "last", "count", "ohlc", "quantile")
+
+    @staticmethod
+    def resolve_frequency(frequency: str) -> str:
+        """
+        Map a frequency label or pandas offset alias to an offset alias
+
+        Raises:
+            ValueError: If the frequency is not recognised
+        """
+        freq = ResamplingService.FREQUENCY_MAP.get(frequency, frequency)
+        try:
+            pd.tseries.frequencies.to_offset(freq)
+        except ValueError:
+            raise ValueError(
+                f"Unknown frequency: {frequency}. Use one of {list(ResamplingService.FREQUENCY_MAP)} "
+                "or a pandas offset alias"
+            )
+        return freq
+
+    @staticmethod
+    def resample(
+        df: pd.DataFrame,
+        date_column: str,
+        columns: List[str],
+        frequency: str,
+        aggregator: str = "mean",
+        quantiles: Optional[List[float]] = None,
+    ) -> pd.DataFrame:
+        """
+        Resample columns of a DataFrame to a target frequency
+
+        Empty periods are left as NaN (sum and count included) rather
+        than filled with zeros, so gaps stay visible to later steps.
+
+        Args:
+            df: DataFrame with the date column and the columns to aggregate
+            date_column: Column holding the timestamps
+            columns: Numeric columns to aggregate
+            frequency: Frequency label (Hourly, Daily, ...) or pandas offset alias
+            aggregator: One of AGGREGATORS
+            quantiles: Quantiles in [0, 1] when aggregator is "quantile"
+
+        Returns:
+            DataFrame with date_column first, then the aggregated columns.
+            Single-value aggregators keep the column names; ohlc adds
+            <col>_open/_high/_low/_close and quantile adds <col>_q<pct>.
+
+        Raises:
+            ValueError: If a column, the frequency or the aggregator is invalid
+        """
+        if aggregator not in ResamplingService.AGGREGATORS:
+            raise ValueError(
+                f"Unknown aggregator '{aggregator}'. Use one of: {', '.join(ResamplingService.AGGREGATORS)}"
+            )
+        if aggregator == "quantile":
+            if not quantiles:
+                raise ValueError("quantiles are required for the quantile aggregator")
+            if any(not 0 <= q <= 1 for q in quantiles):
+                raise ValueError("quantiles must be between 0 and 1")
+        if not columns:
+            raise ValueError("At least one column is required")
+
+        for name in [date_column] + columns:
+            if name not in df.columns:
+                raise ValueError(f"Column '{name}' not found in dataset")
+        if not pd.api.types.is_datetime64_dtype(df[date_column]):
+            raise ValueError(f"Column '{date_column}' does not contain dates")
+        for name in columns:
+            if not pd.api.types.is_numeric_dtype(df[name]):
+                raise ValueError(f"Column '{name}' is not numeric")
+
+        freq = ResamplingService.resolve_frequency(frequency)
+        data = df[columns].set_axis(pd.DatetimeIndex(df[date_column]), axis=0)
+        data = data[data.index.notna()].sort_index()
+        resampler = data.resample(freq)
+
+        if aggregator in ("sum", "count"):
+            result = resampler.sum(min_count=1) if aggregator == "sum" else resampler.count()
+            if aggregator == "count":
+                # Periods with no rows at all are gaps, not zero counts
+                result = result.where(resampler.size().reindex(result.index) > 0)
+        elif aggregator == "ohlc":
+            result = resampler.ohlc()
+            result.columns = [f"{col}_{field}" for col, field in result.columns]
+        elif aggregator == "quantile":
+            parts = []
+            for q in quantiles:
+                part = resampler.quantile(q)
+                part.columns = [f"{col}_q{round(q * 100, 4):g}" for col in part.columns]
+                parts.append(part)
+            result = pd.concat(parts, axis=1)
+            result = result[[f"{col}_q{round(q * 100, 4):g}" for col in columns for q in quantiles]]
+        else:
+            result = getattr(resampler, aggregator)()
+
+        result.index.name = date_column
+        return result.reset_index()
@@ -2,12 +2,15 @@
 Celery application configuration
 """
 from celery import Celery
+from celery.signals import worker_init
 from app.core.config import settings
+from app.tasks.routing import route_task
 
 celery_app = Celery(
     "timelab",
     broker=settings.CELERY_BROKER_URL,
     backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.tasks.model_tasks", "app.tasks.job_tasks"],
 )
 
 celery_app.conf.update(
@@ -16,5 +19,23 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="UTC",
     enable_utc=True,
+    # Fast and heavy queues by estimated run time (see app.tasks.routing)
+    task_default_queue=settings.CELERY_FAST_QUEUE,
+    task_routes=(route_task,),
 )
 
+
+@worker_init.connect
+def preload_modeling_libraries(**kwargs):
+    """
+    Import the model libraries before the pool starts
+
+    Prefork children inherit the imports, so the first task of each child
+    does not pay seconds of statsmodels/scipy import time.
+    """
+    import statsmodels.tsa.statespace.sarimax  # noqa: F401
+    import statsmodels.tsa.stattools  # noqa: F401
+    try:
+        import app.services.modeling.artfima_training_service  # noqa: F401
+    except ImportError as e:
+        print(f"Warning: Could not preload artfima_python: {e}")
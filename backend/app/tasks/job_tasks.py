@@ -0,0 +1,348 @@
+"""
+Async jobs for heavy endpoints
+
+Training, stationarity tests, forecasts and leaderboards also run as jobs: POST
+/jobs/{kind} stores the request as a Job row and returns its id, the work
+runs elsewhere, and GET /jobs/{job_id} returns the status and, once done,
+the response the synchronous endpoint would have returned (or its error
+and HTTP status). Results live in the jobs table, so they outlive the
+worker and the request that started them.
+
+Jobs run on Celery when its broker answers (routed by estimated cost like
+every task, see app.tasks.routing), otherwise in a process pool of the
+API process, so the same API works with and without Redis. JOB_BACKEND
+forces either one.
+
+A running job refreshes its heartbeat_at every JOB_HEARTBEAT_SECONDS. A
+job whose heartbeat stops (its worker died, or the API process holding
+the local pool was restarted) is marked failed by GET /jobs/{job_id}. A
+job is run at most once: a message redelivered after its worker died
+finds the job "running" and does not start it again.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import Job
+from app.tasks.celery_app import celery_app
+from app.tasks.routing import cost_estimator, estimate_fit_seconds
+
+# Seconds assumed for jobs too cheap to model (an ADF test, a forecast)
+LIGHT_JOB_SECONDS = 1.0
+
+
+def _train(params: Dict[str, Any], db) -> Any:
+    from app.api.v1.models import run_training
+    from app.schemas.model import TrainModelRequest
+
+    return run_training(TrainModelRequest.model_validate(params), db)
+
+
+def _stationarity(params: Dict[str, Any], db) -> Any:
+    from app.api.v1.preprocessing import run_stationarity_test
+    from app.schemas.preprocessing import StationarityTestRequest
+
+    return run_stationarity_test(StationarityTestRequest.model_validate(params), db)
+
+
+def _forecast(params: Dict[str, Any], db) -> Any:
+    from app.api.v1.models import run_forecast
+    from app.schemas.model import ForecastRequest
+
+    params = dict(params)
+    model_id = params.pop("model_id")
+    return run_forecast(model_id, ForecastRequest.model_validate(params), db)
+
+
+def _leaderboard(params: Dict[str, Any], db) -> Any:
+    from app.api.v1.models import run_leaderboard
+    from app.schemas.model import LeaderboardRequest
+
+    return run_leaderboard(LeaderboardRequest.model_validate(params), db)
+
+
+# Job kind -> function(params, db) returning the synchronous endpoint's response
+JOB_HANDLERS: Dict[str, Callable[[Dict[str, Any], Any], Any]] = {
+    "train": _train,
+    "stationarity": _stationarity,
+    "forecast": _forecast,
+    "leaderboard": _leaderboard,
+}
+
+
+def _series_length(params: Dict[str, Any], db) -> Optional[int]:
+    """Observations of a request's series: timeseries_data, or the dataset's rows"""
+    if params.get("timeseries_data"):
+        return len(params["timeseries_data"])
+    if params.get("dataset_id"):
+        from app.models.dataset import Dataset
+        from app.services.data.dataset_store import dataset_store
+
+        dataset = db.query(Dataset).filter(Dataset.id == params["dataset_id"]).first()
+        if dataset is None:
+            return None
+        panel = dataset_store.panel_config(dataset)
+        if panel and panel.get("series_count"):
+            return -(-dataset.row_count // panel["series_count"])
+        return dataset.row_count
+    return None
+
+
+def estimate_job_seconds(kind: str, params: Dict[str, Any], db) -> float:
+    """Rough run time of a job, for routing it to the fast or heavy queue"""
+    if kind == "leaderboard":
+        return params.get("budget_seconds") or settings.LEADERBOARD_DEFAULT_BUDGET
+    if kind != "train":
+        return LIGHT_JOB_SECONDS
+    n_obs = _series_length(params, db)
+    if (params.get("model_type") or "SARIMAX").upper() == "ARTFIMA":
+        order = params.get("artfima_parameters") or {}
+        return estimate_fit_seconds(order.get("glp", "ARTFIMA"), n_obs, order)
+    return estimate_fit_seconds("SARIMAX", n_obs, params.get("parameters") or {})
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamps read back from SQLite are naive UTC"""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def expire_stale_job(db, job: Job) -> bool:
+    """
+    Fail a running job whose heartbeat is more than four JOB_HEARTBEAT_SECONDS old
+
+    Returns:
+        Whether the job was marked failed
+    """
+    if job.status != "running":
+        return False
+    heartbeat = _aware(job.heartbeat_at or job.started_at)
+    if heartbeat is not None and (_now() - heartbeat).total_seconds() <= 4 * settings.JOB_HEARTBEAT_SECONDS:
+        return False
+    job.status = "failed"
+    job.error = "Job interrupted: the process running it stopped"
+    job.error_status = 500
+    job.finished_at = heartbeat or _now()
+    db.commit()
+    return True
+
+
+def _heartbeat(job_id: str, stop: threading.Event) -> None:
+    """Refresh a running job's heartbeat_at until stop is set"""
+    while not stop.wait(settings.JOB_HEARTBEAT_SECONDS):
+        db = SessionLocal()
+        try:
+            db.query(Job).filter(Job.id == job_id).update({"heartbeat_at": _now()}, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            print(f"Warning: Could not record job {job_id} heartbeat: {e}")
+        finally:
+            db.close()
+
+
+def run_job(job_id: str) -> Optional[str]:
+    """
+    Run a stored job and store its outcome
+
+    Runs in a Celery worker or a local pool process. A job already
+    finished is not run again, and neither is a job already "running": a
+    message redelivered after its worker died (e.g. killed by a fit
+    running out of memory) would otherwise rerun it forever. Such a job is
+    failed here once its heartbeat is stale, or later by GET /jobs/{job_id}.
+
+    Returns:
+        Final status (or "running"), or None if the job does not exist
+    """
+    db = SessionLocal()
+    stop = threading.Event()
+    try:
+        job = db.query(Job).filter(Job.id == job_id).first()
+        if job is None:
+            return None
+        if job.status in ("completed", "failed"):
+            return job.status
+        if job.status == "running":
+            expire_stale_job(db, job)
+            return job.status
+        job.status = "running"
+        job.started_at = _now()
+        job.heartbeat_at = job.started_at
+        db.commit()
+        kind, params = job.kind, dict(job.params)
+        threading.Thread(target=_heartbeat, args=(job_id, stop), name=f"job-{job_id}-heartbeat", daemon=True).start()
+
+        result, error, error_status = None, None, None
+        try:
+            result = jsonable_encoder(JOB_HANDLERS[kind](params, db))
+        except HTTPException as e:
+            error, error_status = str(e.detail), e.status_code
+        except Exception as e:
+            error, error_status = str(e), 500
+        db.rollback()
+
+        job = db.query(Job).filter(Job.id == job_id).first()
+        job.status = "failed" if error is not None else "completed"
+        job.result = result
+        job.error = error
+        job.error_status = error_status
+        job.finished_at = _now()
+        db.commit()
+        return job.status
+    finally:
+        stop.set()
+        db.close()
+
+
+@celery_app.task(name="job_task", acks_late=True, reject_on_worker_lost=True)
+def job_task(job_id: str, kind: str, estimated_seconds: float = None):
+    """
+    Run a job on a Celery worker
+
+    Args:
+        job_id: Job id (also this task's id)
+        kind: Job kind, for logs
+        estimated_seconds: Cost estimate, for routing
+
+    Returns:
+        Final status of the job
+    """
+    return run_job(job_id)
+
+
+@cost_estimator("job_task")
+def _job_seconds(arguments: dict) -> Optional[float]:
+    return arguments["estimated_seconds"]
+
+
+class JobDispatcher:
+    """Sends jobs to Celery, or to a local process pool when the broker is unreachable"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._broker_checked_at = 0.0
+        self._broker_up = False
+
+    def broker_available(self) -> bool:
+        """Whether the Celery broker answers; checked at most every JOB_BROKER_CHECK_SECONDS"""
+        if celery_app.conf.task_always_eager:
+            return True
+        with self._lock:
+            if time.monotonic() - self._broker_checked_at < settings.JOB_BROKER_CHECK_SECONDS:
+                return self._broker_up
+        try:
+            with celery_app.connection_for_write() as connection:
+                connection.ensure_connection(max_retries=1, interval_start=0, interval_step=0, timeout=1)
+            up = True
+        except Exception:
+            up = False
+        with self._lock:
+            self._broker_up = up
+            self._broker_checked_at = time.monotonic()
+        return up
+
+    def backend(self) -> str:
+        """Backend for the next job: "celery" or "local" """
+        if settings.JOB_BACKEND in ("celery", "local"):
+            return settings.JOB_BACKEND
+        return "celery" if self.broker_available() else "local"
+
+    def _local_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                workers = settings.JOB_LOCAL_MAX_WORKERS or os.cpu_count() or 1
+                # Spawned workers do not inherit the server's threads, locks or open connections
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def _local_done(self, job_id: str, future: Future) -> None:
+        """Fail a job whose pool process died before it could store an outcome"""
+        try:
+            future.result()
+            return
+        except Exception as e:
+            error = f"Worker failed: {e}"
+        with self._lock:
+            # A dead process breaks the whole pool; start a fresh one next time
+            self._pool = None
+        db = SessionLocal()
+        try:
+            job = db.query(Job).filter(Job.id == job_id).first()
+            if job is not None and job.status not in ("completed", "failed"):
+                job.status = "failed"
+                job.error = error
+                job.error_status = 500
+                job.finished_at = _now()
+                db.commit()
+        finally:
+            db.close()
+
+    def submit(self, db, kind: str, params: Dict[str, Any]) -> Job:
+        """
+        Store a job and start it
+
+        Args:
+            db: Database session
+            kind: Job kind (a key of JOB_HANDLERS)
+            params: Request body of the equivalent synchronous endpoint
+                (with model_id for forecasts)
+
+        Returns:
+            The stored job
+
+        Raises:
+            ValueError: If the kind is unknown
+        """
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind '{kind}'")
+        params = jsonable_encoder(params)
+        job = Job(
+            kind=kind,
+            status="pending",
+            params=params,
+            estimated_seconds=estimate_job_seconds(kind, params, db),
+            backend=self.backend(),
+        )
+        db.add(job)
+        db.commit()
+
+        if job.backend == "celery":
+            try:
+                job_task.apply_async(args=(job.id, kind, job.estimated_seconds), task_id=job.id)
+            except Exception as e:
+                print(f"Warning: Could not queue job on Celery, running it locally: {e}")
+                with self._lock:
+                    self._broker_up = False
+                    self._broker_checked_at = time.monotonic()
+                job.backend = "local"
+                db.commit()
+        if job.backend == "local":
+            job_id = job.id
+            future = self._local_pool().submit(run_job, job_id)
+            future.add_done_callback(lambda f: self._local_done(job_id, f))
+        db.refresh(job)
+        return job
+
+    def shutdown(self) -> None:
+        """Stop the local pool (jobs still running in it are abandoned)"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+job_dispatcher = JobDispatcher()
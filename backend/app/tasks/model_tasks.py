@@ -1,13 +1,163 @@
 """
 Celery tasks for model operations
 """
+import uuid
 import pandas as pd
+from celery import chord
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.grid_search import GridSearchRun, GridSearchCandidate
 from app.tasks.celery_app import celery_app
-from app.services.modeling.grid_search_service import GridSearchService
+from app.services.modeling.grid_search_service import GridSearchService, SearchCancelled
+from app.services.modeling.candidate_store import CandidateFitStore
+from app.services.data.series_artifacts import blob_ref, resolve_series_ref
+from app.tasks.routing import cost_class, cost_estimator, estimate_fit_seconds, series_length
 
 
-@celery_app.task(name="grid_search_task")
+def _deserialize(train_data_dict: dict, exog_dict: dict = None, data_ref: dict = None):
+    """Rebuild the training series and exogenous frame from task arguments"""
+    if data_ref is not None:
+        return resolve_series_ref(data_ref)
+
+    train_data = pd.Series(train_data_dict)
+    train_data.index = pd.to_datetime(train_data.index)
+
+    exog = None
+    if exog_dict:
+        exog = pd.DataFrame(exog_dict)
+        # Rows of exog_dict lists are observations of the series
+        exog.index = train_data.index[:len(exog)]
+    return train_data, exog
+
+
+def _save_candidate(db, run_id: str, result: dict) -> None:
+    """Store one fitted candidate; a retried subtask overwrites its earlier row"""
+    candidate = (
+        db.query(GridSearchCandidate)
+        .filter(GridSearchCandidate.run_id == run_id, GridSearchCandidate.position == result["position"])
+        .first()
+    )
+    if candidate is None:
+        candidate = GridSearchCandidate(run_id=run_id, position=result["position"])
+        db.add(candidate)
+    candidate.order = result["order"]
+    candidate.aic = result["aic"]
+    candidate.bic = result["bic"]
+    candidate.hqic = result["hqic"]
+    candidate.fit_seconds = result["fit_seconds"]
+    candidate.converged = result["converged"]
+    candidate.iterations = result.get("iterations")
+    candidate.phase = result.get("phase")
+    candidate.error = result["error"]
+    db.commit()
+
+
+def _is_cancelled(db, run_id: str) -> bool:
+    """Whether DELETE /models/grid-search/{task_id} was called for the run"""
+    status = db.query(GridSearchRun.status).filter(GridSearchRun.id == run_id).scalar()
+    return status == "cancelled"
+
+
+def _fitted_candidates(db, run_id: str) -> list:
+    """Candidates of a run saved so far, as fit results"""
+    rows = db.query(GridSearchCandidate).filter(GridSearchCandidate.run_id == run_id).all()
+    return [
+        {
+            "position": c.position,
+            "order": c.order,
+            "aic": c.aic,
+            "bic": c.bic,
+            "hqic": c.hqic,
+            "error": c.error,
+        }
+        for c in rows
+    ]
+
+
+def grid_search_run(
+    run_id: str,
+    p_range: list,
+    q_range: list,
+    P_range: list,
+    Q_range: list,
+    d: int,
+    D: int,
+    s: int,
+    exog: bool,
+    search_strategy: str,
+    refine_top_k: int,
+    transformation: str,
+    data_ref: dict,
+    status: str = "queued"
+) -> GridSearchRun:
+    """
+    GridSearchRun row of a search, with its config and candidate count
+
+    Created as "queued" by POST /models/grid-search when the search is
+    submitted, so it can be watched and cancelled before a worker picks
+    it up; grid_search_task then moves it to "running".
+    """
+    total = len(GridSearchService.candidate_grid(p_range, q_range, P_range, Q_range, d, D, s))
+    if search_strategy == "stepwise":
+        # Upper bound: stepwise searches stop as soon as no neighbor improves
+        total = 1
+        for values in (p_range, q_range, P_range, Q_range):
+            total *= max(values) - min(values) + 1
+    return GridSearchRun(
+        id=run_id,
+        status=status,
+        config={
+            "p_range": p_range,
+            "q_range": q_range,
+            "P_range": P_range,
+            "Q_range": Q_range,
+            "d": d,
+            "D": D,
+            "s": s,
+            "exog": exog,
+            "data_ref": data_ref,
+            "search_strategy": search_strategy,
+            "refine_top_k": refine_top_k,
+            "transformation": transformation,
+        },
+        total=total,
+    )
+
+
+def _fits_seconds(arguments: dict, orders: list) -> float:
+    """Estimated run time of fitting the given orders on a task's series"""
+    n_obs = series_length(arguments["data_ref"], arguments["train_data_dict"])
+    return sum(estimate_fit_seconds("SARIMAX", n_obs, dict(zip("pdqPDQs", order))) for order in orders)
+
+
+@cost_estimator("grid_search_task")
+def _grid_search_seconds(arguments: dict) -> float:
+    """Grid searches only dispatch subtasks; two-phase and stepwise searches fit in the task"""
+    strategy = arguments["search_strategy"]
+    if strategy not in ("two_phase", "stepwise"):
+        return 0.0
+    grid = GridSearchService.candidate_grid(
+        arguments["p_range"], arguments["q_range"], arguments["P_range"], arguments["Q_range"],
+        arguments["d"], arguments["D"], arguments["s"],
+    )
+    full = _fits_seconds(arguments, grid)
+    mean = full / max(len(grid), 1)
+    if strategy == "stepwise":
+        # Typically visits a few dozen orders
+        return mean * min(len(grid), 30)
+    top_k = arguments["refine_top_k"] or settings.GRID_SEARCH_REFINE_TOP_K
+    # Screening fits stop after a fraction of the iterations
+    return 0.4 * full + mean * top_k
+
+
+@cost_estimator("grid_search_candidates_task")
+def _grid_search_candidates_seconds(arguments: dict) -> float:
+    return _fits_seconds(arguments, [order for _, order in arguments["candidates"]])
+
+
+@celery_app.task(name="grid_search_task", bind=True, acks_late=True, reject_on_worker_lost=True)
 def grid_search_task(
+    self,
     train_data_dict: dict,
     p_range: list,
     q_range: list,
@@ -16,42 +166,271 @@ def grid_search_task(
     d: int,
     D: int,
     s: int,
-    exog_dict: dict = None
+    exog_dict: dict = None,
+    search_strategy: str = "grid",
+    refine_top_k: int = None,
+    transformation: str = None,
+    data_ref: dict = None
 ):
     """
     Async task for grid search
-    
+
+    Records the run, then replaces itself with a chord: the grid is split
+    into grid_search_candidates_task subtasks that any worker can pick up,
+    and grid_search_select_task picks the best order once all have
+    finished. The chord's result becomes this task's result.
+
+    Two-phase and stepwise searches decide what to fit next from earlier
+    results, so they run within this task (see
+    GridSearchService.two_phase_search and stepwise_search).
+
+    Searches stop at the next candidate once cancelled with DELETE
+    /models/grid-search/{task_id}; the run then keeps the best order of
+    the candidates fitted until then.
+
+    Every search reads and writes the candidate fit store: candidates
+    fitted by an earlier search over the same data are not fitted again,
+    and a search redelivered after its worker died resumes from the
+    candidates it had already fitted.
+
+    The data is best passed as data_ref (see series_artifacts), which
+    subtasks receive in place of the series; a search given
+    train_data_dict writes it to the artifact store once, so the chord
+    still carries only a reference.
+
     Args:
-        train_data_dict: Serialized time series data
+        train_data_dict: Serialized time series data (None with data_ref)
         p_range, q_range, P_range, Q_range: Parameter ranges
         d, D, s: Fixed parameters
         exog_dict: Optional exogenous variables
-        
+        search_strategy: "grid", "two_phase" or "stepwise"
+        refine_top_k: Candidates refitted in two-phase searches
+        transformation: Transformation applied to the series, part of the
+            candidate fit store key
+        data_ref: Reference to the series (and exogenous variables)
+
     Returns:
         Best parameter tuple
     """
-    # Deserialize data
-    train_data = pd.Series(train_data_dict)
-    train_data.index = pd.to_datetime(train_data.index)
-    
-    exog = None
-    if exog_dict:
-        exog = pd.DataFrame(exog_dict)
-        exog.index = pd.to_datetime(exog.index)
-    
-    # Run grid search
-    best_params = GridSearchService.grid_search_arima(
-        train_data,
-        exog,
-        p_range,
-        q_range,
-        P_range,
-        Q_range,
-        d,
-        D,
-        s
-    )
-    
+    run_id = self.request.id
+    grid = GridSearchService.candidate_grid(p_range, q_range, P_range, Q_range, d, D, s)
+
+    db = SessionLocal()
+    try:
+        if _is_cancelled(db, run_id):
+            # Cancelled while queued, or redelivered after the search was cancelled
+            return None
+        try:
+            train_data, exog = _deserialize(train_data_dict, exog_dict, data_ref)
+        except (FileNotFoundError, ValueError) as e:
+            run = db.query(GridSearchRun).filter(GridSearchRun.id == run_id).first()
+            if run is None:
+                run = GridSearchRun(id=run_id, config={}, total=0)
+                db.add(run)
+            run.status = "failed"
+            run.error = str(e)
+            db.commit()
+            raise
+        running = grid_search_run(
+            run_id, p_range, q_range, P_range, Q_range, d, D, s, exog is not None,
+            search_strategy, refine_top_k, transformation, data_ref, status="running",
+        )
+        # Only a queued (or redelivered running) run moves to running: a
+        # cancel that landed since the check above is kept
+        updated = (
+            db.query(GridSearchRun)
+            .filter(GridSearchRun.id == run_id, GridSearchRun.status.in_(("queued", "running")))
+            .update(
+                {"status": "running", "config": running.config, "total": running.total},
+                synchronize_session=False,
+            )
+        )
+        if not updated:
+            if db.query(GridSearchRun.id).filter(GridSearchRun.id == run_id).first() is not None:
+                db.commit()
+                return None
+            # Submitted without a queued row (e.g. by an older API process)
+            db.add(running)
+        db.commit()
+    finally:
+        db.close()
+
+    store = CandidateFitStore.for_data(train_data, exog, transformation)
+
+    if search_strategy in ("two_phase", "stepwise") or self.request.is_eager:
+        # Search in this process (no workers to spread over under task_always_eager)
+        db = SessionLocal()
+        try:
+            def save(result: dict) -> None:
+                _save_candidate(db, run_id, result)
+                if _is_cancelled(db, run_id):
+                    raise SearchCancelled()
+
+            if search_strategy == "two_phase":
+                best_params = GridSearchService.two_phase_search(
+                    train_data, exog, p_range, q_range, P_range, Q_range, d, D, s,
+                    top_k=refine_top_k, on_result=save, store=store,
+                )
+            elif search_strategy == "stepwise":
+                best_params = GridSearchService.stepwise_search(
+                    train_data, exog, p_range, q_range, P_range, Q_range, d, D, s,
+                    on_result=save, store=store,
+                )
+            else:
+                best_params = GridSearchService.grid_search_arima(
+                    train_data, exog, p_range, q_range, P_range, Q_range, d, D, s,
+                    on_result=save, store=store,
+                )
+        except SearchCancelled:
+            return grid_search_select_task.run([], run_id, d, D, s, cached=_fitted_candidates(db, run_id))
+        finally:
+            db.close()
+        return grid_search_select_task.run([], run_id, d, D, s, best_params=best_params)
+
+    # Only candidates missing from the store are sent to workers
+    cached = store.get_many(grid)
+    done = []
+    db = SessionLocal()
+    try:
+        for position, order in enumerate(grid):
+            if order in cached:
+                result = {"position": position, **cached[order]}
+                done.append(result)
+                _save_candidate(db, run_id, result)
+    finally:
+        db.close()
+    positions = [position for position, order in enumerate(grid) if order not in cached]
+    if not positions:
+        return grid_search_select_task.run([done], run_id, d, D, s)
+
+    if data_ref is None:
+        # Written once here instead of sent with every subtask
+        data_ref = blob_ref(train_data, exog)
+
+    # Subtasks are short, but together they are as long as the search: keep
+    # a long search's subtasks off the fast queue
+    queue = cost_class(_fits_seconds(
+        {"data_ref": data_ref, "train_data_dict": None}, [grid[position] for position in positions]
+    ))
+
+    chunk_size = max(1, settings.GRID_SEARCH_CHUNK_SIZE)
+    subtasks = [
+        grid_search_candidates_task.s(
+            run_id,
+            None,
+            [[position, list(grid[position])] for position in positions[i:i + chunk_size]],
+            None,
+            transformation,
+            data_ref,
+        ).set(task_id=str(uuid.uuid4()), queue=queue)
+        for i in range(0, len(positions), chunk_size)
+    ]
+
+    # Remember the subtask ids so a cancelled search can revoke them
+    db = SessionLocal()
+    try:
+        run = db.query(GridSearchRun).filter(GridSearchRun.id == run_id).first()
+        run.task_ids = [subtask.id for subtask in subtasks]
+        db.commit()
+    finally:
+        db.close()
+
+    select = grid_search_select_task.s(run_id, d, D, s, cached=done).on_error(grid_search_failed_task.s(run_id))
+    return self.replace(chord(subtasks, select))
+
+
+@celery_app.task(name="grid_search_candidates_task", acks_late=True, reject_on_worker_lost=True)
+def grid_search_candidates_task(
+    run_id: str,
+    train_data_dict: dict,
+    candidates: list,
+    exog_dict: dict = None,
+    transformation: str = None,
+    data_ref: dict = None
+):
+    """
+    Fit a slice of a grid search, saving each candidate as it finishes
+
+    Acknowledged only once done, so the slice is redelivered if the worker
+    dies; candidates it had already fitted then come from the store.
+    Returns early, with the candidates fitted so far, once the run is
+    cancelled.
+
+    Args:
+        run_id: Grid search run id
+        train_data_dict: Serialized time series data (None with data_ref)
+        candidates: [position, order] pairs to fit
+        exog_dict: Optional exogenous variables
+        transformation: Transformation applied to the series
+        data_ref: Reference to the series (and exogenous variables)
+
+    Returns:
+        Candidate results (position, order, criteria, fit time, converged, error)
+    """
+    train_data, exog = _deserialize(train_data_dict, exog_dict, data_ref)
+    store = CandidateFitStore.for_data(train_data, exog, transformation)
+    cached = store.get_many([tuple(order) for _, order in candidates])
+
+    results = []
+    db = SessionLocal()
+    try:
+        for position, order in candidates:
+            if _is_cancelled(db, run_id):
+                break
+            result = cached.get(tuple(order))
+            if result is None:
+                result = GridSearchService.fit_candidate(train_data, exog, tuple(order))
+                store.put(order, result)
+            result = {"position": position, **result}
+            results.append(result)
+            try:
+                _save_candidate(db, run_id, result)
+            except Exception as e:
+                db.rollback()
+                print(f"Warning: Could not save grid search candidate {order}: {e}")
+    finally:
+        db.close()
+    return results
+
+
+@celery_app.task(name="grid_search_select_task")
+def grid_search_select_task(
+    chunk_results: list,
+    run_id: str,
+    d: int,
+    D: int,
+    s: int,
+    best_params: list = None,
+    cached: list = None
+):
+    """
+    Pick the best order once every candidate of a grid search is fitted
+
+    Args:
+        chunk_results: Results of the grid_search_candidates_task subtasks
+        run_id: Grid search run id
+        d, D, s: Fixed parameters
+        best_params: Order already selected (in-process searches)
+        cached: Results taken from the candidate fit store up front
+
+    Returns:
+        Best parameter tuple
+    """
+    if best_params is None:
+        candidates = [result for chunk in chunk_results for result in chunk] + (cached or [])
+        best_params = GridSearchService.select_best(candidates, d, D, s)
+
+    db = SessionLocal()
+    try:
+        run = db.query(GridSearchRun).filter(GridSearchRun.id == run_id).first()
+        if run is not None:
+            if run.status != "cancelled":
+                run.status = "completed"
+            run.best_order = list(best_params)
+            db.commit()
+    finally:
+        db.close()
+
     return {
         "p": best_params[0],
         "d": best_params[1],
@@ -62,3 +441,16 @@ def grid_search_task(
         "s": best_params[6],
     }
 
+
+@celery_app.task(name="grid_search_failed_task")
+def grid_search_failed_task(request, exc, traceback, run_id: str):
+    """Mark a grid search run as failed when one of its tasks raised"""
+    db = SessionLocal()
+    try:
+        run = db.query(GridSearchRun).filter(GridSearchRun.id == run_id).first()
+        if run is not None and run.status != "cancelled":
+            run.status = "failed"
+            run.error = str(exc)
+            db.commit()
+    finally:
+        db.close()
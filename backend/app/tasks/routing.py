@@ -0,0 +1,123 @@
+"""
+Cost-aware task routing
+
+With a single queue a few-second job waits behind whatever long search
+was queued before it. Every task message is routed by its estimated run
+time instead: tasks expected to finish within CELERY_FAST_TASK_MAX_SECONDS
+go to the fast queue, everything else to the heavy queue. Each queue gets
+its own workers (see scripts.run_worker), so interactive jobs keep a
+short queue while batch work keeps the remaining cores busy.
+
+Estimates come from a rough cost model of one fit, calibrated on this
+code's fits: SARIMAX costs about n_obs * k_states^2 (Kalman filter per
+likelihood evaluation), ARTFIMA about n_obs^2 per AR/MA term (exact
+likelihood through the autocovariances), with a large constant for
+ARTFIMA's tempering parameter. Only the class matters, so the model aims
+for the right order of magnitude, not precision.
+
+Task arguments are bound to the task's signature and handed to the
+estimator registered for its name with @cost_estimator; tasks without an
+estimator go to the fast queue. Queues set explicitly when sending
+(apply_async(queue=...)) take precedence.
+"""
+import inspect
+from typing import Any, Callable, Dict, Optional
+
+from app.core.config import settings
+
+# Seconds per observation per squared state dimension of a SARIMAX fit
+SARIMAX_SECONDS_PER_STATE = 4e-6
+# (base seconds, seconds per squared observation per AR/MA term) of an ARTFIMA fit
+ARTFIMA_COSTS = {
+    "ARTFIMA": (1.5, 5e-6),
+    "ARFIMA": (0.01, 2.5e-7),
+    "ARIMA": (0.01, 2.5e-7),
+}
+# Fits without a known series length are assumed this long
+DEFAULT_OBSERVATIONS = 500
+
+_estimators: Dict[str, Callable[[Dict[str, Any]], float]] = {}
+
+
+def estimate_fit_seconds(family: str, n_obs: Optional[int], order: Dict[str, Any]) -> float:
+    """
+    Rough run time of one model fit
+
+    Args:
+        family: "SARIMAX" or an ARTFIMA variant ("ARTFIMA", "ARFIMA", "ARIMA")
+        n_obs: Series length (default DEFAULT_OBSERVATIONS)
+        order: Orders of the model (p, d, q, and P, D, Q, s for SARIMAX)
+
+    Returns:
+        Estimated seconds
+    """
+    n_obs = n_obs or DEFAULT_OBSERVATIONS
+    p, q = int(order.get("p", 0)), int(order.get("q", 0))
+    family = (family or "SARIMAX").upper()
+
+    if family in ARTFIMA_COSTS:
+        base, per_term = ARTFIMA_COSTS[family]
+        return base + per_term * n_obs ** 2 * (1 + p + q)
+
+    d = int(order.get("d", 0))
+    P, D, Q, s = (int(order.get(key, 0)) for key in ("P", "D", "Q", "s"))
+    k_states = max(p + s * P, q + s * Q + 1) + d + s * D
+    # Small models are dominated by per-fit overhead
+    return 0.01 + SARIMAX_SECONDS_PER_STATE * n_obs * max(k_states, 8) ** 2
+
+
+def cost_estimator(task_name: str):
+    """Register the run time estimator of a task; it receives the bound task arguments"""
+    def register(estimator: Callable[[Dict[str, Any]], float]):
+        _estimators[task_name] = estimator
+        return estimator
+    return register
+
+
+def series_length(data_ref: Optional[Dict[str, Any]] = None, data: Optional[dict] = None) -> Optional[int]:
+    """Length of a task's series, from its reference (see series_artifacts) or serialized data"""
+    if data_ref:
+        return data_ref.get("length")
+    if data:
+        return len(data)
+    return None
+
+
+def estimate_task_seconds(name: str, args: tuple = (), kwargs: Optional[dict] = None) -> Optional[float]:
+    """
+    Estimated run time of a task message
+
+    Returns:
+        Seconds, or None for tasks without an estimator (or arguments that
+        do not match the task)
+    """
+    estimator = _estimators.get(name)
+    if estimator is None:
+        return None
+    from app.tasks.celery_app import celery_app
+
+    task = celery_app.tasks.get(name)
+    if task is None:
+        return None
+    try:
+        bound = inspect.signature(task.run).bind(*(args or ()), **(kwargs or {}))
+    except TypeError:
+        return None
+    bound.apply_defaults()
+    try:
+        return estimator(bound.arguments)
+    except Exception as e:
+        print(f"Warning: Could not estimate cost of {name}: {e}")
+        return None
+
+
+def cost_class(seconds: Optional[float]) -> str:
+    """Queue of a task expected to run for the given seconds"""
+    if seconds is not None and seconds > settings.CELERY_FAST_TASK_MAX_SECONDS:
+        return settings.CELERY_HEAVY_QUEUE
+    return settings.CELERY_FAST_QUEUE
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """Celery router: the queue matching a task's estimated cost"""
+    return {"queue": cost_class(estimate_task_seconds(name, args, kwargs))}
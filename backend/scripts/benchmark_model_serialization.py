@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Compare stored model size and load time: full pickle vs compact formats
+Run this from the backend directory: python -m scripts.benchmark_model_serialization
+"""
+import base64
+import pickle
+import time
+import warnings
+
+import pandas as pd
+import statsmodels.api as sm
+
+from app.services.modeling.training_service import TrainingService
+from app.services.modeling.artfima_training_service import ARTFIMATrainingService
+
+warnings.filterwarnings("ignore")
+
+REPEATS = 20
+
+
+def load_series(filename, column):
+    df = pd.read_csv(f"data/samples/{filename}")
+    df["date"] = pd.to_datetime(df["date"])
+    return df.set_index("date")[column].dropna()
+
+
+def time_load(model_data, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        TrainingService.deserialize_model(model_data)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def report(label, legacy, compact):
+    legacy_ms = time_load(legacy)
+    compact_ms = time_load(compact)
+    print(f"{label}")
+    print(f"  size:  pickle {len(legacy) / 1024:10.1f} KB   compact {len(compact) / 1024:8.1f} KB"
+          f"   ({len(legacy) / len(compact):.0f}x smaller)")
+    print(f"  load:  pickle {legacy_ms:10.2f} ms   compact {compact_ms:8.2f} ms")
+
+
+print("=" * 70)
+print("Model serialization benchmark")
+print("=" * 70)
+
+for filename, column in [("air_passengers.csv", "passengers"), ("stock_aapl.csv", "close")]:
+    y = load_series(filename, column)
+    results = sm.tsa.statespace.SARIMAX(
+        y, order=(1, 1, 1), seasonal_order=(1, 0, 1, 12), enforce_invertibility=False
+    ).fit(disp=False)
+    legacy = base64.b64encode(pickle.dumps(results)).decode("utf-8")
+    compact = TrainingService._serialize_model(results)
+    report(f"SARIMAX(1,1,1)x(1,0,1,12) on {filename} (n={len(y)})", legacy, compact)
+
+y = load_series("co2_levels.csv", "co2")
+fit = ARTFIMATrainingService.train_artfima(y, p=1, q=1, glp="ARTFIMA")
+result = fit["artfima_result"]
+legacy = base64.b64encode(pickle.dumps(result)).decode("utf-8")
+report(f"ARTFIMA(1,d,1) on co2_levels.csv (n={len(y)})", legacy, fit["model_data"])
@@ -4,7 +4,7 @@ Create database tables directly using SQLAlchemy
 Run this if migrations aren't working: python scripts/create_tables.py
 """
 from app.core.database import Base, engine
-from app.models import dataset, project, model  # Import models to register them
+from app.models import dataset, project, model, grid_search, job, fleet  # Import models to register them
 
 print("Creating database tables...")
 Base.metadata.create_all(bind=engine)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Start a Celery worker for the fast or the heavy queue
+Run this from the backend directory: python -m scripts.run_worker fast|heavy [celery worker options]
+
+Concurrency and prefetch come from settings (CELERY_FAST_CONCURRENCY,
+CELERY_HEAVY_PREFETCH, ...). Heavy workers reserve one message per process
+and hand tasks to idle processes only (-O fair), so a long job never holds
+back another that a free process could start.
+"""
+import os
+import sys
+
+from app.core.config import settings
+from app.tasks.celery_app import celery_app
+
+QUEUES = {
+    "fast": (settings.CELERY_FAST_QUEUE, settings.CELERY_FAST_CONCURRENCY, settings.CELERY_FAST_PREFETCH),
+    "heavy": (settings.CELERY_HEAVY_QUEUE, settings.CELERY_HEAVY_CONCURRENCY, settings.CELERY_HEAVY_PREFETCH),
+}
+
+if len(sys.argv) < 2 or sys.argv[1] not in QUEUES:
+    sys.exit("Usage: python -m scripts.run_worker fast|heavy [celery worker options]")
+
+kind = sys.argv[1]
+queue, concurrency, prefetch = QUEUES[kind]
+if kind == "heavy" and not concurrency:
+    concurrency = max(1, (os.cpu_count() or 1) - settings.CELERY_FAST_CONCURRENCY)
+
+argv = [
+    "worker",
+    "--loglevel=info",
+    f"--queues={queue}",
+    f"--concurrency={concurrency}",
+    f"--prefetch-multiplier={prefetch}",
+    f"--hostname={kind}@%h",
+]
+if kind == "heavy":
+    argv.append("-O")
+    argv.append("fair")
+celery_app.worker_main(argv + sys.argv[2:])
@@ -0,0 +1,135 @@
+"""Check that grid, two-phase and stepwise searches select the same order as the original sequential search"""
+import sys
+import warnings
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from app.services.modeling.grid_search_service import GridSearchService
+
+P_RANGE = [0, 1, 2]
+Q_RANGE = [0, 1, 2]
+SP_RANGE = [0, 1]
+SQ_RANGE = [0, 1]
+D, SD, S = 1, 1, 12
+AIRLINE_ORDER = (0, 1, 1, 0, 1, 1, 12)
+
+
+def baseline_select(results, d=1, D=1, s=12):
+    """Selection loop of the original grid_search_arima, over results in grid order"""
+    best_model_aic = np.inf
+    best_model_bic = np.inf
+    best_model_hqic = np.inf
+    best_model_order = (0, d, 0, 0, D, 0, s)
+    for result in results:
+        if result["error"]:
+            continue
+        no_of_lower_metrics = 0
+        if result["aic"] <= best_model_aic:
+            no_of_lower_metrics += 1
+        if result["bic"] <= best_model_bic:
+            no_of_lower_metrics += 1
+        if result["hqic"] <= best_model_hqic:
+            no_of_lower_metrics += 1
+        if no_of_lower_metrics >= 2:
+            best_model_aic = np.round(result["aic"], 0)
+            best_model_bic = np.round(result["bic"], 0)
+            best_model_hqic = np.round(result["hqic"], 0)
+            best_model_order = tuple(result["order"])
+    return best_model_order
+
+
+def baseline_search(train_data, grid):
+    """The original sequential search: fit every order in grid order"""
+    results = []
+    for order in grid:
+        p_, d, q_, P_, D, Q_, s = order
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                model = sm.tsa.statespace.SARIMAX(
+                    endog=train_data.copy(),
+                    order=(p_, d, q_),
+                    seasonal_order=(P_, D, Q_, s),
+                    enforce_invertibility=False
+                ).fit(disp=False)
+            results.append({"order": order, "aic": model.aic, "bic": model.bic, "hqic": model.hqic, "error": None})
+        except Exception as e:
+            results.append({"order": order, "aic": None, "bic": None, "hqic": None, "error": str(e)})
+    return baseline_select(results, D, SD, S)
+
+
+def check_select_best():
+    """select_best on shuffled candidate lists against the baseline loop in grid order"""
+    rng = np.random.default_rng(42)
+    grid = GridSearchService.candidate_grid(P_RANGE, Q_RANGE, SP_RANGE, SQ_RANGE, D, SD, S)
+    for trial in range(500):
+        results = []
+        for position, order in enumerate(grid):
+            if rng.random() < 0.1:
+                results.append({"position": position, "order": list(order), "aic": None, "bic": None, "hqic": None, "error": "failed"})
+                continue
+            # Coarse values, so ties and rounding in the rule come into play
+            aic = float(rng.integers(-20, 20)) + rng.choice([0.0, 0.4, 0.6])
+            results.append({
+                "position": position,
+                "order": list(order),
+                "aic": aic,
+                "bic": aic + float(rng.integers(-3, 4)),
+                "hqic": aic + float(rng.integers(-3, 4)),
+                "error": None,
+            })
+        expected = baseline_select(results, D, SD, S)
+        shuffled = list(results)
+        rng.shuffle(shuffled)
+        selected = GridSearchService.select_best(shuffled, D, SD, S)
+        assert selected == expected, f"select_best mismatch in trial {trial}: {selected} != {expected}"
+    print("  select_best on 500 shuffled candidate lists: OK")
+
+
+def main():
+    print("=" * 70)
+    print("Grid search strategies")
+    print("=" * 70)
+
+    check_select_best()
+
+    data_path = Path(__file__).parent / "backend" / "data" / "samples" / "air_passengers.csv"
+    df = pd.read_csv(data_path, parse_dates=["date"])
+    y = np.log(df.set_index("date")["passengers"].asfreq("MS"))
+
+    grid = GridSearchService.candidate_grid(P_RANGE, Q_RANGE, SP_RANGE, SQ_RANGE, D, SD, S)
+    ranges = (P_RANGE, Q_RANGE, SP_RANGE, SQ_RANGE, D, SD, S)
+
+    baseline = baseline_search(y, grid)
+    print(f"  baseline sequential search ({len(grid)} fits): {baseline}")
+
+    sequential = GridSearchService.grid_search_arima(y, None, *ranges, max_workers=1)
+    assert sequential == baseline, f"grid (in process) {sequential} != baseline {baseline}"
+    print(f"  grid, in process:           {sequential}: OK")
+
+    parallel = GridSearchService.grid_search_arima(y, None, *ranges, max_workers=2)
+    assert parallel == baseline, f"grid (process pool) {parallel} != baseline {baseline}"
+    print(f"  grid, process pool:         {parallel}: OK")
+
+    two_phase = GridSearchService.two_phase_search(y, None, *ranges)
+    assert two_phase == baseline, f"two-phase {two_phase} != baseline {baseline}"
+    print(f"  two-phase:                  {two_phase}: OK")
+
+    stepwise = GridSearchService.stepwise_search(y, None, *ranges)
+    assert stepwise == baseline, f"stepwise {stepwise} != baseline {baseline}"
+    print(f"  stepwise:                   {stepwise}: OK")
+
+    assert baseline == AIRLINE_ORDER, f"expected the airline model {AIRLINE_ORDER}, got {baseline}"
+    print(f"  log air passengers selects the airline model {AIRLINE_ORDER}: OK")
+
+
+if __name__ == "__main__":
+    # Searches may fit in spawned worker processes, which re-import this file
+    main()
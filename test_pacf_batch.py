@@ -0,0 +1,62 @@
+"""Check batched PACF/AR transforms against the single-vector versions"""
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+# Add ARTFIMA package to path
+artfima_path = Path(__file__).parent / "ARTFIMA"
+if str(artfima_path) not in sys.path:
+    sys.path.insert(0, str(artfima_path))
+
+from artfima_python.utils import (
+    ARToPacf, PacfToAR, InvertibleQ,
+    ARToPacfBatch, PacfToARBatch, InvertibleQBatch,
+)
+
+rng = np.random.default_rng(42)
+k = 2000
+
+print("=" * 70)
+print("Batched PACF <-> AR transforms")
+print("=" * 70)
+
+for p in range(0, 9):
+    pacf = rng.uniform(-0.99, 0.99, size=(k, p))
+
+    ar_batch = PacfToARBatch(pacf)
+    ar_loop = np.array([PacfToAR(row) for row in pacf]).reshape(k, p)
+    assert np.allclose(ar_batch, ar_loop), f"PacfToARBatch mismatch for p={p}"
+
+    pacf_back = ARToPacfBatch(ar_batch)
+    assert np.allclose(pacf_back, pacf), f"ARToPacfBatch round trip failed for p={p}"
+
+    # Arbitrary AR vectors, many of them not invertible
+    phi = rng.uniform(-2, 2, size=(k, p))
+    inv_batch = InvertibleQBatch(phi)
+    inv_loop = np.array([bool(InvertibleQ(row)) for row in phi])
+    assert np.array_equal(inv_batch, inv_loop), f"InvertibleQBatch mismatch for p={p}"
+
+    print(f"  p={p}: OK ({inv_batch.mean():.1%} invertible)")
+
+# Unit PACF stops the recursion early, as in the R implementation
+phi = np.array([[0.5, 1.0], [0.1, 0.2]])
+assert np.allclose(ARToPacfBatch(phi)[0], ARToPacf(phi[0]))
+print("  unit root row: OK")
+print()
+
+# Timing
+p = 4
+pacf = rng.uniform(-0.99, 0.99, size=(k, p))
+t0 = time.perf_counter()
+for row in pacf:
+    InvertibleQ(PacfToAR(row))
+t_loop = time.perf_counter() - t0
+
+t0 = time.perf_counter()
+InvertibleQBatch(PacfToARBatch(pacf))
+t_batch = time.perf_counter() - t0
+
+print(f"Transform + invertibility check for {k} vectors (p={p}):")
+print(f"  loop:  {t_loop * 1000:.2f} ms")
+print(f"  batch: {t_batch * 1000:.2f} ms")
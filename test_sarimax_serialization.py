@@ -0,0 +1,85 @@
+"""Check that compact SARIMAX persistence round-trips fits: llf, params, standard errors and forecasts"""
+import sys
+import base64
+import warnings
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from pathlib import Path
+
+# Add backend to path
+backend_path = Path(__file__).parent / "backend"
+if str(backend_path) not in sys.path:
+    sys.path.insert(0, str(backend_path))
+
+from app.services.modeling.sarimax_serialization import SARIMAXSerializer
+from app.services.modeling.training_service import TrainingService
+
+warnings.filterwarnings("ignore")
+
+HORIZON = 24
+
+
+def check(label, results, exog_future=None):
+    """Round-trip results through the stored format and compare"""
+    model_data = TrainingService._serialize_model(results)
+    assert SARIMAXSerializer.is_compact_payload(base64.b64decode(model_data)), "not stored in the compact format"
+    loaded = TrainingService.deserialize_model(model_data)
+
+    assert np.isclose(loaded.llf, results.llf, rtol=1e-10), f"llf {loaded.llf} != {results.llf}"
+    assert np.allclose(loaded.params, results.params), "params differ"
+    assert loaded.cov_type == results.cov_type, f"cov_type {loaded.cov_type} != {results.cov_type}"
+    assert np.allclose(loaded.bse, results.bse, equal_nan=True), "standard errors differ"
+    for criterion in ("aic", "bic", "hqic"):
+        assert np.isclose(getattr(loaded, criterion), getattr(results, criterion)), f"{criterion} differs"
+
+    expected = results.get_forecast(HORIZON, exog=exog_future)
+    actual = loaded.get_forecast(HORIZON, exog=exog_future)
+    assert actual.predicted_mean.index.equals(expected.predicted_mean.index), "forecast index differs"
+    assert np.allclose(actual.predicted_mean, expected.predicted_mean), "forecast mean differs"
+    assert np.allclose(actual.conf_int(), expected.conf_int()), "forecast intervals differ"
+
+    print(f"  {label}: OK ({len(base64.b64decode(model_data)) / 1024:.1f} KB)")
+
+
+def main():
+    print("=" * 70)
+    print("Compact SARIMAX persistence round trip")
+    print("=" * 70)
+
+    data_path = Path(__file__).parent / "backend" / "data" / "samples" / "air_passengers.csv"
+    df = pd.read_csv(data_path, parse_dates=["date"])
+    y = np.log(df.set_index("date")["passengers"].asfreq("MS"))
+
+    # Airline model, default (approximate) covariance
+    results = sm.tsa.statespace.SARIMAX(y, order=(0, 1, 1), seasonal_order=(0, 1, 1, 12)).fit(disp=False)
+    check("SARIMAX(0,1,1)x(0,1,1,12)", results)
+
+    # Exogenous variables, forecast with their future values
+    rng = np.random.default_rng(0)
+    exog = pd.DataFrame({"promo": rng.normal(size=len(y)), "trend": np.arange(len(y)) / len(y)}, index=y.index)
+    future_index = pd.date_range(y.index[-1] + pd.offsets.MonthBegin(), periods=HORIZON, freq="MS")
+    exog_future = pd.DataFrame(
+        {"promo": rng.normal(size=HORIZON), "trend": np.arange(len(y), len(y) + HORIZON) / len(y)},
+        index=future_index,
+    )
+    results = sm.tsa.statespace.SARIMAX(
+        y, exog=exog, order=(1, 1, 1), seasonal_order=(0, 1, 1, 12)
+    ).fit(disp=False)
+    check("SARIMAX(1,1,1)x(0,1,1,12) with exog", results, exog_future.values)
+
+    # Robust covariance is kept as fitted, not recomputed
+    results = sm.tsa.statespace.SARIMAX(y, order=(0, 1, 1), seasonal_order=(0, 1, 1, 12)).fit(disp=False, cov_type="robust")
+    check("cov_type='robust'", results)
+
+    # No covariance at all
+    results = sm.tsa.statespace.SARIMAX(y, order=(0, 1, 1), seasonal_order=(0, 1, 1, 12)).fit(disp=False, cov_type="none")
+    check("cov_type='none'", results)
+
+    # No date index (stored as a range)
+    results = sm.tsa.statespace.SARIMAX(y.values, order=(1, 1, 0)).fit(disp=False)
+    check("SARIMAX(1,1,0) on a plain array", results)
+
+
+if __name__ == "__main__":
+    main()